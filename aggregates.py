@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from schema import apply_schema
+
+# Die sechs festen Sharks der Show
+SHARKS = [
+    'Barbara Corcoran', 'Mark Cuban', 'Lori Greiner', 'Robert Herjavec',
+    'Daymond John', 'Kevin O Leary'
+]
+
+# Dimensionen und Kennzahlen des vorberechneten Aggregat-Würfels
+CUBE_DIMENSIONS = ['Staffelnummer', 'Branche', 'Pitcher Geschlecht', 'Deal erhalten']
+CUBE_MEASURES = (
+    ['Geforderter Betrag (USD)', 'Erhaltener Betrag (USD)']
+    + [f'{shark} Investitionssumme' for shark in SHARKS]
+    + ['Gast Investitionssumme']
+)
+
+
+def build_aggregate_cube(data):
+    """
+    Verdichtet die Pitches zu einem Würfel über Staffel × Branche × Geschlecht × Deal.
+    Jede Zelle enthält die Anzahl der Pitches ('Anzahl') sowie die Summen der geforderten und erhaltenen
+    Beträge und der Investitionen je Shark und Gast. Alle Fragen des Dashboards, die nur zählen oder summieren,
+    lassen sich damit durch Auswählen und Summieren weniger Zellen beantworten.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz.
+    Returns:
+        pd.DataFrame: Eine Zeile pro vorkommender Kombination der Dimensionen.
+    """
+    measures = data[CUBE_MEASURES].apply(pd.to_numeric, errors='coerce')
+    grouped = measures.groupby([data[col] for col in CUBE_DIMENSIONS], observed=True, dropna=False)
+    cube = grouped.sum()
+    cube.insert(0, 'Anzahl', grouped.size())
+    return cube.reset_index()
+
+
+def combine_cubes(*cubes, by=None):
+    """
+    Führt mehrere Teil-Würfel (z. B. aus einzelnen Datenblöcken) zu einem Würfel zusammen.
+    Teil-Würfel mit unterschiedlichen Kategorien werden beim Zusammenfügen zu Text; das Schema wird daher
+    anschließend erneut angewendet, damit das Ergebnis dem Würfel des Gesamtdatensatzes entspricht.
+    Parameters:
+    - cubes (pd.DataFrame): Die Teil-Würfel; None wird übersprungen.
+    - by (list): Schlüsselspalten der Zellen (Standard: `CUBE_DIMENSIONS`), z. B. für die Zellentabellen
+      `shark_analytics.shark_cells` und `coalitions.coalition_cells`.
+    """
+    by = CUBE_DIMENSIONS if by is None else by
+    combined = pd.concat([cube for cube in cubes if cube is not None], ignore_index=True)
+    return apply_schema(combined.groupby(by, observed=True, dropna=False, as_index=False).sum())
+
+
+def slice_cube(cube, by, measure='Anzahl', **filters):
+    """
+    Summiert eine Kennzahl des Würfels über die nicht genannten Dimensionen.
+    Parameters:
+    - cube (pd.DataFrame): Der Aggregat-Würfel.
+    - by (list): Dimensionen, nach denen gruppiert wird.
+    - measure (str | list): Kennzahl(en), die summiert werden.
+    - filters: Optionale Einschränkungen, z. B. `**{'Deal erhalten': 1}`.
+    Returns:
+        pd.DataFrame: Die verdichteten Zeilen, ohne leere Kombinationen.
+    """
+    for col, value in filters.items():
+        cube = cube[cube[col] == value]
+    result = cube.groupby(by, observed=True)[measure].sum().reset_index()
+    return result
+
+
+def select_cells(cube, selections):
+    """
+    Beschränkt den Würfel auf die Zellen einer Filterauswahl. Die Dimensionen des Würfels entsprechen den
+    Filterspalten des Dashboards; das Summieren der ausgewählten Zellen ergibt daher dasselbe wie das Gruppieren
+    der gefilterten Zeilen, ohne die Zeilen erneut zu durchlaufen.
+    Parameters:
+    - cube (pd.DataFrame): Der Aggregat-Würfel.
+    - selections (dict | tuple): Pro Dimension die gewählten Werte; nicht genannte Dimensionen werden nicht
+      eingeschränkt. Fehlende Werte werden wie bei `isin` nie ausgewählt.
+    Returns:
+        pd.DataFrame: Die Zellen des Würfels, die der Auswahl entsprechen.
+    """
+    mask = np.ones(len(cube), dtype=bool)
+    for col, selected in dict(selections).items():
+        mask &= cube[col].isin(list(selected)).to_numpy()
+    return cube[mask]
+
+
+def binned_distribution(data, columns, bins=50):
+    """
+    Verdichtet die Verteilung mehrerer Spalten zu Histogramm-Zählungen und Boxplot-Kennzahlen.
+    Wie beim Histogramm mit allen Rohwerten werden nur Zeilen ohne fehlende Werte in den gewählten Spalten
+    berücksichtigt, und alle Spalten teilen sich dieselben Klassengrenzen (gemeinsame x-Achse).
+    Die Größe des Ergebnisses hängt nur von `bins` und der Anzahl der Spalten ab, nicht von der Zeilenanzahl.
+    Parameters:
+    - data (pd.DataFrame): Der Datensatz.
+    - columns (list): Die zu vergleichenden Spalten.
+    - bins (int): Anzahl der Klassen.
+    Returns:
+        tuple: (edges, counts, boxes) mit den Klassengrenzen, einem DataFrame der Häufigkeiten (eine Spalte pro
+        Eingabespalte, eine Zeile pro Klasse) und einem DataFrame mit q1, median, q3, mean, lowerfence und
+        upperfence pro Spalte (Whisker wie bei Plotly bis zum letzten Wert innerhalb von 1,5 × IQR).
+        Gibt es keine vollständigen Zeilen, sind `counts` und `boxes` leer.
+    """
+    values = data[list(columns)].apply(pd.to_numeric, errors='coerce').dropna().to_numpy(dtype=np.float64)
+    if values.size == 0:
+        boxes = pd.DataFrame(columns=['q1', 'median', 'q3', 'mean', 'lowerfence', 'upperfence'], dtype=np.float64)
+        return np.array([]), pd.DataFrame(columns=list(columns)), boxes
+    edges = np.histogram_bin_edges(values, bins=bins)
+    counts = pd.DataFrame(
+        {col: np.histogram(values[:, i], bins=edges)[0] for i, col in enumerate(columns)}
+    )
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75], axis=0)
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    boxes = pd.DataFrame({
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'mean': values.mean(axis=0),
+        'lowerfence': np.where(inside, values, np.inf).min(axis=0),
+        'upperfence': np.where(inside, values, -np.inf).max(axis=0),
+    }, index=list(columns))
+    return edges, counts, boxes
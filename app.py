@@ -1,11 +1,42 @@
+import io
+import math
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
 
-# Styling und Seiteneinstellungen
-sns.set_style("whitegrid")
+from aggregates import (
+    CUBE_DIMENSIONS, CUBE_MEASURES, SHARKS, binned_distribution, build_aggregate_cube, combine_cubes, select_cells,
+    slice_cube
+)
+from coalitions import (
+    CELL_KEYS as COALITION_CELL_KEYS, INPUT_COLUMNS as COALITION_COLUMNS, cell_histogram, coalition_cells,
+    coalition_histogram, coalition_table, cooperation_counts
+)
+from datastore import DATABASE_SUFFIX, content_hash, derived_hash, modified_ns, read_table
+from filter_index import FILTER_COLUMNS, FilterIndex
+from instrumentation import Instrumentation, MemorySink
+from main import SharkTankProcessor
+from schema import display_with_na
+from shark_analytics import (
+    CELL_KEYS as SHARK_CELL_KEYS, INPUT_COLUMNS as ANALYTICS_COLUMNS, cell_totals, shark_analytics, shark_cells,
+    shark_totals
+)
+from sqlstore import SqliteStore
+from startup_index import INPUT_COLUMNS as STARTUP_COLUMNS, StartupIndex, build_startup_index, rows_match
+from validation import validate, violation_summary
+
+# Copy-on-Write (ab pandas 3.0 immer aktiv): Änderungen an abgeleiteten Datenrahmen kopieren die betroffenen Spalten,
+# statt in die schreibgeschützt eingeblendeten Arrow-Spalten zu schreiben (siehe `datastore.map_table`)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Laufzeitmessung der Berechnungen dieses Reruns (Anzeige im Debug-Panel am Seitenende)
+debug = Instrumentation(sinks=[MemorySink()])
+
+# Seiteneinstellungen
+# Plotly und Matplotlib werden erst in den Funktionen importiert, die ein Diagramm erstellen. So erscheint die Seite
+# beim Kaltstart, ohne auf diese Importe zu warten, und bei einem Cache-Treffer werden sie gar nicht benötigt.
 st.set_page_config(
     page_title="Shark Tank Analyse",
     page_icon="🦈",
@@ -52,14 +83,427 @@ Ich habe dieses Thema gewählt, da ich *Shark Tank* selber seit vielen Jahren sc
 """)
 
 # Daten laden und cachen
-@st.cache_data
-def load_data(file_path):
-    """Laded Datenset und gibt Datenset zurück."""
-    data = pd.read_excel(file_path)
+# Alle abgeleiteten Ergebnisse erhalten den Inhalts-Hash ihrer Quelldatei als Argument. Ändert sich die Datei,
+# ändert sich der Hash, und nur die davon abhängigen Ergebnisse werden neu berechnet.
+# Liegt die SQLite-Datenbank der Pipeline vor (`python main.py --format sqlite`), werden Filter und Gruppierungen
+# als Abfragen an die Datenbank übergeben und nur deren Ergebnisse geladen; der Speicherbedarf pro Prozess hängt
+# dann nicht von der Größe des Datensets ab, und mehrere App-Prozesse lesen dieselbe Datei. Ohne Datenbank wird
+# das Datenset einmal pro Prozess geladen und im Speicher gefiltert. Eine Arrow-Datei (`python main.py --format arrow`)
+# wird dabei nur eingeblendet: alle App-Prozesse teilen sich die Seiten der Datei im Dateicache.
+def uses_store(file_path):
+    """True, wenn das Datenset in der SQLite-Datenbank liegt."""
+    return str(file_path).endswith(DATABASE_SUFFIX)
+
+@st.cache_resource(max_entries=4)
+def load_store(file_path, source_hash):
+    """Zugriff auf die SQLite-Datenbank (hält selbst keine Daten im Speicher)."""
+    return SqliteStore(file_path)
+
+# Als Ressource gecacht: alle Sitzungen erhalten denselben Datenrahmen statt einer Kopie pro Aufruf,
+# sodass eingeblendete Arrow-Spalten nicht in den Prozessspeicher kopiert werden. Der Datenrahmen wird nie verändert.
+@st.cache_resource(max_entries=4)
+def load_data(file_path, source_hash=None):
+    """Laded Datenset und gibt Datenset zurück (bevorzugt aus der Arrow-/Parquet-/Feather-Datei)."""
+    data = read_table(file_path)
     return data
 
-file_path = 'sharktank_cleaned.xlsx'
-data = load_data(file_path)
+@st.cache_data(max_entries=4)
+def row_count(file_path, source_hash):
+    """Anzahl der Zeilen des Datensets."""
+    if uses_store(file_path):
+        return load_store(file_path, source_hash).count()
+    return len(load_data(file_path, source_hash))
+
+@st.cache_data(max_entries=4)
+def preview(file_path, source_hash, rows=5):
+    """Die ersten Zeilen des Datensets."""
+    if uses_store(file_path):
+        return load_store(file_path, source_hash).select(limit=rows)
+    return load_data(file_path, source_hash).head(rows)
+
+@st.cache_data(max_entries=4)
+def filter_options(file_path, source_hash, columns):
+    """Die vorkommenden Werte der Filterspalten (ohne fehlende Werte)."""
+    if uses_store(file_path):
+        store = load_store(file_path, source_hash)
+        return {col: store.distinct(col) for col in columns}
+    data = load_data(file_path, source_hash)
+    return {col: data[col].dropna().unique() for col in columns}
+
+@st.cache_data(max_entries=4)
+def load_cube(file_path, source_hash, data_file_path, data_hash):
+    """Laded den vorberechneten Aggregat-Würfel; fehlt er, wird er einmalig aus dem Datenset erstellt."""
+    if source_hash is not None:
+        return read_table(file_path)
+    if uses_store(data_file_path):
+        return load_store(data_file_path, data_hash).group_by(CUBE_DIMENSIONS, CUBE_MEASURES)
+    return build_aggregate_cube(load_data(data_file_path, data_hash))
+
+@st.cache_data(max_entries=16)
+def describe_data(file_path, source_hash):
+    """Deskriptive Statistik des Datensets."""
+    if uses_store(file_path):
+        return load_store(file_path, source_hash).describe()
+    return load_data(file_path, source_hash).describe(include='all').T
+
+@st.cache_data(max_entries=4)
+def load_shark_analytics(file_path, source_hash, data_file_path, data_hash):
+    """Laded die Kennzahlen je Shark und Staffel; fehlen sie, werden sie einmalig aus dem Datenset berechnet."""
+    if source_hash is not None:
+        return read_table(file_path)
+    return shark_analytics(filtered(data_file_path, data_hash, (), ANALYTICS_COLUMNS))
+
+@st.cache_data(max_entries=4)
+def load_coalitions(file_path, source_hash, data_file_path, data_hash):
+    """Laded die Koalitionsübersicht; fehlt sie, wird sie einmalig aus dem Datenset berechnet."""
+    if source_hash is not None:
+        return read_table(file_path)
+    return coalition_table(coalition_histogram(filtered(data_file_path, data_hash, (), COALITION_COLUMNS)))
+
+# Als Ressource gecacht: der Index wird einmal pro Prozess geladen und von allen Sitzungen geteilt
+@st.cache_resource(max_entries=4)
+def load_startup_index(file_path, source_hash, data_file_path, data_hash):
+    """Laded den Suchindex über die Startup-Namen; fehlt er, wird er einmalig aus dem Datenset erstellt."""
+    if source_hash is not None:
+        return StartupIndex(read_table(file_path))
+    return StartupIndex(build_startup_index(filtered(data_file_path, data_hash, (), STARTUP_COLUMNS)))
+
+@st.cache_data(max_entries=4)
+def data_quality(file_path, source_hash, sample=10000):
+    """Prüft eine Stichprobe des Datensets auf Konsistenz (siehe `validation.validate`)."""
+    rows_checked = min(sample, row_count(file_path, source_hash))
+    if uses_store(file_path):
+        # Dieselbe Stichprobe wie `validate(..., sample, random_state=0)`, aber nur diese Zeilen werden geladen
+        positions = np.random.default_rng(0).choice(row_count(file_path, source_hash), size=rows_checked, replace=False)
+        report = validate(load_store(file_path, source_hash).select(rows=np.sort(positions)))
+    else:
+        report = validate(load_data(file_path, source_hash), sample=rows_checked, random_state=0)
+    return violation_summary(report, rows_checked), report
+
+@st.cache_data(max_entries=16)
+def startup_details(file_path, source_hash, rows):
+    """Die Zeilen des Datensets an den Positionen aus dem Suchindex (siehe `StartupIndex.lookup`)."""
+    if uses_store(file_path):
+        return load_store(file_path, source_hash).select(rows=rows)
+    return load_data(file_path, source_hash).iloc[list(rows)]
+
+def find_startup(index_path, index_hash, file_path, source_hash, name):
+    """
+    Sucht ein Startup im Suchindex und lädt seine Zeilen. Gehören die Namen in diesen Zeilen nicht zu `name`
+    (die Positionen des gespeicherten Index passen nicht zum Datenset), wird der Index einmalig aus dem Datenset
+    neu erstellt und die Suche wiederholt.
+    Returns:
+        tuple: (Suchindex, Zeilen des Startups)
+    """
+    startups = load_startup_index(index_path, index_hash, file_path, source_hash)
+    details = startup_details(file_path, source_hash, tuple(startups.lookup(name).tolist()))
+    if index_hash is not None and not rows_match(details, name):
+        startups = load_startup_index(index_path, None, file_path, source_hash)
+        details = startup_details(file_path, source_hash, tuple(startups.lookup(name).tolist()))
+    return startups, details
+
+# Die Datenbank wird nur verwendet, wenn sie nicht älter als das Datenset in den übrigen Formaten ist
+# (z. B. nach `python main.py --stages cleaned` ohne `--format sqlite`)
+table_path = 'sharktank_cleaned.xlsx'
+store_path = 'sharktank_cleaned.sqlite'
+store_modified, table_modified = modified_ns(store_path), modified_ns(table_path)
+use_store = store_modified is not None and (table_modified is None or store_modified >= table_modified)
+file_path = store_path if use_store else table_path
+data_hash = content_hash(file_path)
+# Abgeleitete Dateien der Pipeline werden nur verwendet, wenn sie aus genau diesem Datenset berechnet wurden;
+# sonst werden sie einmalig aus dem Datenset neu berechnet (siehe `datastore.derived_hash`)
+cube_path = 'sharktank_cube.xlsx'
+cube_hash = derived_hash(cube_path, data_hash)
+with debug.stage('load_data') as record:
+    total_rows = row_count(file_path, data_hash)
+    record['rows_out'] = total_rows
+
+# Bitmap-Index für die Filter einmalig pro Datenset erstellen
+@st.cache_resource(max_entries=4)
+def load_filter_index(file_path, source_hash):
+    """Erstellt den Bitmap-Index über Staffel, Branche, Geschlecht und Deal für das Datenset."""
+    return FilterIndex(load_data(file_path, source_hash))
+
+def filtered(file_path, source_hash, selections, columns=None):
+    """
+    Die Zeilen des Datensets, die der Filterauswahl (Tupel aus Spalte und gewählten Werten) entsprechen.
+    `columns` beschränkt das Ergebnis auf die benötigten Spalten; bei der Datenbank werden nur diese gelesen.
+    Das Ergebnis selbst wird nicht zwischengespeichert, nur die daraus berechneten Auswertungen.
+    """
+    if uses_store(file_path):
+        return load_store(file_path, source_hash).select(selections, columns=columns)
+    if not selections:
+        data = load_data(file_path, source_hash)
+    else:
+        data = load_filter_index(file_path, source_hash).filter(load_data(file_path, source_hash), dict(selections))
+    return data if columns is None else data[list(columns)]
+
+# Zeilen pro Seite der Tabelle "Gefilterte Ergebnisse", wenn das Datenset in der Datenbank liegt
+TABLE_PAGE_ROWS = 1000
+
+@st.cache_data(max_entries=32)
+def selected_row_count(file_path, source_hash, selections):
+    """Anzahl der Zeilen einer Filterauswahl, als Abfrage an die SQLite-Datenbank."""
+    return load_store(file_path, source_hash).count(selections)
+
+# Zellentabellen zum Würfel: additive Summen je Shark und Besetzungs-Histogramme pro Zelle (Fragen 6–8)
+# Zeilen pro Seite beim Erstellen der Zellentabellen aus der Datenbank
+STORE_PAGE_ROWS = 100000
+
+def cells_from_data(data_file_path, data_hash, build, columns, by):
+    """
+    Erstellt eine Zellentabelle (`shark_cells` oder `coalition_cells`) aus dem Datenset, wenn die Pipeline sie
+    nicht gespeichert hat. Aus der Datenbank wird seitenweise gelesen und wie beim Streaming zusammengeführt.
+    """
+    if not uses_store(data_file_path):
+        return build(filtered(data_file_path, data_hash, (), columns))
+    store = load_store(data_file_path, data_hash)
+    pages = range(0, max(row_count(data_file_path, data_hash), 1), STORE_PAGE_ROWS)
+    return combine_cubes(
+        *(build(store.select(columns=columns, limit=STORE_PAGE_ROWS, offset=start)) for start in pages), by=by
+    )
+
+@st.cache_data(max_entries=4)
+def load_shark_cells(file_path, source_hash, data_file_path, data_hash):
+    """Laded die Summen je Shark pro Würfelzelle; fehlen sie, werden sie einmalig aus dem Datenset berechnet."""
+    if source_hash is not None:
+        return read_table(file_path)
+    columns = list(dict.fromkeys(CUBE_DIMENSIONS + ANALYTICS_COLUMNS))
+    return cells_from_data(data_file_path, data_hash, shark_cells, columns, SHARK_CELL_KEYS)
+
+@st.cache_data(max_entries=4)
+def load_coalition_cells(file_path, source_hash, data_file_path, data_hash):
+    """Laded die Besetzungs-Histogramme pro Würfelzelle; fehlen sie, werden sie einmalig aus dem Datenset berechnet."""
+    if source_hash is not None:
+        return read_table(file_path)
+    columns = CUBE_DIMENSIONS + COALITION_COLUMNS
+    return cells_from_data(data_file_path, data_hash, coalition_cells, columns, COALITION_CELL_KEYS)
+
+# Auswertungen für die Filterauswahl
+# Wie die Fragen 1–4 werden auch die Fragen 6–8 aus vorberechneten Zellen beantwortet: für eine Auswahl werden
+# nur die Zellen der Zellentabellen summiert, die gefilterten Zeilen werden nicht erneut durchlaufen.
+@st.cache_data(max_entries=32)
+def cooperations(cells_path, cells_hash, data_file_path, data_hash, selections):
+    """
+    Die Kooperationen für die aktuelle Filterauswahl aus den Besetzungs-Histogrammen der ausgewählten Zellen
+    (siehe `coalitions.cooperation_counts`); das Ergebnis entspricht `SharkTankProcessor.generate_cooperation_matrix`
+    über die gefilterten Zeilen.
+    Returns:
+        tuple: (Paarliste Shark A, Shark B, Count; Anzahl der Kooperationen pro Shark)
+    """
+    cells = select_cells(load_coalition_cells(cells_path, cells_hash, data_file_path, data_hash), selections)
+    counts = cooperation_counts(cell_histogram(cells))
+    cooperation_matrix = SharkTankProcessor._square_to_pairs(counts.to_numpy(), SHARKS)
+    # Zeilensummen der quadratischen Matrix (Diagonale = 0) ergeben die Kooperationen pro Shark
+    return cooperation_matrix, counts.sum(axis=1).rename('Count')
+
+@st.cache_data(max_entries=32)
+def selected_shark_totals(analytics_path, analytics_hash, cells_path, cells_hash, data_file_path, data_hash, selections):
+    """
+    Kennzahlen je Shark über alle Staffeln für die Filterauswahl. Ohne Einschränkung stammen sie aus den
+    gespeicherten Kennzahlen, für eine Auswahl aus den Summen der ausgewählten Zellen (ohne Medianwerte).
+    """
+    if not selections:
+        return shark_totals(load_shark_analytics(analytics_path, analytics_hash, data_file_path, data_hash))
+    cells = select_cells(load_shark_cells(cells_path, cells_hash, data_file_path, data_hash), selections)
+    return cell_totals(cells)
+
+@st.cache_data(max_entries=32)
+def selected_coalitions(coalitions_path, coalitions_hash, cells_path, cells_hash, data_file_path, data_hash, selections):
+    """Koalitionsübersicht für die Filterauswahl."""
+    if not selections:
+        return load_coalitions(coalitions_path, coalitions_hash, data_file_path, data_hash)
+    cells = select_cells(load_coalition_cells(cells_path, cells_hash, data_file_path, data_hash), selections)
+    return coalition_table(cell_histogram(cells))
+
+# Kennzahlen je Shark und Staffel sowie Koalitionen (von der Pipeline gespeichert)
+analytics_path = 'shark_analytics.xlsx'
+analytics_hash = derived_hash(analytics_path, data_hash)
+coalitions_path = 'shark_coalitions.xlsx'
+coalitions_hash = derived_hash(coalitions_path, data_hash)
+shark_cells_path = 'sharktank_shark_cells.xlsx'
+shark_cells_hash = derived_hash(shark_cells_path, data_hash)
+coalition_cells_path = 'sharktank_coalition_cells.xlsx'
+coalition_cells_hash = derived_hash(coalition_cells_path, data_hash)
+startup_index_path = 'sharktank_startup_index.xlsx'
+startup_index_hash = derived_hash(startup_index_path, data_hash)
+
+# Gerenderte Diagramme zwischenspeichern
+# Jedes Diagramm wird von einer gecachten Funktion erstellt, die die Inhalts-Hashes ihrer Quelldateien
+# (und ggf. die Auswahl) als Argumente erhält. Plotly-Figuren werden als Objekt, Matplotlib-Diagramme als PNG gecacht.
+def load_pyplot():
+    """Importiert Matplotlib bei Bedarf und setzt den Stil 'whitegrid' (entspricht dem bisherigen seaborn-Stil)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.style.use('seaborn-v0_8-whitegrid')
+    return plt
+
+def render_png(fig):
+    """Rendert eine Matplotlib-Figur als PNG und gibt ihren Speicher frei."""
+    import matplotlib.pyplot as plt
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+@st.cache_data(max_entries=32)
+def deal_counts_figure(cube_path, cube_hash, data_file_path, data_hash, selections):
+    """Frage 1: Deals und No-Deals pro Staffel."""
+    import plotly.express as px
+    cube = select_cells(load_cube(cube_path, cube_hash, data_file_path, data_hash), selections)
+    deal_counts = slice_cube(cube, ['Staffelnummer', 'Deal erhalten'])
+    deal_counts['Deal erhalten'] = deal_counts['Deal erhalten'].replace({1: 'Deal', 0: 'No-Deal'})
+    return px.bar(
+        deal_counts,
+        x='Staffelnummer',
+        y='Anzahl',
+        color='Deal erhalten',
+        barmode='group',
+        labels={'Staffelnummer': 'Staffel', 'Anzahl': 'Anzahl der Pitches'},
+        title='Anzahl der Deals und No-Deals pro Staffel'
+    )
+
+@st.cache_data(max_entries=32)
+def branche_figure(cube_path, cube_hash, data_file_path, data_hash, selections):
+    """Frage 2: Deals mit und ohne Investition pro Branche."""
+    import plotly.express as px
+    cube = select_cells(load_cube(cube_path, cube_hash, data_file_path, data_hash), selections)
+    branche_mit_deals = slice_cube(cube, ['Branche'], **{'Deal erhalten': 1}).sort_values('Anzahl', ascending=False)
+    branche_mit_deals.columns = ['Branche', 'Anzahl Deals']
+    branche_ohne_deals = slice_cube(cube, ['Branche'], **{'Deal erhalten': 0}).sort_values('Anzahl', ascending=False)
+    branche_ohne_deals.columns = ['Branche', 'Anzahl Deals']
+
+    # Stacked Bar Chart
+    fig = px.bar(
+        branche_mit_deals,
+        x='Branche',
+        y='Anzahl Deals',
+        text='Anzahl Deals',
+        title="Vergleich der Deals pro Branche",
+        labels={'Anzahl Deals': 'Anzahl der Deals'},
+    )
+    fig.add_bar(
+        x=branche_ohne_deals['Branche'],
+        y=branche_ohne_deals['Anzahl Deals'],
+        text=branche_ohne_deals['Anzahl Deals'],
+        name='Deals ohne Investition'
+    )
+    fig.update_layout(
+        xaxis_title="Branche",
+        yaxis_title="Anzahl der Deals",
+        showlegend=True,
+        barmode='stack'
+    )
+    return fig
+
+@st.cache_data(max_entries=32)
+def gender_distribution_figure(cube_path, cube_hash, data_file_path, data_hash, selections):
+    """Frage 3: Geschlechterverteilung der Pitcher."""
+    import plotly.express as px
+    cube = select_cells(load_cube(cube_path, cube_hash, data_file_path, data_hash), selections)
+    geschlechterverteilung = slice_cube(cube, ['Pitcher Geschlecht']).sort_values('Anzahl', ascending=False)
+    geschlechterverteilung.columns = ['Geschlecht', 'Anzahl Pitcher']
+    return px.bar(
+        geschlechterverteilung,
+        x='Geschlecht',
+        y='Anzahl Pitcher',
+        color='Geschlecht',
+        labels={'Anzahl Pitcher': 'Anzahl der Pitcher'},
+        title='Geschlechterverteilung der Pitcher'
+    )
+
+@st.cache_data(max_entries=32)
+def gender_deal_figure(cube_path, cube_hash, data_file_path, data_hash, selections):
+    """Frage 4: Deals und No-Deals pro Geschlecht."""
+    import plotly.express as px
+    cube = select_cells(load_cube(cube_path, cube_hash, data_file_path, data_hash), selections)
+    geschlecht_deal_counts = slice_cube(cube, ['Pitcher Geschlecht', 'Deal erhalten'])
+    geschlecht_deal_counts.columns = ['Pitcher Geschlecht', 'Deal erhalten', 'Anzahl Deals']
+
+    # Umwandlung 1=Deal, 0=No-Deal
+    geschlecht_deal_counts['Deal erhalten'] = geschlecht_deal_counts['Deal erhalten'].replace({1: 'Deal', 0: 'No-Deal'})
+    return px.bar(
+        geschlecht_deal_counts,
+        x='Pitcher Geschlecht',
+        y='Anzahl Deals',
+        color='Deal erhalten',
+        barmode='group',
+        labels={'Pitcher Geschlecht': 'Geschlecht', 'Anzahl Deals': 'Anzahl der Deals'},
+        title='Deals und No-Deals pro Geschlecht'
+    )
+
+@st.cache_data(max_entries=32)
+def deal_comparison_figure(file_path, source_hash, selections, selected_columns, bins=50):
+    """
+    Frage 5: Histogramm der geforderten und erhaltenen Werte für die gewählten Spalten mit Boxplots darüber.
+    Klassenhäufigkeiten und Quartile werden hier berechnet (siehe `aggregates.binned_distribution`);
+    an den Browser gehen nur diese Kennzahlen statt aller Rohwerte.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    edges, counts, boxes = binned_distribution(filtered(file_path, source_hash, selections, selected_columns), selected_columns, bins=bins)
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+    colors = px.colors.qualitative.Plotly
+    for i, col in enumerate(boxes.index):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            name=col, y=[col], q1=[boxes.at[col, 'q1']], median=[boxes.at[col, 'median']], q3=[boxes.at[col, 'q3']],
+            mean=[boxes.at[col, 'mean']], lowerfence=[boxes.at[col, 'lowerfence']], upperfence=[boxes.at[col, 'upperfence']],
+            orientation='h', marker_color=color, legendgroup=col, showlegend=False
+        ), row=1, col=1)
+        fig.add_trace(go.Bar(
+            name=col, x=(edges[:-1] + edges[1:]) / 2, y=counts[col], width=np.diff(edges),
+            marker_color=color, opacity=0.75, legendgroup=col
+        ), row=2, col=1)
+    fig.update_layout(title="Geforderte vs. erhaltene Deals", barmode='overlay', bargap=0, legend_title_text='variable')
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_xaxes(title_text='value', row=2, col=1)
+    fig.update_yaxes(title_text='count', row=2, col=1)
+    return fig
+
+@st.cache_data(max_entries=32)
+def investment_distribution_png(analytics_path, analytics_hash, cells_path, cells_hash, data_file_path, data_hash,
+                                selections):
+    """Frage 6: Balkendiagramm der Investitionen pro Shark (PNG)."""
+    plt = load_pyplot()
+    totals = selected_shark_totals(
+        analytics_path, analytics_hash, cells_path, cells_hash, data_file_path, data_hash, selections
+    )
+    investment_distribution = totals.set_index('Shark')['Investitionssumme (USD)']
+    investment_distribution.index = investment_distribution.index.astype(str)
+    fig, ax = plt.subplots(figsize=(4, 4))
+    investment_distribution.sort_values(ascending=False).plot(kind='bar', ax=ax, color='skyblue', edgecolor='black')
+    ax.set_title('Verteilung der Investitionen pro Shark', fontsize=11)
+    ax.set_xlabel('Shark', fontsize=8)
+    ax.set_ylabel('Investitionssumme (USD)', fontsize=8)
+
+    # Dezimalformat für die y-Achse
+    formatter = plt.FuncFormatter(lambda x, _: f'{x:,.0f}')
+    ax.yaxis.set_major_formatter(formatter)
+    ax.tick_params(axis='x', labelsize=9, rotation=90)
+    return render_png(fig)
+
+@st.cache_data(max_entries=32)
+def cooperations_png(cells_path, cells_hash, data_file_path, data_hash, selections):
+    """Frage 7: Balkendiagramm der Kooperationen pro Shark (PNG)."""
+    plt = load_pyplot()
+    _, shark_cooperations = cooperations(cells_path, cells_hash, data_file_path, data_hash, selections)
+    fig, ax = plt.subplots(figsize=(8, 8))  # Diagrammgröße definieren
+    ax.bar(shark_cooperations.index, shark_cooperations.values, color='skyblue', edgecolor='black')
+    ax.set_title('Anzahl der Kooperationen pro Shark', fontsize=13)
+    ax.set_xlabel('Sharks', fontsize=11)
+    ax.set_ylabel('Anzahl der Kooperationen', fontsize=11)
+    ax.tick_params(axis='x', labelsize=11, rotation=90)
+    return render_png(fig)
+
+def show_narrow(image):
+    """Zeigt ein Diagramm unabhängig von der Seitenbreite in der mittleren, schmalen Spalte."""
+    col1, col2, col3 = st.columns([1, 2, 1])  # Spalten definieren
+    with col2:
+        st.image(image, use_container_width=True)
 
 st.subheader("\n")
 # Fragen zur Analyse
@@ -88,12 +532,14 @@ st.markdown("""
 st.markdown("\n")
 # Datenset-Übersicht
 st.subheader("Erste Einblicke in das Datenset")
-st.write(data.head())
+st.write(display_with_na(preview(file_path, data_hash)))
 
 st.markdown("\n")
 # Deskriptive Statistik
 st.subheader("Deskriptive Statistik")
-desc_stats = data.describe(include='all').T
+with debug.stage('describe_data', rows_in=total_rows) as record:
+    desc_stats = describe_data(file_path, data_hash)
+    record['rows_out'] = len(desc_stats)
 st.dataframe(desc_stats[['count', 'mean', 'min', 'max', 'std', '25%', '50%', '75%']])
 
 st.markdown("\n")
@@ -105,291 +551,278 @@ Zusätzlich können folgende Fragen anhand der Daten beantwortet werden:
 """)
 
 st.markdown("\n")
+# Filter für das Datenset; die Auswahl gilt auch für die Auswertungen der Fragen
+if not uses_store(file_path):
+    with debug.stage('load_filter_index', rows_in=total_rows):
+        load_filter_index(file_path, data_hash)
+
 # Filteroptionen für Staffel, Branche, Geschlecht und Deal
-staffel_options = data['Staffelnummer'].dropna().unique()
+options = filter_options(file_path, data_hash, tuple(FILTER_COLUMNS))
+staffel_options = options['Staffelnummer']
 selected_staffel = st.multiselect(
     "Wählen Sie Staffel(n):", options=staffel_options, default=staffel_options
 )
-branche_options = data['Branche'].dropna().unique()
+branche_options = options['Branche']
 selected_branche = st.multiselect(
     "Wählen Sie Branche(n):", options=branche_options, default=branche_options
 )
-geschlecht_options = data['Pitcher Geschlecht'].dropna().unique()
+geschlecht_options = options['Pitcher Geschlecht']
 selected_geschlecht = st.multiselect(
     "Wählen Sie Geschlecht(er):", options=geschlecht_options, default=geschlecht_options
 )
-deal_options = data['Deal erhalten'].dropna().unique()
+deal_options = options['Deal erhalten']
 selected_deal = st.multiselect(
     "Wurde ein Deal abgeschlossen?", options=deal_options, default=deal_options
 )
-filtered_data = data[
-    (data['Staffelnummer'].isin(selected_staffel)) &
-    (data['Branche'].isin(selected_branche)) &
-    (data['Pitcher Geschlecht'].isin(selected_geschlecht)) &
-    (data['Deal erhalten'].isin(selected_deal))
-    ]
+
+# Auswahl als hashbarer Schlüssel für die gecachten Auswertungen (unabhängig von der Reihenfolge der Auswahl).
+# Spalten, in denen alle Werte gewählt sind, schränken nicht ein und fehlen im Schlüssel; ohne Einschränkung
+# ist die Auswahl leer, und die Auswertungen verwenden die vorberechneten Ergebnisse des Gesamtdatensets.
+selections = tuple(
+    (col, tuple(sorted(selected, key=str))) for col, options, selected in [
+        ('Staffelnummer', staffel_options, selected_staffel),
+        ('Branche', branche_options, selected_branche),
+        ('Pitcher Geschlecht', geschlecht_options, selected_geschlecht),
+        ('Deal erhalten', deal_options, selected_deal)
+    ] if len(selected) < len(options)
+)
+with debug.stage('filter', rows_in=total_rows) as record:
+    if use_store:
+        filtered_rows = selected_row_count(file_path, data_hash, selections)
+    else:
+        filtered_data = filtered(file_path, data_hash, selections)
+        filtered_rows = len(filtered_data)
+    record['rows_out'] = filtered_rows
 
 # Interaktive Tabelle
+# Aus der Datenbank wird nur die angezeigte Seite geladen, nie die gesamte Auswahl
 st.subheader("Gefilterte Ergebnisse")
+if use_store:
+    pages = max(1, math.ceil(filtered_rows / TABLE_PAGE_ROWS))
+    page = st.number_input("Seite", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+    first_row = (page - 1) * TABLE_PAGE_ROWS
+    with debug.stage('filter_seite', rows_in=filtered_rows) as record:
+        filtered_data = load_store(file_path, data_hash).select(selections, limit=TABLE_PAGE_ROWS, offset=first_row)
+        record['rows_out'] = len(filtered_data)
+    if pages > 1:
+        st.caption(f"Zeilen {first_row + 1:,} bis {first_row + len(filtered_data):,} von {filtered_rows:,}")
 st.dataframe(filtered_data)
 
-# Relevante Spalten für Sharks extrahieren
-shark_columns = [
-    'Barbara Corcoran Investitionssumme',
-    'Mark Cuban Investitionssumme',
-    'Lori Greiner Investitionssumme',
-    'Robert Herjavec Investitionssumme',
-    'Daymond John Investitionssumme',
-    'Kevin O Leary Investitionssumme',
-    'Gast Investitionssumme'
-]
-relevant_columns = ['Name des Startups', 'Geforderter Betrag (USD)', 'Erhaltener Betrag (USD)'] + shark_columns
-filtered_data = data[relevant_columns]
-
-# Daten umstrukturieren
-melted_data = filtered_data.melt(
-    id_vars=['Name des Startups', 'Geforderter Betrag (USD)', 'Erhaltener Betrag (USD)'],
-    value_vars=shark_columns,
-    var_name='Shark',
-    value_name='Investitionssumme'
-)
-melted_data['Shark'] = melted_data['Shark'].str.replace(' Investitionssumme', '')
-shark_investments = melted_data.dropna(subset=['Investitionssumme'])
-
 
-st.title("\n")
-# Beginn Abschnitt Visualisierung
-st.title("Die Analyse")
+# Die Fragen 1–9 als einzelne Abschnitte
+# Jede Frage ist ein eigenes Fragment und wird nur ausgeführt, wenn sie ausgewählt ist. Widgets innerhalb einer Frage
+# (z. B. die Spaltenauswahl in Frage 5) führen nur das Fragment dieser Frage erneut aus.
 
 # Frage 1: Wieviele Deals & No-Deals gab es pro Staffel?
-st.subheader("1. Wieviele Deals & No-Deals gab es pro Staffel?")
-deal_counts = data.groupby(['Staffelnummer', 'Deal erhalten']).size().reset_index(name='Anzahl')
-deal_counts['Deal erhalten'] = deal_counts['Deal erhalten'].replace({1: 'Deal', 0: 'No-Deal'})
-
-# Plot
-fig = px.bar(
-    deal_counts,
-    x='Staffelnummer',
-    y='Anzahl',
-    color='Deal erhalten',
-    barmode='group',
-    labels={'Staffelnummer': 'Staffel', 'Anzahl': 'Anzahl der Pitches'},
-    title='Anzahl der Deals und No-Deals pro Staffel'
-)
-st.plotly_chart(fig, use_container_width=True)
+@st.fragment
+def frage_1():
+    st.subheader("1. Wieviele Deals & No-Deals gab es pro Staffel?")
+    with debug.stage('frage_1', rows_in=filtered_rows):
+        fig = deal_counts_figure(cube_path, cube_hash, file_path, data_hash, selections)
+    st.plotly_chart(fig, use_container_width=True)
 
 # Frage 2: In welche Branche wurde am wenigsten und häufigsten investiert?
-st.subheader("\n")
-st.subheader("2. In welche Branche wurde am wenigsten und häufigsten investiert?")
-# Ersetzen von 0 in "Deal erhalten" durch 2
-data['Deal erhalten'] = data['Deal erhalten'].replace(0, 2)
-
-# Investitionen pro Branche
-branche_mit_deals = data[data['Deal erhalten'] == 1]['Branche'].value_counts().reset_index()
-branche_mit_deals.columns = ['Branche', 'Anzahl Deals']
-branche_ohne_deals = data[data['Deal erhalten'] == 2]['Branche'].value_counts().reset_index()
-branche_ohne_deals.columns = ['Branche', 'Anzahl Deals']
-
-# Stacked Bar Chart
-fig = px.bar(
-    x=branche_mit_deals['Branche'],
-    y=branche_mit_deals['Anzahl Deals'],
-    text=branche_mit_deals['Anzahl Deals'],
-    title="Vergleich der Deals pro Branche",
-    labels={'Anzahl Deals': 'Anzahl der Deals'},
-)
-fig.add_bar(
-    x=branche_ohne_deals['Branche'],
-    y=branche_ohne_deals['Anzahl Deals'],
-    text=branche_ohne_deals['Anzahl Deals'],
-    name='Deals ohne Investition'
-)
-fig.update_layout(
-    xaxis_title="Branche",
-    yaxis_title="Anzahl der Deals",
-    showlegend=True,
-    barmode='stack'
-)
-st.plotly_chart(fig)
+@st.fragment
+def frage_2():
+    st.subheader("2. In welche Branche wurde am wenigsten und häufigsten investiert?")
+    with debug.stage('frage_2', rows_in=filtered_rows):
+        fig = branche_figure(cube_path, cube_hash, file_path, data_hash, selections)
+    st.plotly_chart(fig)
 
 # Frage 3: Wie war die Geschlechterverteilung über die gesamten Staffeln hinweg?
-st.subheader("\n")
-st.subheader("3. Wie war die Geschlechterverteilung über die gesamten Staffeln hinweg?")
-# Pitcher Geschlecht und "Deal erhalten"
-geschlecht_deal_counts = data.groupby(['Pitcher Geschlecht', 'Deal erhalten']).size().reset_index(name='Anzahl Deals')
-geschlecht_deal_counts['Deal erhalten'] = geschlecht_deal_counts['Deal erhalten'].replace({1: 'Deal', 0: 'No-Deal'})
-
-geschlechterverteilung = data['Pitcher Geschlecht'].value_counts().reset_index(name='Anzahl Pitcher')
-geschlechterverteilung.columns = ['Geschlecht', 'Anzahl Pitcher']
-
-# Plot
-fig_gender_distribution = px.bar(
-    geschlechterverteilung,
-    x='Geschlecht',
-    y='Anzahl Pitcher',
-    color='Geschlecht',
-    labels={'Anzahl Pitcher': 'Anzahl der Pitcher'},
-    title='Geschlechterverteilung der Pitcher'
-)
-st.plotly_chart(fig_gender_distribution, use_container_width=True)
+@st.fragment
+def frage_3():
+    st.subheader("3. Wie war die Geschlechterverteilung über die gesamten Staffeln hinweg?")
+    with debug.stage('frage_3', rows_in=filtered_rows):
+        fig = gender_distribution_figure(cube_path, cube_hash, file_path, data_hash, selections)
+    st.plotly_chart(fig, use_container_width=True)
 
 # Frage 4: Welches Geschlecht hat die meisten Deals und No-Deals erhalten?
-st.subheader("\n")
-st.subheader("4. Welches Geschlecht hat die meisten Deals und No-Deals erhalten?")
-# Pitcher Geschlecht und "Deal erhalten"
-geschlecht_deal_counts = data.groupby(['Pitcher Geschlecht', 'Deal erhalten']).size().reset_index(name='Anzahl Deals')
-
-# Umwandlung 1=Deal, 2=No-Deal
-geschlecht_deal_counts['Deal erhalten'] = geschlecht_deal_counts['Deal erhalten'].replace({1: 'Deal', 2: 'No-Deal'})
-
-# Plot
-fig = px.bar(
-    geschlecht_deal_counts,
-    x='Pitcher Geschlecht',
-    y='Anzahl Deals',
-    color='Deal erhalten',
-    barmode='group',
-    labels={'Pitcher Geschlecht': 'Geschlecht', 'Anzahl Deals': 'Anzahl der Deals'},
-    title='Deals und No-Deals pro Geschlecht'
-)
-st.plotly_chart(fig, use_container_width=True)
+@st.fragment
+def frage_4():
+    st.subheader("4. Welches Geschlecht hat die meisten Deals und No-Deals erhalten?")
+    with debug.stage('frage_4', rows_in=filtered_rows):
+        fig = gender_deal_figure(cube_path, cube_hash, file_path, data_hash, selections)
+    st.plotly_chart(fig, use_container_width=True)
 
 # Frage 5: Haben die geforderten den erhaltenen Deals entsprochen?
-st.subheader("\n")
-st.subheader("5. Haben die geforderten den erhaltenen Deals entsprochen?")
-column_options = ['Gebotene Anteile (%)', 'Erhaltene Anteile (%)',
-                  'Geforderter Betrag (USD)', 'Geforderte Bewertung (USD)',
-                  'Erhaltener Betrag (USD)', 'Bewertung anhand Deal (USD)']
-selected_columns = st.multiselect("Wähle um zu vergleichen:", options=column_options, default=column_options)
-filtered_data = data[selected_columns].dropna()
-
-# Histogramms
-fig = px.histogram(
-    data_frame=filtered_data,
-    x=selected_columns,
-    title="Geforderte vs. erhaltene Deals",
-    labels={col: col for col in selected_columns},
-    barmode='overlay',
-    opacity=0.75,
-    marginal='box'
-)
-st.plotly_chart(fig, use_container_width=True)
+@st.fragment
+def frage_5():
+    st.subheader("5. Haben die geforderten den erhaltenen Deals entsprochen?")
+    column_options = ['Gebotene Anteile (%)', 'Erhaltene Anteile (%)',
+                      'Geforderter Betrag (USD)', 'Geforderte Bewertung (USD)',
+                      'Erhaltener Betrag (USD)', 'Bewertung anhand Deal (USD)']
+    selected_columns = st.multiselect("Wähle um zu vergleichen:", options=column_options, default=column_options)
+    with debug.stage('frage_5', rows_in=filtered_rows):
+        fig = deal_comparison_figure(file_path, data_hash, selections, tuple(selected_columns))
+    if not fig.data:
+        st.info("Für die aktuelle Filterauswahl gibt es in den gewählten Spalten keine vollständigen Werte.")
+        return
+    st.plotly_chart(fig, use_container_width=True)
 
 # Frage 6: Welcher Shark hat die höchste Summe investiert?
-st.subheader("\n")
-st.subheader("6. Welcher Shark hat die höchste Summe investiert?")
-investment_distribution = shark_investments.groupby('Shark')['Investitionssumme'].sum()
-
-# Diagramm
-with st.container():
-    fig, ax = plt.subplots(figsize=(4, 4))
-    investment_distribution.sort_values(ascending=False).plot(kind='bar', ax=ax, color='skyblue', edgecolor='black')
-    ax.set_title('Verteilung der Investitionen pro Shark', fontsize=11)
-    ax.set_xlabel('Shark', fontsize=8)
-    ax.set_ylabel('Investitionssumme (USD)', fontsize=8)
-
-    # Dezimalformat für die y-Achse
-    formatter = plt.FuncFormatter(lambda x, _: f'{x:,.0f}')
-    ax.yaxis.set_major_formatter(formatter)
-    ax.tick_params(axis='x', labelsize=9, rotation=90)
-
-    # Layout unabhängig Seitenbreite
-    col1, col2, col3 = st.columns([1, 2, 1])  # Spalten definieren
-    with col2:  # Diagramm nur in der mittleren, schmalen Spalte
-        st.pyplot(fig)
-
-# Frage 7: Welcher Shark hat sich am häufigsten an Kooperationen beteiligt?
-st.subheader("\n")
-st.subheader("7. Welcher Shark hat sich am häufigsten an Kooperationen beteiligt?")
-def main():
-    file_path = "shark_cooperation_matrix.xlsx"
-    try:
-        cooperation_matrix = pd.read_excel(file_path)
-    except FileNotFoundError:
-        st.error("Die Excel-Datei wurde nicht gefunden. Bitte stelle sicher, dass die Datei 'shark_cooperation_matrix.xlsx' im richtigen Verzeichnis vorhanden ist.")
+@st.fragment
+def frage_6():
+    st.subheader("6. Welcher Shark hat die höchste Summe investiert?")
+    with debug.stage('frage_6', rows_in=filtered_rows):
+        totals = selected_shark_totals(
+            analytics_path, analytics_hash, shark_cells_path, shark_cells_hash, file_path, data_hash, selections
+        )
+    if totals.empty:
+        st.info("Für die aktuelle Filterauswahl gibt es keine Investitionen.")
         return
+    with debug.stage('frage_6_diagramm'):
+        image = investment_distribution_png(
+            analytics_path, analytics_hash, shark_cells_path, shark_cells_hash, file_path, data_hash, selections
+        )
+    show_narrow(image)
+
+    # Kennzahlen je Shark über alle Staffeln
+    st.dataframe(
+        totals.sort_values('Investitionssumme (USD)', ascending=False).style.format(
+            {col: '{:,.0f}' for col in totals.columns if col.endswith('(USD)')}
+            | {col: '{:.1f}' for col in totals.columns if col.endswith('(%)')}
+            | {'Anteil Co-Investments': '{:.0%}'}
+        ),
+        hide_index=True
+    )
+    if selections:
+        st.caption("Medianwerte werden nur ohne Filterauswahl angezeigt; sie lassen sich nicht aus den vorberechneten Summen bilden.")
 
-    sharks = pd.concat([cooperation_matrix['Shark A'], cooperation_matrix['Shark B']]).unique()
-    shark_cooperations = {shark: 0 for shark in sharks}
-    for _, row in cooperation_matrix.iterrows():
-        shark_cooperations[row['Shark A']] += row['Count']
-        shark_cooperations[row['Shark B']] += row['Count']
-
-    most_cooperative_shark = max(shark_cooperations, key=shark_cooperations.get)
-    most_cooperations = shark_cooperations[most_cooperative_shark]
-
-    # Diagramm
-    with st.container():  # Damit das Diagramm nicht an die Breite der Seite angepasst wird
-        fig, ax = plt.subplots(figsize=(8, 8))  # Diagrammgröße definieren
-        ax.bar(shark_cooperations.keys(), shark_cooperations.values(), color='skyblue', edgecolor='black')
-        ax.set_title('Anzahl der Kooperationen pro Shark', fontsize=13)
-        ax.set_xlabel('Sharks', fontsize=11)
-        ax.set_ylabel('Anzahl der Kooperationen', fontsize=11)
-        ax.tick_params(axis='x', labelsize=11, rotation=90)
-
-        # Layout unabhängig Seitenbreite
-        col1, col2, col3 = st.columns([1, 2, 1])  # Spalten definieren
-        with col2:  # Diagramm nur in der mittleren, schmalen Spalte
-            st.pyplot(fig)
+# Frage 7: Welcher Shark hat sich am häufigsten an Kooperationen beteiligt?
+@st.fragment
+def frage_7():
+    st.subheader("7. Welcher Shark hat sich am häufigsten an Kooperationen beteiligt?")
+    with debug.stage('frage_7', rows_in=filtered_rows):
+        image = cooperations_png(coalition_cells_path, coalition_cells_hash, file_path, data_hash, selections)
+    show_narrow(image)
 
 # Frage 8: Wer hat am meisten bzw. am wenigsten miteinander kooperiert?
-    st.subheader("\n")
+@st.fragment
+def frage_8():
     st.subheader("8. Wer hat am meisten bzw. am wenigsten miteinander kooperiert?")
-    total_cooperations = cooperation_matrix['Count'].sum()
+    with debug.stage('frage_8', rows_in=filtered_rows) as record:
+        cooperation_matrix, _ = cooperations(coalition_cells_path, coalition_cells_hash, file_path, data_hash, selections)
+        record['rows_out'] = len(cooperation_matrix)
     st.dataframe(cooperation_matrix, use_container_width=False)
 
-if __name__ == "__main__":
-    main()
+    # Syndikate aus drei und mehr Beteiligten (Gast-Sharks zusammengefasst als 'Gast')
+    with debug.stage('frage_8_koalitionen', rows_in=filtered_rows) as record:
+        coalitions = selected_coalitions(
+            coalitions_path, coalitions_hash, coalition_cells_path, coalition_cells_hash, file_path, data_hash, selections
+        )
+        record['rows_out'] = len(coalitions)
+    syndicate_sizes = sorted(coalitions.loc[coalitions['Größe'] >= 3, 'Größe'].unique())
+    if syndicate_sizes:
+        st.markdown("**Syndikate aus drei und mehr Beteiligten**")
+        syndicate_size = st.radio("Größe des Syndikats", syndicate_sizes, horizontal=True)
+        st.dataframe(
+            coalitions[coalitions['Größe'] == syndicate_size].drop(columns='Größe'),
+            use_container_width=True, hide_index=True
+        )
 
 # Frage 9: Was ist bis dato das erfolgreichste Produkt aller SharkTank Staffeln?
-st.subheader("\n")
-st.subheader("9. Was ist bis dato das erfolgreichste Produkt aller SharkTank Staffeln?")
-
-# Bilder von ScrubDaddy
-image_url1 = "https://miro.medium.com/v2/resize:fit:1400/0*F34FGa5k-ZG-Dh3x"
-image_url2 = "https://www.bipa.at/on/demandware.static/-/Sites-catalog/de_AT/v1737030737856/original/376830.png"
-col1, col2 = st.columns(2)  # Zwei Spalten
-with col1:
-    st.image(image_url1, caption="Gründer von ScrubDaddy", width=500)
-
-with col2:
-    st.image(image_url2, caption="Produkt ScrubDaddy", width=300)
-
-# SrubDaddy
-st.markdown("\n")
-st.subheader("Die Erfolgsstory von ScrubDaddy")
-st.write(
-    """
-    **ScrubDaddy – Die Erfolgsstory**
-
-    **1. Was ist ScrubDaddy?**  
-    ScrubDaddy ist ein innovativer Spülschwamm, der sich durch sein spezielles Material und Design auszeichnet. 
-    Er passt sich je nach Druck an und reinigt effektiv empfindliche oder hartnäckige Oberflächen.
-
-    **2. Wie entstand ScrubDaddy?**  
-    Das Unternehmen wurde von Aaron Krause gegründet, der die Idee in der TV-Show *Shark Tank* vorstellte. 
-    Mit Unterstützung der Investorin Lori Greiner erhielt ScrubDaddy eine starke Finanzierung und Bekanntheit.
-
-    **3. Der Erfolg nach *Shark Tank*:**  
-    Durch die Investition und das große Medieninteresse stieg die Nachfrage enorm. 
-    ScrubDaddy etablierte sich weltweit als führendes Reinigungsprodukt und ist heute in großen Einzelhandelsketten 
-    wie Walmart und Target erhältlich. Aber auch in Österreich sind die ScrubDaddy Produkte zahlreichen Supermärkten 
-    und Drogerieketten zu finden.
-    """
-)
-
-st.markdown("\n")
-file_path = "sharktank_cleaned.xlsx"
-try:
-    df = pd.read_excel(file_path)
-except FileNotFoundError:
-    st.error("Die Excel-Datei wurde nicht gefunden. Bitte stelle sicher, dass die Datei 'sharktank_cleaned.xlsx' im richtigen Verzeichnis vorhanden ist.")
-    st.stop()
-scrubdaddy_data = df[df["Name des Startups"] == "ScrubDaddy"] # Filtere nach ScrubDaddy im Datensatz
+@st.fragment
+def frage_9():
+    st.subheader("9. Was ist bis dato das erfolgreichste Produkt aller SharkTank Staffeln?")
+
+    # Bilder von ScrubDaddy
+    image_url1 = "https://miro.medium.com/v2/resize:fit:1400/0*F34FGa5k-ZG-Dh3x"
+    image_url2 = "https://www.bipa.at/on/demandware.static/-/Sites-catalog/de_AT/v1737030737856/original/376830.png"
+    col1, col2 = st.columns(2)  # Zwei Spalten
+    with col1:
+        st.image(image_url1, caption="Gründer von ScrubDaddy", width=500)
+
+    with col2:
+        st.image(image_url2, caption="Produkt ScrubDaddy", width=300)
+
+    # SrubDaddy
+    st.markdown("\n")
+    st.subheader("Die Erfolgsstory von ScrubDaddy")
+    st.write(
+        """
+        **ScrubDaddy – Die Erfolgsstory**
+
+        **1. Was ist ScrubDaddy?**  
+        ScrubDaddy ist ein innovativer Spülschwamm, der sich durch sein spezielles Material und Design auszeichnet. 
+        Er passt sich je nach Druck an und reinigt effektiv empfindliche oder hartnäckige Oberflächen.
+
+        **2. Wie entstand ScrubDaddy?**  
+        Das Unternehmen wurde von Aaron Krause gegründet, der die Idee in der TV-Show *Shark Tank* vorstellte. 
+        Mit Unterstützung der Investorin Lori Greiner erhielt ScrubDaddy eine starke Finanzierung und Bekanntheit.
+
+        **3. Der Erfolg nach *Shark Tank*:**  
+        Durch die Investition und das große Medieninteresse stieg die Nachfrage enorm. 
+        ScrubDaddy etablierte sich weltweit als führendes Reinigungsprodukt und ist heute in großen Einzelhandelsketten 
+        wie Walmart und Target erhältlich. Aber auch in Österreich sind die ScrubDaddy Produkte zahlreichen Supermärkten 
+        und Drogerieketten zu finden.
+        """
+    )
+
+    st.markdown("\n")
+    if data_hash is None:
+        st.error("Die Excel-Datei wurde nicht gefunden. Bitte stelle sicher, dass die Datei 'sharktank_cleaned.xlsx' im richtigen Verzeichnis vorhanden ist.")
+        return
+    with debug.stage('frage_9') as record:
+        # Zeilen von ScrubDaddy aus dem Suchindex
+        startups, scrubdaddy_data = find_startup(startup_index_path, startup_index_hash, file_path, data_hash, "ScrubDaddy")
+        record['rows_out'] = len(scrubdaddy_data)
+
+    st.markdown("\n")
+    if not scrubdaddy_data.empty:
+        st.write("### Details zum Startup ScrubDaddy anhand Datensatz")
+        st.table(display_with_na(scrubdaddy_data))
+    else:
+        st.write("Es wurden keine Informationen zum Startup ScrubDaddy gefunden.")
+
+    # Detailansicht für ein beliebiges Startup über den Suchindex
+    st.markdown("\n")
+    st.subheader("Startup suchen")
+    query = st.text_input("Name des Startups (oder Anfang des Namens):")
+    if not query:
+        return
+    with debug.stage('frage_9_suche') as record:
+        matches = startups.search(query)
+        record['rows_out'] = len(matches)
+    if matches.empty:
+        st.write(f"Es wurde kein Startup zu '{query}' gefunden.")
+        return
+    st.dataframe(matches, use_container_width=True, hide_index=True)
+    startup_name = st.selectbox("Startup auswählen:", matches['Name des Startups'])
+    _, startup_data = find_startup(startup_index_path, startup_index_hash, file_path, data_hash, startup_name)
+    st.write(f"### Details zum Startup {startup_name} anhand Datensatz")
+    st.table(display_with_na(startup_data))
+
+QUESTIONS = {
+    "1. Deals pro Staffel": frage_1,
+    "2. Branchen": frage_2,
+    "3. Geschlechterverteilung": frage_3,
+    "4. Deals pro Geschlecht": frage_4,
+    "5. Gefordert vs. erhalten": frage_5,
+    "6. Investitionen pro Shark": frage_6,
+    "7. Kooperationen pro Shark": frage_7,
+    "8. Kooperationen & Syndikate": frage_8,
+    "9. Erfolgreichstes Produkt": frage_9,
+}
 
+st.title("\n")
+# Beginn Abschnitt Visualisierung
+st.title("Die Analyse")
+if selections:
+    st.caption(
+        f"Die Fragen 1–8 beziehen sich auf die Filterauswahl oben ({filtered_rows:,} von {total_rows:,} Pitches)."
+        .replace(',', '.')
+    )
+selected_question = st.radio("Frage auswählen:", options=list(QUESTIONS), horizontal=True)
+QUESTIONS[selected_question]()
+
+# Debug-Panel: Laufzeit, Speicher und Zeilen der Berechnungen dieses Reruns
 st.markdown("\n")
-if not scrubdaddy_data.empty:
-    st.write("### Details zum Startup ScrubDaddy anhand Datensatz")
-    st.table(scrubdaddy_data)
-else:
-    st.write("Es wurden keine Informationen zum Startup ScrubDaddy gefunden.")
+with st.expander("Debug: Laufzeiten der Berechnungen"):
+    st.dataframe(pd.DataFrame(debug.records))
+with st.expander("Debug: Datenqualität (Stichprobe)"):
+    quality_summary, quality_report = data_quality(file_path, data_hash)
+    st.dataframe(quality_summary, hide_index=True)
+    if not quality_report.empty:
+        st.markdown("**Betroffene Zeilen**")
+        st.dataframe(quality_report, hide_index=True)
@@ -0,0 +1,133 @@
+"""
+Benchmark der Verarbeitungsschritte von SharkTankProcessor mit synthetischen Daten.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.bench_pipeline --sizes 1k,100k
+    python -m benchmarks.bench_pipeline --sizes 1k,100k --save-baseline
+    python -m benchmarks.bench_pipeline --sizes 10M --no-excel
+
+Für jede Größe wird ein synthetischer Rohdatensatz erzeugt und jeder Schritt (load_data, clean_data,
+replace_empty_with_na, summarize_shark_data, generate_cooperation_matrix, save_data) mit Laufzeit und
+Spitzen-Speicher (tracemalloc) gemessen. Die Eingabe ist eine Excel-Datei, bei mehr Zeilen als Excel fasst
+oder mit --no-excel eine Parquet-Datei. Die Ergebnisse werden mit der gespeicherten Baseline verglichen.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic import generate_sharktank
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BASELINE_FILE = RESULTS_DIR / 'baseline.json'
+
+# Excel kann höchstens 1.048.576 Zeilen speichern
+EXCEL_MAX_ROWS = 1_048_575
+
+def _import_pipeline():
+    """Importiert main.py aus dem Projektordner (die Pipeline selbst läuft nur beim direkten Aufruf)."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    import main
+    return main
+
+
+def parse_size(text):
+    """Wandelt Angaben wie '1k', '100k' oder '10M' in eine Zeilenanzahl um."""
+    text = text.strip().lower()
+    factor = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * factor)
+
+
+def measure(func, track_memory):
+    """Misst Laufzeit (Wall/CPU) und Spitzen-Speicher eines Aufrufs."""
+    if track_memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    func()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return {'wall_s': round(wall, 4), 'cpu_s': round(cpu, 4), 'peak_mb': None if peak is None else round(peak, 1)}
+
+
+def run_size(main, rows, workdir, excel, track_memory):
+    """Führt alle Schritte für einen synthetischen Datensatz mit `rows` Zeilen aus."""
+    raw = generate_sharktank(rows)
+    use_excel = excel and rows <= EXCEL_MAX_ROWS
+    input_file = workdir / ('input.xlsx' if use_excel else 'input.parquet')
+    if use_excel:
+        raw.to_excel(input_file, index=False)
+    else:
+        raw.to_parquet(input_file, index=False)
+
+    del raw
+
+    processor = main.SharkTankProcessor(input_file)
+    results = {'load_data': measure(processor.load_data, track_memory)}
+
+    steps = {
+        'clean_data': lambda: processor.clean_data(main.columns_to_drop, main.rename_columns),
+        'replace_empty_with_na': processor.replace_empty_with_na,
+        'validate_data': processor.validate_data,
+        'summarize_shark_data': processor.summarize_shark_data,
+        'generate_cooperation_matrix': processor.generate_cooperation_matrix,
+        'build_startup_index': processor.build_startup_index,
+        'save_data': lambda: processor.save_data(workdir / 'output.parquet'),
+    }
+    for stage, step in steps.items():
+        results[stage] = measure(step, track_memory)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Gibt eine Tabelle aus und liefert die Schritte, die langsamer als Baseline × (1 + tolerance) sind."""
+    regressions = []
+    print(f"{'size':>8} {'stage':<28} {'wall_s':>9} {'cpu_s':>9} {'peak_mb':>9} {'baseline':>9}")
+    for size, stages in results.items():
+        for stage, metrics in stages.items():
+            base = baseline.get(size, {}).get(stage, {}).get('wall_s')
+            flag = ''
+            # Sehr kurze Schritte schwanken stark und werden nicht bewertet
+            if base is not None and metrics['wall_s'] > max(base * (1 + tolerance), base + 0.05):
+                regressions.append((size, stage, base, metrics['wall_s']))
+                flag = '  REGRESSION'
+            print(f"{size:>8} {stage:<28} {metrics['wall_s']:>9.4f} {metrics['cpu_s']:>9.4f} "
+                  f"{metrics['peak_mb'] if metrics['peak_mb'] is not None else '-':>9} "
+                  f"{base if base is not None else '-':>9}{flag}")
+    return regressions
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark der Shark Tank-Pipeline mit synthetischen Daten.')
+    parser.add_argument('--sizes', default='1k,100k', help="Kommagetrennte Größen, z. B. '1k,100k,10M'.")
+    parser.add_argument('--no-excel', action='store_true', help='Eingabe immer als Parquet schreiben.')
+    parser.add_argument('--no-memory', action='store_true', help='Ohne tracemalloc messen (genauere Laufzeiten).')
+    parser.add_argument('--save-baseline', action='store_true', help='Ergebnisse als neue Baseline speichern.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Erlaubte Verlangsamung gegenüber der Baseline.')
+    args = parser.parse_args(argv)
+
+    main = _import_pipeline()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes.split(','):
+            results[size] = run_size(main, parse_size(size), Path(tmp), not args.no_excel, not args.no_memory)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    (RESULTS_DIR / 'latest.json').write_text(json.dumps(results, indent=2))
+    baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+    if args.save_baseline:
+        baseline.update(results)
+        BASELINE_FILE.write_text(json.dumps(baseline, indent=2))
+        print(f"Baseline saved to {BASELINE_FILE}.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,117 @@
+"""
+Benchmark des Kaltstarts des Dashboards.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeats 5 --save-baseline
+
+Jede Messung läuft in einem neuen Python-Prozess (leere Caches, keine bereits importierten Module), so wie bei
+einem neu gestarteten Container. Gemessen werden:
+- die Importzeit der schweren Bibliotheken (`python -X importtime`),
+- die Zeit bis zur ersten vollständig gerenderten Seite (ein Durchlauf von app.py über `streamlit.testing`),
+  sowie welche schweren Bibliotheken dabei tatsächlich importiert wurden.
+Die Ergebnisse werden mit der gespeicherten Baseline verglichen.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BASELINE_FILE = RESULTS_DIR / 'startup_baseline.json'
+
+# Bibliotheken, die nicht auf dem Weg zur ersten Seite liegen sollten
+HEAVY_MODULES = ['streamlit', 'pandas', 'pyarrow', 'plotly.express', 'matplotlib.pyplot', 'seaborn']
+
+# Wird in einem eigenen Prozess ausgeführt: ein Durchlauf von app.py wie beim ersten Seitenaufruf
+FIRST_PAINT_SCRIPT = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=300)
+start = time.perf_counter()
+app.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'first_paint_s': round(elapsed, 4),
+    'exceptions': len(app.exception),
+    'imported': [name for name in sys.argv[2:] if name in sys.modules],
+}))
+'''
+
+
+def import_time(module):
+    """Kumulierte Importzeit eines Moduls in Sekunden (neuer Prozess, `-X importtime`)."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=PROJECT_DIR
+    )
+    if result.returncode != 0:
+        return None
+    # Format: "import time: self [us] | cumulative | imported package"; die letzte Zeile ist das Modul selbst
+    lines = [line for line in result.stderr.splitlines() if line.startswith('import time:')]
+    for line in reversed(lines):
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return round(int(cumulative) / 1e6, 4)
+    return None
+
+
+def first_paint(app_path):
+    """Zeit bis zum ersten vollständigen Durchlauf von app.py in einem neuen Prozess."""
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_PAINT_SCRIPT, str(app_path), *HEAVY_MODULES],
+        capture_output=True, text=True, cwd=PROJECT_DIR
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark des Kaltstarts des Dashboards.')
+    parser.add_argument('--app', default=str(PROJECT_DIR / 'app.py'), help='Pfad zum Dashboard.')
+    parser.add_argument('--repeats', type=int, default=3, help='Anzahl der Messungen (Median wird verwendet).')
+    parser.add_argument('--save-baseline', action='store_true', help='Ergebnisse als neue Baseline speichern.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Erlaubte Verlangsamung gegenüber der Baseline.')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in HEAVY_MODULES:
+        times = [import_time(module) for _ in range(args.repeats)]
+        times = [t for t in times if t is not None]
+        results[f'import {module}'] = statistics.median(times) if times else None
+
+    runs = [first_paint(args.app) for _ in range(args.repeats)]
+    results['first_paint'] = statistics.median(run['first_paint_s'] for run in runs)
+    imported = runs[-1]['imported']
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    (RESULTS_DIR / 'startup_latest.json').write_text(json.dumps(results, indent=2))
+    baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+    regressions = []
+    print(f"{'measure':<28} {'seconds':>9} {'baseline':>9}")
+    for measure, seconds in results.items():
+        base = baseline.get(measure)
+        flag = ''
+        # Sehr kurze Zeiten schwanken stark und werden nicht bewertet
+        if seconds is not None and base is not None and seconds > max(base * (1 + args.tolerance), base + 0.05):
+            regressions.append(measure)
+            flag = '  REGRESSION'
+        print(f"{measure:<28} {seconds if seconds is not None else '-':>9} {base if base is not None else '-':>9}{flag}")
+    print(f"Imported during first paint: {', '.join(imported) or '-'}")
+    if any(run['exceptions'] for run in runs):
+        print("The dashboard raised exceptions during the first run.")
+        regressions.append('exceptions')
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {BASELINE_FILE}.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
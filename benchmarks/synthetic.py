@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Schema der Rohdaten (Spaltenreihenfolge wie in sharktank.xlsx)
+RAW_COLUMNS = [
+    'Season Number', 'Season Start', 'Season End', 'Episode Number', 'Pitch Number', 'Original Air Date',
+    'Startup Name', 'Industry', 'Business Description', 'Pitchers Gender', 'Pitchers City', 'Pitchers State',
+    'Pitchers Average Age', 'Entrepreneur Names', 'Company Website', 'Multiple Entrepreneurs', 'US Viewership',
+    'Original Ask Amount', 'Original Offered Equity', 'Valuation Requested', 'Got Deal', 'Total Deal Amount',
+    'Total Deal Equity', 'Deal Valuation', 'Number of sharks in deal', 'Investment Amount Per Shark',
+    'Equity Per Shark', 'Royalty Deal', 'Loan',
+    'Barbara Corcoran Investment Amount', 'Barbara Corcoran Investment Equity',
+    'Mark Cuban Investment Amount', 'Mark Cuban Investment Equity',
+    'Lori Greiner Investment Amount', 'Lori Greiner Investment Equity',
+    'Robert Herjavec Investment Amount', 'Robert Herjavec Investment Equity',
+    'Daymond John Investment Amount', 'Daymond John Investment Equity',
+    'Kevin O Leary Investment Amount', 'Kevin O Leary Investment Equity',
+    'Guest Investment Amount', 'Guest Investment Equity', 'Guest Name',
+    'Barbara Corcoran Present', 'Mark Cuban Present', 'Lori Greiner Present',
+    'Robert Herjavec Present', 'Daymond John Present', 'Kevin O Leary Present'
+]
+
+SHARK_NAMES = [
+    'Barbara Corcoran', 'Mark Cuban', 'Lori Greiner', 'Robert Herjavec',
+    'Daymond John', 'Kevin O Leary'
+]
+INDUSTRIES = [
+    'Food and Beverage', 'Lifestyle/Home', 'Fashion/Beauty', 'Children/Education', 'Fitness/Sports/Outdoors',
+    'Health/Wellness', 'Software/Tech', 'Pet Products', 'Business Services', 'Media/Entertainment',
+    'Uncertain/Other', 'Automotive', 'Electronics', 'Green/CleanTech', 'Travel', 'Liquor/Alcohol'
+]
+STATES = ['CA', 'NY', 'FL', 'TX', 'IL', 'GA', 'NJ', 'PA', 'OH', 'NC', 'MA', 'WA', 'CO', 'AZ', 'UT', 'MI']
+GUESTS = ['Daniel Lubetzky', 'Chris Sacca', 'Rohan Oza', 'Alex Rodriguez', 'Emma Grede']
+
+# Verteilungen, grob aus dem echten Datensatz abgeleitet
+PITCHES_PER_SEASON = 91
+DEAL_RATE = 0.60
+SHARKS_PER_DEAL = {1: 0.74, 2: 0.22, 3: 0.02, 4: 0.01, 5: 0.01}
+GUEST_WEIGHT = 0.15
+
+
+def _with_missing(rng, values, rate):
+    values = pd.Series(values, dtype=object)
+    values[rng.random(len(values)) < rate] = np.nan
+    return values
+
+
+def generate_sharktank(rows, seed=42):
+    """
+    Erzeugt einen synthetischen Shark Tank-Datensatz mit dem Schema von `sharktank.xlsx`.
+    Staffeln, Branchen und Geschlechter werden zufällig gezogen; etwa 60 % der Pitches erhalten einen Deal,
+    und pro Deal investieren meist ein oder zwei Sharks (gelegentlich ein Gast), sodass die
+    Investitionsspalten ähnlich dünn besetzt sind wie im echten Datensatz.
+    Parameters:
+    - rows (int): Anzahl der Pitches.
+    - seed (int): Startwert des Zufallsgenerators.
+    Returns:
+        pd.DataFrame: Der synthetische Rohdatensatz.
+    """
+    rng = np.random.default_rng(seed)
+    season = np.arange(rows) // PITCHES_PER_SEASON + 1
+    season_start = pd.Timestamp('2009-08-09') + pd.to_timedelta((season - 1) * 365, unit='D')
+    episode = (np.arange(rows) % PITCHES_PER_SEASON) // 4 + 1
+    air_date = season_start + pd.to_timedelta(episode * 7, unit='D')
+
+    ask = rng.choice([50000, 100000, 150000, 200000, 250000, 300000, 500000, 1000000], size=rows)
+    offered_equity = rng.choice([5.0, 10.0, 15.0, 20.0, 25.0, 30.0], size=rows)
+    got_deal = (rng.random(rows) < DEAL_RATE).astype(np.int64)
+
+    # Anzahl der Investoren pro Deal und zufällige Auswahl aus sechs Sharks plus Gast
+    counts = rng.choice(list(SHARKS_PER_DEAL), size=rows, p=list(SHARKS_PER_DEAL.values())) * got_deal
+    weights = np.array([1.0] * len(SHARK_NAMES) + [GUEST_WEIGHT])
+    keys = rng.random((rows, len(weights))) ** (1.0 / weights)
+    rank = np.argsort(np.argsort(-keys, axis=1), axis=1)
+    participates = rank < counts[:, None]
+
+    deal_amount = np.where(got_deal == 1, ask * rng.choice([0.5, 1.0, 1.0, 1.5], size=rows), np.nan)
+    deal_equity = np.where(got_deal == 1, offered_equity * rng.choice([1.0, 1.5, 2.0], size=rows), np.nan)
+    n_investors = np.where(counts > 0, counts, 1)
+    per_shark_amount = deal_amount / n_investors
+    per_shark_equity = deal_equity / n_investors
+
+    data = {
+        'Season Number': season,
+        'Season Start': season_start,
+        'Season End': season_start + pd.Timedelta(days=200),
+        'Episode Number': episode,
+        'Pitch Number': np.arange(rows) + 1,
+        'Original Air Date': air_date,
+        'Startup Name': pd.Series(np.arange(rows)).map('Startup{}'.format),
+        'Industry': rng.choice(INDUSTRIES, size=rows),
+        'Business Description': rng.choice(['Product', 'Service', 'App', 'Food'], size=rows),
+        'Pitchers Gender': _with_missing(rng, rng.choice(['Male', 'Female', 'Mixed Team'], size=rows, p=[0.55, 0.26, 0.19]), 0.005),
+        'Pitchers City': rng.choice(['Los Angeles', 'New York', 'Miami', 'Austin', 'Chicago'], size=rows),
+        'Pitchers State': _with_missing(rng, rng.choice(STATES, size=rows), 0.03),
+        'Pitchers Average Age': _with_missing(rng, rng.choice(['Young', 'Middle', 'Old'], size=rows, p=[0.07, 0.9, 0.03]), 0.73),
+        'Entrepreneur Names': rng.choice(['Alex Smith', 'Sam Lee', 'Jordan Brown'], size=rows),
+        'Company Website': rng.choice(['https://example.com', 'https://example.org'], size=rows),
+        'Multiple Entrepreneurs': rng.integers(0, 2, size=rows).astype(float),
+        'US Viewership': rng.uniform(3.0, 9.0, size=rows).round(2),
+        'Original Ask Amount': ask,
+        'Original Offered Equity': offered_equity,
+        'Valuation Requested': (ask / offered_equity * 100).astype(np.int64),
+        'Got Deal': got_deal,
+        'Total Deal Amount': deal_amount,
+        'Total Deal Equity': deal_equity,
+        'Deal Valuation': deal_amount / deal_equity * 100,
+        'Number of sharks in deal': np.where(got_deal == 1, counts, np.nan),
+        'Investment Amount Per Shark': per_shark_amount,
+        'Equity Per Shark': per_shark_equity,
+        'Royalty Deal': np.where(rng.random(rows) < 0.06, 1.0, np.nan),
+        'Loan': np.where(rng.random(rows) < 0.04, 200000.0, np.nan),
+    }
+    for i, shark in enumerate(SHARK_NAMES):
+        data[f'{shark} Investment Amount'] = np.where(participates[:, i], per_shark_amount, np.nan)
+        data[f'{shark} Investment Equity'] = np.where(participates[:, i], per_shark_equity, np.nan)
+    guest = participates[:, len(SHARK_NAMES)]
+    data['Guest Investment Amount'] = np.where(guest, per_shark_amount, np.nan)
+    data['Guest Investment Equity'] = np.where(guest, per_shark_equity, np.nan)
+    data['Guest Name'] = pd.Series(np.where(guest, rng.choice(GUESTS, size=rows), None), dtype=object)
+    for shark in SHARK_NAMES:
+        data[f'{shark} Present'] = np.where(rng.random(rows) < 0.85, 1.0, np.nan)
+    return pd.DataFrame(data, columns=RAW_COLUMNS)
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import CUBE_DIMENSIONS, SHARKS
+
+# Mögliche Mitglieder einer Koalition: die sechs Sharks und (zusammengefasst) die Gast-Sharks
+PARTICIPANTS = SHARKS + ['Gast']
+PARTICIPANT_COLUMNS = [f'{participant} Investitionssumme' for participant in PARTICIPANTS]
+MASK_COUNT = 1 << len(PARTICIPANTS)
+
+# Kennzahlen pro Besetzung: Anzahl der Deals sowie Summe des erhaltenen Betrags und der erhaltenen Anteile
+DEAL_MEASURES = {'Anzahl': None, 'Betrag': 'Erhaltener Betrag (USD)', 'Anteile': 'Erhaltene Anteile (%)'}
+HISTOGRAM_COLUMNS = [
+    f'Besetzung {mask} {measure}' for measure in DEAL_MEASURES for mask in range(MASK_COUNT)
+]
+# Spalten, die `coalition_histogram` liest
+INPUT_COLUMNS = PARTICIPANT_COLUMNS + [column for column in DEAL_MEASURES.values() if column is not None]
+# Schlüssel der Zellentabelle `coalition_cells`: die Dimensionen des Aggregat-Würfels und die Besetzung
+CELL_KEYS = CUBE_DIMENSIONS + ['Besetzung']
+
+
+def deal_masks(data):
+    """
+    Kodiert die Besetzung jedes Pitches als Bitmaske: Bit i ist gesetzt, wenn `PARTICIPANTS[i]` investiert hat.
+    Pitches ohne Investition erhalten die Maske 0.
+    """
+    participation = data[PARTICIPANT_COLUMNS].notna().to_numpy(dtype=np.int64)
+    return participation @ (1 << np.arange(len(PARTICIPANTS), dtype=np.int64))
+
+
+def coalition_histogram(data, by=None):
+    """
+    Zählt in einem Durchlauf die Deals je exakter Besetzung (Bitmaske) und summiert dabei Betrag und Anteile.
+    Die Histogramme sind additiv und können daher pro Staffel oder Block berechnet und später aufsummiert werden.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz.
+    - by (pd.Series): Optionale Gruppierung (z. B. Staffelnummer); fehlende Werte bilden eine eigene Gruppe.
+    Returns:
+        pd.DataFrame: Eine Zeile pro Gruppe (bzw. eine Zeile ohne `by`) mit den Spalten `HISTOGRAM_COLUMNS`.
+    """
+    masks = deal_masks(data)
+    if by is None:
+        codes, groups = np.zeros(len(data), dtype=np.int64), pd.Index([0])
+    else:
+        codes, groups = pd.factorize(by, sort=True, use_na_sentinel=False)
+        groups = pd.Index(groups, name=by.name)
+    keys = codes * MASK_COUNT + masks
+    size = len(groups) * MASK_COUNT
+    blocks = []
+    for column in DEAL_MEASURES.values():
+        weights = None if column is None else (
+            pd.to_numeric(data[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        )
+        blocks.append(np.bincount(keys, weights=weights, minlength=size).reshape(len(groups), MASK_COUNT))
+    return pd.DataFrame(np.hstack(blocks).astype(np.float64), index=groups, columns=HISTOGRAM_COLUMNS)
+
+
+def coalition_cells(data):
+    """
+    Das Besetzungs-Histogramm pro Zelle des Aggregat-Würfels (siehe `aggregates.build_aggregate_cube`), als lange
+    Tabelle mit einer Zeile pro vorkommender Kombination aus Zelle und Besetzung. Da die Histogramme additiv sind,
+    ergibt das Summieren der Zellen einer Filterauswahl (siehe `aggregates.select_cells` und `cell_histogram`)
+    dasselbe Histogramm wie `coalition_histogram` über die gefilterten Zeilen.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz (Dimensionen des Würfels und `INPUT_COLUMNS`).
+    Returns:
+        pd.DataFrame: Die Spalten `CELL_KEYS` sowie 'Anzahl', 'Betrag' und 'Anteile' (siehe `DEAL_MEASURES`).
+    """
+    values = pd.DataFrame({
+        measure: pd.to_numeric(data[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        for measure, column in DEAL_MEASURES.items() if column is not None
+    }, index=data.index)
+    keys = [data[col] for col in CUBE_DIMENSIONS] + [pd.Series(deal_masks(data), index=data.index, name='Besetzung')]
+    grouped = values.groupby(keys, observed=True, dropna=False)
+    cells = grouped.sum()
+    cells.insert(0, 'Anzahl', grouped.size().astype(np.float64))
+    return cells.reset_index()
+
+
+def cell_histogram(cells):
+    """
+    Summiert die Zellen aus `coalition_cells` zu einem Besetzungs-Histogramm (wie `coalition_histogram` ohne `by`).
+    Returns:
+        pd.Series: Die Summen der `HISTOGRAM_COLUMNS`.
+    """
+    masks = cells['Besetzung'].to_numpy(dtype=np.int64)
+    sums = [
+        np.bincount(masks, weights=cells[measure].to_numpy(dtype=np.float64), minlength=MASK_COUNT)
+        for measure in DEAL_MEASURES
+    ]
+    return pd.Series(np.concatenate(sums), index=HISTOGRAM_COLUMNS)
+
+
+def cooperation_counts(histogram):
+    """
+    Die Anzahl der gemeinsamen Investitionen je Shark-Paar aus einem Besetzungs-Histogramm: für Shark A und B
+    die Summe aller Besetzungen, in denen beide investiert haben (wie `SharkTankProcessor.generate_cooperation_matrix`
+    mit `square=True`; die Gast-Sharks zählen nicht als Kooperationspartner).
+    Parameters:
+    - histogram (pd.Series | pd.DataFrame): Summe der `HISTOGRAM_COLUMNS` (eine Zeile oder bereits aufsummiert).
+    Returns:
+        pd.DataFrame: Die symmetrische Shark × Shark-Matrix mit Diagonale 0.
+    """
+    if isinstance(histogram, pd.DataFrame):
+        histogram = histogram.sum()
+    exact = histogram[HISTOGRAM_COLUMNS[:MASK_COUNT]].to_numpy(dtype=np.float64).reshape(MASK_COUNT, 1)
+    joint = _superset_sums(exact)[:, 0]
+    bits = 1 << np.arange(len(SHARKS))
+    counts = joint[bits[:, None] | bits[None, :]].round().astype(np.int64)
+    np.fill_diagonal(counts, 0)
+    return pd.DataFrame(counts, index=SHARKS, columns=SHARKS)
+
+
+def _superset_sums(values):
+    """
+    Zeta-Transformation über die Obermengen: für jede Maske S die Summe über alle Masken T ⊇ S.
+    Die Masken werden dazu als Würfel mit einer Achse der Länge 2 pro Teilnehmer dargestellt; eine umgekehrte
+    kumulierte Summe entlang jeder Achse addiert für jedes Bit die Werte, in denen das Bit zusätzlich gesetzt ist.
+    """
+    cube = values.reshape([2] * len(PARTICIPANTS) + [-1])
+    for axis in range(len(PARTICIPANTS)):
+        cube = np.flip(np.cumsum(np.flip(cube, axis), axis=axis), axis)
+    return cube.reshape(MASK_COUNT, -1)
+
+
+def coalition_table(histogram, min_size=2):
+    """
+    Erstellt aus einem Besetzungs-Histogramm die Übersicht aller Koalitionen ab `min_size` Mitgliedern.
+    'Gemeinsame Deals' zählt alle Deals, an denen alle Mitglieder beteiligt waren (ggf. mit weiteren Sharks),
+    'Deals in genau dieser Besetzung' nur die Deals ohne weitere Beteiligte. Die Durchschnitte beziehen sich
+    auf die gemeinsamen Deals.
+    Parameters:
+    - histogram (pd.Series | pd.DataFrame): Summe der `HISTOGRAM_COLUMNS` (eine Zeile oder bereits aufsummiert).
+    - min_size (int): Mindestanzahl an Mitgliedern einer Koalition.
+    Returns:
+        pd.DataFrame: Eine Zeile pro Koalition mit mindestens einem gemeinsamen Deal.
+    """
+    if isinstance(histogram, pd.DataFrame):
+        histogram = histogram.sum()
+    exact = histogram[HISTOGRAM_COLUMNS].to_numpy(dtype=np.float64).reshape(len(DEAL_MEASURES), MASK_COUNT).T
+    joint = _superset_sums(exact)
+
+    masks = np.arange(MASK_COUNT)
+    bits = (masks[:, None] >> np.arange(len(PARTICIPANTS))) & 1
+    sizes = bits.sum(axis=1)
+    keep = (sizes >= min_size) & (joint[:, 0] > 0)
+    names = np.array(PARTICIPANTS, dtype=object)
+
+    counts = joint[keep, 0]
+    table = pd.DataFrame({
+        'Koalition': [' & '.join(names[row.astype(bool)]) for row in bits[keep]],
+        'Größe': sizes[keep],
+        'Gemeinsame Deals': counts.astype(np.int64),
+        'Deals in genau dieser Besetzung': exact[keep, 0].astype(np.int64),
+        'Ø Erhaltener Betrag (USD)': joint[keep, 1] / counts,
+        'Ø Erhaltene Anteile (%)': joint[keep, 2] / counts,
+    })
+    return table.sort_values(['Größe', 'Gemeinsame Deals', 'Koalition'], ascending=[True, False, True],
+                             ignore_index=True)
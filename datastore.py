@@ -0,0 +1,477 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from schema import (
+    CATEGORICAL_COLUMNS, NA_LABEL, NUMERIC_PITCH_COLUMNS, NUMERIC_SHARK_COLUMNS, TEXT_COLUMNS, apply_schema,
+    smallest_integer_dtype, with_na_labels
+)
+from sqlstore import SqliteStore, write_sqlite
+
+# Spaltenformate, die schneller als Excel gelesen und geschrieben werden können (in der Reihenfolge, in der
+# `read_table` sie bevorzugt)
+COLUMNAR_FORMATS = {'.arrow': 'arrow', '.parquet': 'parquet', '.feather': 'feather'}
+
+# Eingebettete Datenbank, die das Dashboard per Abfrage liest (siehe `sqlstore.SqliteStore`)
+DATABASE_SUFFIX = '.sqlite'
+
+# Verzeichnis der Quelldaten: pro abgeleiteter Datei (Würfel, Kennzahlen, ...) die Inhalts-Hashes der bereinigten
+# Daten, aus denen sie berechnet wurde (siehe `record_sources` und `derived_hash`)
+SOURCES_FILE = 'pipeline_sources.json'
+
+# Eintrag in `SOURCES_FILE` mit den Inhalts-Hashes, die die Pipeline für ihre Dateien bereits berechnet hat, jeweils
+# mit Größe und Änderungszeitpunkt (siehe `record_hashes`)
+HASHES_KEY = '_hashes'
+
+# Excel fasst höchstens 1.048.576 Zeilen einschließlich der Kopfzeile
+EXCEL_MAX_ROWS = 1_048_575
+
+# Ganzzahlige Spalten, die beim Streaming nicht zu Gleitkommazahlen werden sollen
+INTEGER_COLUMNS = ['Staffelnummer', 'Deal erhalten', 'Anzahl der Sharks bei Deal']
+
+
+def write_arrow(df, file_name):
+    """
+    Schreibt einen Datenrahmen als unkomprimierte Arrow-IPC-Datei, die `map_table` ohne Kopie einblenden kann.
+    Jede Spalte wird zu einem einzigen zusammenhängenden Block zusammengefasst. Fehlende Werte in Gleitkommaspalten
+    bleiben NaN statt Arrow-Null, damit die Spalte ohne Umwandlung als NumPy-Array gelesen werden kann.
+    Parameters:
+    - df (pd.DataFrame): Der zu speichernde Datenrahmen (bereits typisiert, siehe `schema.apply_schema`).
+    - file_name (str): Pfad der Arrow-Datei.
+    Returns:
+        Path: Der Pfad der gespeicherten Datei.
+    """
+    import pyarrow as pa
+    save_path = Path(file_name).resolve()
+    df = df.reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for position, col in enumerate(df.columns):
+        if pd.api.types.is_float_dtype(df[col]) and not isinstance(df[col].dtype, pd.api.extensions.ExtensionDtype):
+            values = pa.array(df[col].to_numpy(), from_pandas=False)
+            table = table.set_column(position, table.schema.field(position), values)
+    table = table.combine_chunks()
+    # Eine temporäre Datei wird erst nach dem Schreiben umbenannt: laufende App-Prozesse, die die alte Datei
+    # eingeblendet haben, lesen so nie eine halb geschriebene Datei
+    temp_path = save_path.with_name(save_path.name + '.tmp')
+    with pa.OSFile(str(temp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    temp_path.replace(save_path)
+    return save_path
+
+
+def map_table(file_name):
+    """
+    Blendet eine mit `write_arrow` geschriebene Datei schreibgeschützt in den Speicher ein (Memory Mapping).
+    Zahlenspalten ohne Arrow-Null werden ohne Kopie als NumPy-Arrays auf die Datei übernommen, Textspalten ohne
+    Kopie als Arrow-basierte Spalten (`pd.ArrowDtype`). Sie belegen Seiten des Dateicaches, die sich alle Prozesse
+    auf demselben Rechner teilen, und werden erst beim Zugriff gelesen. Nur Kategorien und nullable Ganzzahlen
+    werden in den Prozessspeicher umgewandelt.
+    Parameters:
+    - file_name (str): Pfad der Arrow-Datei.
+    Returns:
+        pd.DataFrame: Der Datenrahmen; die eingeblendeten Spalten sind schreibgeschützt.
+    """
+    import pyarrow as pa
+    with pa.memory_map(str(file_name), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    mapped, converted = {}, []
+    for field, column in zip(table.schema, table.columns):
+        numeric = pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+        if numeric and column.num_chunks == 1 and column.null_count == 0:
+            mapped[field.name] = column.chunk(0).to_numpy(zero_copy_only=True)
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            mapped[field.name] = pd.arrays.ArrowExtensionArray(column)
+        else:
+            converted.append(field.name)
+    # Die Umwandlung über das Pandas-Schema der Datei stellt Kategorien und nullable Typen wieder her
+    rest = table.select(converted).to_pandas() if converted else pd.DataFrame(index=pd.RangeIndex(table.num_rows))
+    columns = {col: mapped[col] if col in mapped else rest[col] for col in table.column_names}
+    return pd.DataFrame(columns, copy=False)
+
+
+def write_table(df, file_name, excel_copy=False):
+    """
+    Speichert einen Datenrahmen abhängig von der Dateiendung als Arrow, Parquet, Feather, SQLite-Datenbank oder Excel.
+    Arrow, Parquet und Feather erhalten das typisierte Schema (siehe `schema.apply_schema`); die SQLite-Datenbank erhält
+    Indizes auf den Filterspalten (siehe `sqlstore.write_sqlite`); in Excel werden fehlende Investitionswerte
+    als 'N/A' geschrieben.
+    Parameters:
+    - df (pd.DataFrame): Der zu speichernde Datenrahmen.
+    - file_name (str): Zielpfad; die Endung (.arrow, .parquet, .feather, .sqlite, .xlsx) bestimmt das Format.
+    - excel_copy (bool): Wenn True, wird zusätzlich eine Excel-Datei mit gleichem Namen geschrieben. Bei mehr Zeilen,
+      als Excel fasst, entfällt die Kopie mit einer Warnung.
+    Returns:
+        Path: Der Pfad der gespeicherten Datei.
+    """
+    save_path = Path(file_name).resolve()
+    file_format = COLUMNAR_FORMATS.get(save_path.suffix.lower())
+    if save_path.suffix.lower() == DATABASE_SUFFIX:
+        file_format = 'sqlite'
+        write_sqlite(apply_schema(df), save_path)
+    elif file_format == 'arrow':
+        write_arrow(apply_schema(df), save_path)
+    elif file_format == 'parquet':
+        apply_schema(df).to_parquet(save_path, index=False)
+    elif file_format == 'feather':
+        apply_schema(df).reset_index(drop=True).to_feather(save_path)
+    else:
+        with_na_labels(df).to_excel(save_path, index=False)
+    if excel_copy and file_format is not None and len(df) > EXCEL_MAX_ROWS:
+        print(f"Warning: {save_path.name} has {len(df):,} rows, more than Excel can hold; skipping the Excel copy.")
+    elif excel_copy and file_format is not None:
+        copy_path = save_path.with_suffix('.xlsx')
+        with_na_labels(df).to_excel(copy_path, index=False)
+        # Die Kopie erhält den Änderungszeitpunkt der Hauptdatei: sie ist derselbe Stand und gilt für
+        # `resolve_table_path` daher nicht als neuer
+        os.utime(copy_path, ns=(copy_path.stat().st_atime_ns, save_path.stat().st_mtime_ns))
+    return save_path
+
+
+def resolve_table_path(file_name):
+    """
+    Ermittelt die Datei, die `read_table` tatsächlich lesen würde: von den Arrow-, Parquet-, Feather- und
+    Excel-Varianten mit gleichem Namen die zuletzt geänderte, bei gleichem Änderungszeitpunkt in dieser Reihenfolge.
+    Eine nachträglich bearbeitete Excel-Datei wird so nicht von einer älteren Parquet-Datei verdeckt.
+    Eine SQLite-Datenbank wird nur gelesen, wenn sie ausdrücklich angegeben ist.
+    Parameters:
+    - file_name (str): Pfad zur Datei (mit oder ohne Endung).
+    Returns:
+        Path: Der Pfad der zu lesenden Datei (existiert ggf. nicht).
+    """
+    path = Path(file_name)
+    if path.suffix.lower() == DATABASE_SUFFIX:
+        return path
+    candidates = [path.with_suffix(suffix) for suffix in [*COLUMNAR_FORMATS, '.xlsx']]
+    existing = [candidate for candidate in candidates if candidate.exists()]
+    if not existing:
+        return path.with_suffix('.xlsx')
+    # max() liefert bei gleichem Zeitpunkt den ersten Kandidaten, also das bevorzugte Format
+    return max(existing, key=lambda candidate: candidate.stat().st_mtime_ns)
+
+
+def modified_ns(file_name):
+    """
+    Änderungszeitpunkt (ns) der Datei, die `read_table` lesen würde, oder None, wenn sie nicht existiert.
+    """
+    path = resolve_table_path(file_name)
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def read_table(file_name):
+    """
+    Lädt einen Datenrahmen. Liegt neben der angegebenen Datei eine Arrow-, Parquet- oder Feather-Variante
+    mit gleichem Namen, wird diese bevorzugt, da sie deutlich schneller als Excel gelesen wird.
+    Arrow-Dateien werden eingeblendet statt gelesen (siehe `map_table`).
+    Parameters:
+    - file_name (str): Pfad zur Datei (mit oder ohne Endung).
+    Returns:
+        pd.DataFrame: Der geladene Datenrahmen.
+    """
+    path = resolve_table_path(file_name)
+    file_format = COLUMNAR_FORMATS.get(path.suffix)
+    if file_format == 'arrow':
+        return map_table(path)
+    if file_format == 'parquet':
+        return pd.read_parquet(path)
+    if file_format == 'feather':
+        return pd.read_feather(path)
+    if path.suffix.lower() == DATABASE_SUFFIX:
+        return SqliteStore(path).select()
+    return apply_schema(pd.read_excel(path, na_values=[NA_LABEL]))
+
+
+@lru_cache(maxsize=64)
+def _hash_file(path, mtime_ns, size):
+    # Von der Pipeline festgehaltener Hash, solange Größe und Änderungszeitpunkt der Datei unverändert sind
+    recorded = _read_sources(Path(path).parent).get(HASHES_KEY, {}).get(Path(path).name)
+    if recorded is not None and (recorded['size'], recorded['mtime_ns']) == (size, mtime_ns):
+        return recorded['sha256']
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_hash(file_name):
+    """
+    Berechnet den Inhalts-Hash (SHA-256) der Datei, die `read_table` lesen würde.
+    Hat die Pipeline den Hash beim Schreiben festgehalten (siehe `record_hashes`) und sind Größe und
+    Änderungszeitpunkt der Datei seither unverändert, wird er übernommen, ohne die Datei zu lesen. Sonst wird er
+    pro Änderungszeitpunkt und Dateigröße nur einmal berechnet, sodass wiederholte Aufrufe (z. B. bei jedem
+    Streamlit-Rerun) die Datei nicht erneut lesen.
+    Parameters:
+    - file_name (str): Pfad zur Datei (mit oder ohne Endung).
+    Returns:
+        str | None: Der Hash oder None, wenn die Datei nicht existiert.
+    """
+    return file_hash(resolve_table_path(file_name))
+
+
+def file_hash(file_name):
+    """
+    Inhalts-Hash (SHA-256) genau dieser Datei, ohne Varianten mit anderer Endung zu berücksichtigen.
+    Returns:
+        str | None: Der Hash oder None, wenn die Datei nicht existiert.
+    """
+    path = Path(file_name).resolve()
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return _hash_file(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _read_sources(directory):
+    sources_path = Path(directory) / SOURCES_FILE
+    if not sources_path.exists():
+        return {}
+    with open(sources_path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def record_sources(file_names, source_hashes):
+    """
+    Hält fest, aus welchen bereinigten Daten abgeleitete Dateien berechnet wurden. Die Einträge stehen in
+    `SOURCES_FILE` im Ordner der jeweiligen Datei; bestehende Einträge anderer Dateien bleiben erhalten.
+    Parameters:
+    - file_names (list): Die abgeleiteten Dateien (mit Endung).
+    - source_hashes (list): Inhalts-Hashes der bereinigten Daten (eine Datei pro geschriebenem Format);
+      leer, wenn die bereinigten Daten nicht im selben Lauf gespeichert wurden.
+    """
+    by_directory = {}
+    for file_name in file_names:
+        path = Path(file_name).resolve()
+        by_directory.setdefault(path.parent, []).append(path.name)
+    for directory, names in by_directory.items():
+        sources = _read_sources(directory)
+        sources.update({name: sorted(set(source_hashes)) for name in names})
+        _write_sources(directory, sources)
+
+
+def record_hashes(file_names):
+    """
+    Berechnet die Inhalts-Hashes der von der Pipeline geschriebenen Dateien und hält sie mit Größe und
+    Änderungszeitpunkt in `SOURCES_FILE` fest. `content_hash` übernimmt sie, solange die Datei unverändert ist,
+    sodass das Dashboard beim Start die Dateien nicht vollständig lesen muss.
+    Parameters:
+    - file_names (list): Die geschriebenen Dateien (mit Endung).
+    Returns:
+        list: Die Inhalts-Hashes in der Reihenfolge von `file_names`.
+    """
+    hashes, by_directory = [], {}
+    for file_name in file_names:
+        path = Path(file_name).resolve()
+        stat = path.stat()
+        hashes.append(_hash_file(str(path), stat.st_mtime_ns, stat.st_size))
+        by_directory.setdefault(path.parent, {})[path.name] = {
+            'sha256': hashes[-1], 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns
+        }
+    for directory, records in by_directory.items():
+        sources = _read_sources(directory)
+        sources.setdefault(HASHES_KEY, {}).update(records)
+        _write_sources(directory, sources)
+    return hashes
+
+
+def _write_sources(directory, sources):
+    temp_path = Path(directory) / (SOURCES_FILE + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(sources, file, indent=2, sort_keys=True)
+    temp_path.replace(Path(directory) / SOURCES_FILE)
+
+
+def derived_hash(file_name, source_hash):
+    """
+    Inhalts-Hash einer abgeleiteten Datei (siehe `content_hash`), sofern sie aus den bereinigten Daten mit dem
+    Inhalts-Hash `source_hash` berechnet wurde (siehe `record_sources`). Wurden die bereinigten Daten seither neu
+    erstellt oder bearbeitet, ist die Datei veraltet, und das Ergebnis ist None wie bei einer fehlenden Datei.
+    Parameters:
+    - file_name (str): Pfad zur abgeleiteten Datei (mit oder ohne Endung).
+    - source_hash (str): Inhalts-Hash der aktuell verwendeten bereinigten Daten.
+    Returns:
+        str | None: Der Hash oder None, wenn die Datei fehlt oder nicht zu den Daten passt.
+    """
+    path = resolve_table_path(file_name)
+    if source_hash is None or not path.exists():
+        return None
+    if source_hash not in _read_sources(path.resolve().parent).get(path.name, []):
+        return None
+    return content_hash(path)
+
+
+def iter_chunks(file_name, chunksize=50000, columns=None):
+    """
+    Liest eine Eingabedatei blockweise, sodass nie mehr als `chunksize` Zeilen gleichzeitig im Speicher liegen.
+    CSV-Dateien werden über `pd.read_csv(chunksize=...)`, Parquet-Dateien über ihre Row Groups und
+    Excel-Dateien über den Read-only-Modus von openpyxl gelesen.
+    Parameters:
+    - file_name (str): Pfad zur Eingabedatei (.csv, .parquet oder .xlsx).
+    - chunksize (int): Maximale Anzahl an Zeilen pro Block.
+    - columns (list): Nur diese Spalten lesen (None = alle Spalten).
+    Yields:
+        pd.DataFrame: Der jeweils nächste Block an Zeilen.
+    """
+    path = Path(file_name)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+    elif suffix == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            batch = []
+            for row in rows:
+                # Wie bei pd.read_excel gilt 'N/A' als fehlender Wert
+                batch.append(tuple(None if value == NA_LABEL else value for value in row))
+                if len(batch) == chunksize:
+                    yield _select(pd.DataFrame(batch, columns=header), columns)
+                    batch = []
+            if batch:
+                yield _select(pd.DataFrame(batch, columns=header), columns)
+        finally:
+            workbook.close()
+
+
+def _select(df, columns):
+    return df if columns is None else df[columns]
+
+
+class ChunkWriter:
+    """
+    Schreibt bereinigte Blöcke nacheinander in eine Parquet-Datei, ohne den gesamten Datensatz im Speicher zu halten.
+    Die Blöcke werden zunächst mit einem einheitlichen, breiten Schema in eine temporäre Datei geschrieben (Zahlen als
+    float64, ganzzahlige Schlüsselspalten als Int64, alles andere als Text). Das Schema steht vor dem ersten Block fest
+    und folgt den Spaltenlisten in `schema.py`; nur unbekannte Spalten erhalten den Typ aus dem ersten Block. So kann
+    eine Spalte, die im ersten Block leer ist, in späteren Blöcken trotzdem Werte aufnehmen. Dabei werden Wertebereiche und Kategorien gesammelt; beim Schließen wird die Datei
+    Row Group für Row Group in das typisierte Schema von `schema.apply_schema` umgeschrieben (kleinste Ganzzahltypen,
+    Kategorien mit allen Werten als Arrow-Dictionary), sodass sie dieselben Typen wie im seriellen Ablauf hat.
+    """
+    def __init__(self, file_name):
+        self.save_path = Path(file_name).resolve()
+        self.temp_path = self.save_path.with_name(self.save_path.name + '.tmp')
+        self.writer = None
+        self.schema = None
+        self._ranges = {}       # ganzzahlige Schlüsselspalte -> [min, max, fehlende Werte, ganzzahlig]
+        self._categories = {}   # Kategoriespalte -> Menge der vorkommenden Werte
+        self._integers = {}     # übrige Zahlenspalte -> in allen Blöcken ganzzahlig ohne fehlende Werte
+
+    @staticmethod
+    def _normalize(chunk):
+        normalized = chunk.copy()
+        for col in normalized.columns:
+            if col in INTEGER_COLUMNS:
+                normalized[col] = pd.to_numeric(normalized[col], errors='coerce').astype('Int64')
+            elif col in NUMERIC_SHARK_COLUMNS or col in NUMERIC_PITCH_COLUMNS:
+                normalized[col] = pd.to_numeric(normalized[col], errors='coerce').astype('float64')
+            elif pd.api.types.is_numeric_dtype(normalized[col]) and not pd.api.types.is_bool_dtype(normalized[col]):
+                normalized[col] = normalized[col].astype('float64')
+            else:
+                # Text als Python-Strings (fehlende Werte bleiben fehlend); gelesen ergibt das den Standard-Texttyp
+                text = normalized[col]
+                normalized[col] = text.astype(object).where(text.isna(), text.astype(str))
+        return normalized
+
+    def _collect(self, chunk):
+        """Sammelt Wertebereiche und Kategorien eines Blocks für das endgültige Schema."""
+        for col in chunk.columns:
+            if col in INTEGER_COLUMNS:
+                values = pd.to_numeric(chunk[col], errors='coerce')
+                present = values.dropna()
+                low, high, has_na, integral = self._ranges.get(col, [None, None, False, True])
+                if len(present):
+                    low = present.min() if low is None else min(low, present.min())
+                    high = present.max() if high is None else max(high, present.max())
+                self._ranges[col] = [
+                    low, high, has_na or bool(values.isna().any()),
+                    integral and np.array_equal(present, present.round())
+                ]
+            elif col in CATEGORICAL_COLUMNS:
+                self._categories.setdefault(col, set()).update(chunk[col].dropna().astype(str).unique())
+            elif col in NUMERIC_PITCH_COLUMNS or (
+                col not in NUMERIC_SHARK_COLUMNS and pd.api.types.is_numeric_dtype(chunk[col])
+            ):
+                self._integers[col] = self._integers.get(col, True) and pd.api.types.is_integer_dtype(chunk[col])
+
+    def _final_dtypes(self):
+        dtypes = {}
+        for col, (low, high, has_na, integral) in self._ranges.items():
+            dtypes[col] = smallest_integer_dtype(low, high, has_na) if integral else 'float64'
+        for col, values in self._categories.items():
+            # Wie bei `astype('category')` sind die Kategorien sortiert; jede Row Group erhält dasselbe Dictionary
+            dtypes[col] = pd.CategoricalDtype(sorted(values))
+        for col, integer in self._integers.items():
+            if integer:
+                dtypes[col] = 'int64'
+        return dtypes
+
+    @staticmethod
+    def _temp_schema(normalized):
+        """
+        Das Schema der temporären Datei: Int64 für die ganzzahligen Schlüsselspalten, float64 für die Zahlenspalten
+        und Text für Kategorie- und Textspalten aus `schema.py`. Unbekannte Spalten erhalten den Typ aus dem ersten
+        Block, Text, wenn sie dort leer sind.
+        """
+        import pyarrow as pa
+        fields = []
+        for col in normalized.columns:
+            if col in INTEGER_COLUMNS:
+                arrow_type = pa.int64()
+            elif col in NUMERIC_SHARK_COLUMNS or col in NUMERIC_PITCH_COLUMNS:
+                arrow_type = pa.float64()
+            elif col in CATEGORICAL_COLUMNS or col in TEXT_COLUMNS:
+                arrow_type = pa.string()
+            else:
+                arrow_type = pa.Array.from_pandas(normalized[col]).type
+                if pa.types.is_null(arrow_type):
+                    arrow_type = pa.string()
+            fields.append(pa.field(str(col), arrow_type))
+        return pa.schema(fields)
+
+    def write(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._collect(chunk)
+        normalized = self._normalize(chunk)
+        if self.writer is None:
+            self.schema = self._temp_schema(normalized)
+            self.writer = pq.ParquetWriter(self.temp_path, self.schema)
+        self.writer.write_table(pa.Table.from_pandas(normalized, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        if self.writer is None:
+            return self.save_path
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.writer.close()
+        dtypes = self._final_dtypes()
+        source = pq.ParquetFile(self.temp_path)
+        writer = None
+        try:
+            for row_group in range(source.num_row_groups):
+                part = source.read_row_group(row_group).to_pandas()
+                part = part.astype({col: dtype for col, dtype in dtypes.items() if col in part.columns})
+                if writer is None:
+                    # Textspalten, die in der ersten Row Group leer sind, behalten den Texttyp der temporären Datei
+                    schema = pa.Schema.from_pandas(part, preserve_index=False)
+                    for index, field in enumerate(schema):
+                        if pa.types.is_null(field.type):
+                            schema = schema.set(index, self.schema.field(field.name))
+                    writer = pq.ParquetWriter(self.save_path, schema)
+                writer.write_table(pa.Table.from_pandas(part, schema=writer.schema, preserve_index=False))
+        finally:
+            if writer is not None:
+                writer.close()
+            source.close()
+            self.temp_path.unlink()
+        return self.save_path
@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Spalten, nach denen im Dashboard gefiltert wird
+FILTER_COLUMNS = ['Staffelnummer', 'Branche', 'Pitcher Geschlecht', 'Deal erhalten']
+
+
+class FilterIndex:
+    """
+    Bitmap-Index für die Filter des Dashboards.
+    Für jeden Wert der Filterspalten wird einmalig eine gepackte Bitmap der zugehörigen Zeilen erstellt
+    (ein Bit pro Zeile). Eine Auswahl wird beantwortet, indem die Bitmaps der gewählten Werte je Spalte
+    verodert und die Spalten anschließend verundet werden. Ergebnisse werden pro Auswahl zwischengespeichert.
+    """
+    def __init__(self, data, columns=FILTER_COLUMNS, max_cached=128):
+        """
+        Parameters:
+        - data (pd.DataFrame): Das Datenset, für das der Index erstellt wird.
+        - columns (list): Die Filterspalten.
+        - max_cached (int): Maximale Anzahl zwischengespeicherter Auswahlen.
+        """
+        self.row_count = len(data)
+        self.columns = list(columns)
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.bitmaps = {}
+        for col in self.columns:
+            codes, uniques = pd.factorize(data[col], use_na_sentinel=True)
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(uniques)
+            }
+        self._all_rows = np.packbits(np.ones(self.row_count, dtype=bool))
+
+    def _column_bitmap(self, col, selected):
+        """
+        Verodert die Bitmaps der gewählten Werte einer Spalte. Fehlende Werte haben keine Bitmap
+        und werden daher wie bei `isin` nie ausgewählt.
+        """
+        bitmaps = self.bitmaps[col]
+        result = np.zeros_like(self._all_rows)
+        for value in selected:
+            bitmap = bitmaps.get(value)
+            if bitmap is not None:
+                result |= bitmap
+        return result
+
+    def select(self, selections):
+        """
+        Liefert die Zeilenpositionen, die allen Auswahlen entsprechen.
+        Parameters:
+        - selections (dict): Pro Filterspalte die gewählten Werte, z. B. `{'Staffelnummer': [1, 2]}`.
+          Nicht angegebene Spalten werden nicht gefiltert.
+        Returns:
+            np.ndarray: Die Positionen der passenden Zeilen (für `DataFrame.iloc`).
+        """
+        key = tuple(
+            (col, frozenset(selections[col])) for col in self.columns if col in selections
+        )
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        mask = self._all_rows.copy()
+        for col, selected in key:
+            mask &= self._column_bitmap(col, selected)
+        positions = np.flatnonzero(np.unpackbits(mask, count=self.row_count))
+
+        with self._lock:
+            self._cache[key] = positions
+            if len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return positions
+
+    def filter(self, data, selections):
+        """
+        Wendet die Auswahl auf das Datenset an, für das der Index erstellt wurde.
+        """
+        return data.iloc[self.select(selections)]
@@ -0,0 +1,152 @@
+import cProfile
+import functools
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # nicht unter Windows verfügbar
+    resource = None
+
+
+def _peak_rss_mb():
+    """Bisheriger Spitzenwert des Arbeitsspeichers (RSS) des Prozesses in MB, falls ermittelbar."""
+    if resource is None:
+        return None
+    # ru_maxrss ist unter macOS in Bytes angegeben, unter Linux in KB
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor
+
+
+class LogSink:
+    """Schreibt jede Messung als strukturierte Logzeile (key=value)."""
+    def __init__(self, logger_name='sharktank.pipeline'):
+        self.logger = logging.getLogger(logger_name)
+
+    def emit(self, record):
+        self.logger.info(' '.join(f'{key}={value}' for key, value in record.items()))
+
+    def close(self):
+        pass
+
+
+class JsonReportSink:
+    """Sammelt alle Messungen eines Laufs und schreibt sie beim Schließen als JSON-Bericht."""
+    def __init__(self, file_name):
+        self.save_path = Path(file_name).resolve()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def close(self):
+        self.save_path.write_text(json.dumps({'stages': self.records}, indent=2))
+
+
+class MemorySink:
+    """Hält die Messungen im Speicher, z. B. für das Debug-Panel im Dashboard."""
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+class Instrumentation:
+    """
+    Misst Verarbeitungsschritte: Wall- und CPU-Zeit, Spitzen-RSS, tracemalloc-Spitze sowie Zeilen vor und nach
+    dem Schritt. Jede Messung wird an alle Sinks weitergegeben. Optional wird pro Schritt ein cProfile-Dump
+    geschrieben.
+    """
+    def __init__(self, sinks=None, track_memory=False, profile_dir=None):
+        """
+        Parameters:
+        - sinks (list): Empfänger der Messungen (z. B. LogSink, JsonReportSink, MemorySink).
+        - track_memory (bool): Wenn True, wird die Speicherspitze je Schritt über tracemalloc gemessen (langsamer).
+        - profile_dir (str): Optionaler Ordner für cProfile-Dumps (`<nr>_<schritt>.prof`).
+        """
+        self.sinks = list(sinks) if sinks is not None else [LogSink()]
+        self.track_memory = track_memory
+        self.profile_dir = Path(profile_dir).resolve() if profile_dir is not None else None
+        self._depth = 0
+        self._profile_count = 0
+
+    @property
+    def records(self):
+        """Die Messungen des ersten Sinks, der sie im Speicher hält."""
+        for sink in self.sinks:
+            if hasattr(sink, 'records'):
+                return sink.records
+        return []
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Misst den eingeschlossenen Block. Über das zurückgegebene Dictionary kann `rows_out` gesetzt werden.
+        """
+        record = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+        # Speicher und Profil nur für äußere Schritte, damit verschachtelte Schritte die Messung nicht zurücksetzen
+        track_memory = self.track_memory and self._depth == 0
+        start_tracemalloc = track_memory and not tracemalloc.is_tracing()
+        if start_tracemalloc:
+            tracemalloc.start()
+        if track_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        profiler = cProfile.Profile() if self.profile_dir is not None and self._depth == 0 else None
+        rss_before = _peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._depth += 1
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self._depth -= 1
+            record['wall_s'] = round(time.perf_counter() - wall, 6)
+            record['cpu_s'] = round(time.process_time() - cpu, 6)
+            rss_after = _peak_rss_mb()
+            record['peak_rss_mb'] = None if rss_after is None else round(rss_after, 1)
+            record['peak_rss_delta_mb'] = None if rss_after is None else round(rss_after - rss_before, 1)
+            if track_memory:
+                record['tracemalloc_peak_delta_mb'] = round((tracemalloc.get_traced_memory()[1] - traced_before) / 1e6, 3)
+                if start_tracemalloc:
+                    tracemalloc.stop()
+            if profiler is not None:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                self._profile_count += 1
+                profiler.dump_stats(self.profile_dir / f'{self._profile_count:03d}_{name}.prof')
+            for sink in self.sinks:
+                sink.emit(record)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def instrumented(method):
+    """
+    Dekorator für Methoden von SharkTankProcessor: misst den Aufruf über `self.instrumentation`,
+    sofern gesetzt, und zählt die Zeilen von `self.sharktank` vor und nach dem Schritt.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = getattr(self, 'instrumentation', None)
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        rows_in = len(self.sharktank) if self.sharktank is not None else None
+        with instrumentation.stage(method.__name__, rows_in=rows_in) as record:
+            result = method(self, *args, **kwargs)
+            record['rows_out'] = len(self.sharktank) if self.sharktank is not None else None
+        return result
+    return wrapper
@@ -1,33 +1,70 @@
+import argparse
+import glob
+import hashlib
+import logging
+import os
 import pandas as pd
 import numpy as np
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
 from pathlib import Path
 
+from aggregates import SHARKS, build_aggregate_cube, combine_cubes
+from coalitions import (
+    CELL_KEYS as COALITION_CELL_KEYS, HISTOGRAM_COLUMNS, coalition_cells, coalition_histogram, coalition_table
+)
+from datastore import ChunkWriter, iter_chunks, record_hashes, record_sources, write_table
+from instrumentation import Instrumentation, JsonReportSink, LogSink, instrumented
+from schema import NUMERIC_SHARK_COLUMNS, apply_schema
+from shark_analytics import (
+    CELL_KEYS as SHARK_CELL_KEYS, INPUT_COLUMNS as ANALYTICS_COLUMNS, analytics_from_investments, investment_table,
+    shark_analytics, shark_cells
+)
+from startup_index import INPUT_COLUMNS as STARTUP_COLUMNS, build_startup_index, combine_startup_indexes
+from validation import validate
+
 # Klasse zur Verarbeitung der Shark Tank-Daten
 class SharkTankProcessor:
-    def __init__(self, file_path):
+    def __init__(self, file_path, instrumentation=None):
         """
         Initialisiert die Klasse mit dem angegebenen Datei-Pfad.
         Parameters:
-        - file_path (str): Der Pfad zur Excel-Datei mit den Shark Tank-Daten.
+        - file_path (str): Der Pfad zur Excel-Datei mit den Shark Tank-Daten (None, wenn die Daten direkt gesetzt werden).
+        - instrumentation (Instrumentation): Optional; misst Laufzeit, Speicher und Zeilen jedes Verarbeitungsschritts.
         """
-        self.file_path = Path(file_path).resolve()
+        self.file_path = Path(file_path).resolve() if file_path is not None else None
         self.sharktank = None
+        self.instrumentation = instrumentation
+        self.aggregate_cube = None
+        self.shark_cells = None
+        self.coalition_cells = None
+        self.coalitions = None
+        self.shark_analytics = None
+        self.validation = None
+        self.startup_index = None
 
+    @instrumented
     def load_data(self):
         """
-        Lädt das Shark Tank-Datenset aus der angegebenen Excel-Datei.
+        Lädt das Shark Tank-Datenset aus der angegebenen Excel-Datei (bzw. CSV- oder Parquet-Datei).
         Wenn die Datei existiert, wird sie als DataFrame geladen. Falls die Datei
         nicht gefunden wird, wird ein Fehler angezeigt.
         """
         if self.file_path.exists():
-            self.sharktank = pd.read_excel(self.file_path)
+            suffix = self.file_path.suffix.lower()
+            if suffix == '.csv':
+                self.sharktank = pd.read_csv(self.file_path)
+            elif suffix == '.parquet':
+                self.sharktank = pd.read_parquet(self.file_path)
+            else:
+                self.sharktank = pd.read_excel(self.file_path)
             print("Data loaded successfully.")
         else:
             print(f"File not found: {self.file_path}")
             print(f"Current working directory: {Path().cwd()}")
 
     # Datenbereinigung und Spaltenumbenennung
+    @instrumented
     def clean_data(self, columns_to_drop, rename_columns):
         """
         Bereinigt die Daten, indem irrelevante Spalten entfernt und umbenannt werden.
@@ -36,32 +73,38 @@ class SharkTankProcessor:
         - rename_columns (dict): Wörterbuch, das Spaltennamen umbenennt.
         """
         if self.sharktank is not None:
+            # Fehlende Spalten werden gemeldet statt übergangen; die Prüfung selbst übernimmt `validate_data`
+            not_found = [col for col in columns_to_drop if col not in self.sharktank.columns]
+            if not_found:
+                print(f"Columns to drop not found: {', '.join(not_found)}")
             self.sharktank = self.sharktank.drop(columns=columns_to_drop, errors='ignore')
             self.sharktank = self.sharktank.rename(columns=rename_columns)
-            self.sharktank['Pitcher Bundesstaat'] = self.sharktank['Pitcher Bundesstaat'].fillna('Unbekannt')
-            self.sharktank['Pitcher Geschlecht'] = self.sharktank['Pitcher Geschlecht'].fillna('Unbekannt')
+            for col in ['Pitcher Bundesstaat', 'Pitcher Geschlecht']:
+                if col in self.sharktank.columns:
+                    self.sharktank[col] = self.sharktank[col].fillna('Unbekannt')
+                else:
+                    print(f"Column not found: {col}")
             print("Data cleaned and columns renamed successfully.")
 
-    # Ersetze leere Werte mit 'N/A'
+    # Ersetze leere Werte durch fehlende Werte und wende das typisierte Schema an
+    @instrumented
     def replace_empty_with_na(self):
         """
-        Ersetzt leere Werte in bestimmten Spalten mit 'N/A'.
+        Ersetzt leere Werte ('', None, 'N/A') in den Investitions- und Beteiligungsspalten durch NaN,
+        sodass die Spalten numerisch bleiben. Anschließend wird das typisierte Schema angewendet
+        (Kategorien, verkleinerte Ganzzahlen; siehe `schema.apply_schema`).
+        'N/A' wird erst bei der Anzeige bzw. beim Excel-Export eingesetzt.
         """
-        specific_columns = [
-            'Barbara Corcoran Investitionssumme', 'Barbara Corcoran Kapitalbeteiligung',
-            'Mark Cuban Investitionssumme', 'Mark Cuban Kapitalbeteiligung',
-            'Lori Greiner Investitionssumme', 'Lori Greiner Kapitalbeteiligung',
-            'Robert Herjavec Investitionssumme', 'Robert Herjavec Kapitalbeteiligung',
-            'Daymond John Investitionssumme', 'Daymond John Kapitalbeteiligung',
-            'Kevin O Leary Investitionssumme', 'Kevin O Leary Kapitalbeteiligung',
-            'Gast Investitionssumme', 'Gast Kapitalbeteiligung'
-        ]
-        for col in specific_columns:
-            if col in self.sharktank.columns:
-                self.sharktank[col] = self.sharktank[col].replace([np.nan, '', None], 'N/A')
-        print("Replaced empty values with 'N/A' in specific columns.")
+        for col in NUMERIC_SHARK_COLUMNS:
+            if col in self.sharktank.columns and not pd.api.types.is_float_dtype(self.sharktank[col]):
+                self.sharktank[col] = pd.to_numeric(
+                    self.sharktank[col].replace(['', 'N/A'], np.nan), errors='coerce'
+                )
+        self.sharktank = apply_schema(self.sharktank)
+        print("Replaced empty values with NA and applied typed schema.")
 
     # Investitionen und Beteiligungen der Sharks
+    @instrumented
     def summarize_shark_data(self):
         """
         Diese Methode berechnet die Gesamtsummen der Investitionen und Beteiligungen für die Sharks und Gäste.
@@ -70,48 +113,148 @@ class SharkTankProcessor:
         Returns:
             dict: Ein Dictionary, das für jede Shark und die Gäste die Total Investment (USD) und Total Equity (%) enthält.
         """
-        sharks = [
-            'Barbara Corcoran', 'Mark Cuban', 'Lori Greiner', 'Robert Herjavec',
-            'Daymond John', 'Kevin O Leary'
-        ]
-        investment_cols = [f'{shark} Investitionssumme' for shark in sharks]
-        equity_cols = [f'{shark} Kapitalbeteiligung' for shark in sharks]
+        self._coerce_shark_columns()
+        return self._totals_from_partials(self.compute_season_partials())
 
+    def _coerce_shark_columns(self):
+        """
+        Wandelt die Investitions- und Beteiligungsspalten wieder in numerische Werte um ('N/A' wird zu NaN).
+        """
+        investment_cols = [f'{shark} Investitionssumme' for shark in SHARKS]
+        equity_cols = [f'{shark} Kapitalbeteiligung' for shark in SHARKS]
         for col in investment_cols + equity_cols + ['Gast Investitionssumme', 'Gast Kapitalbeteiligung']:
-            if col in self.sharktank.columns:
+            if col in self.sharktank.columns and not pd.api.types.is_numeric_dtype(self.sharktank[col]):
                 self.sharktank[col] = pd.to_numeric(
                     self.sharktank[col].replace('N/A', np.nan), errors='coerce'
                 )
-        # Gesamtsummen der Investitionen und Beteiligungen für jede Shark
+
+    def compute_season_partials(self, data=None):
+        """
+        Berechnet Teilsummen pro Staffel: Investitionen und Beteiligungen je Shark und Gast,
+        die Anzahl der gemeinsamen Investitionen je Shark-Paar sowie das Besetzungs-Histogramm der Deals
+        (siehe `coalitions.coalition_histogram`). Die Teilsummen verschiedener Staffeln
+        sind unabhängig voneinander und können daher einzeln neu berechnet und wieder zusammengeführt werden.
+        Parameters:
+        - data (pd.DataFrame): Optionaler Datenrahmen, standardmäßig `self.sharktank`.
+        Returns:
+            pd.DataFrame: Eine Zeile pro Staffelnummer mit den Summen- und Paarspalten.
+        """
+        data = self.sharktank if data is None else data
+        value_cols = (
+            [f'{shark} Investitionssumme' for shark in SHARKS]
+            + [f'{shark} Kapitalbeteiligung' for shark in SHARKS]
+            + ['Gast Investitionssumme', 'Gast Kapitalbeteiligung']
+        )
+        seasons = data['Staffelnummer']
+        value_partials = data[value_cols].groupby(seasons, dropna=False).sum()
+
+        participation = data[[f'{shark} Investitionssumme' for shark in SHARKS]].notna().to_numpy(dtype=np.int64)
+        idx_a, idx_b = np.triu_indices(len(SHARKS), k=1)
+        pair_flags = pd.DataFrame(
+            participation[:, idx_a] * participation[:, idx_b],
+            columns=[f'{SHARKS[a]} & {SHARKS[b]}' for a, b in zip(idx_a, idx_b)],
+            index=data.index
+        )
+        pair_partials = pair_flags.groupby(seasons, dropna=False).sum()
+        coalition_partials = coalition_histogram(data, by=seasons)
+        return pd.concat([value_partials, pair_partials, coalition_partials], axis=1).sort_index()
+
+    @staticmethod
+    def _totals_from_partials(partials):
+        """
+        Führt die Teilsummen pro Staffel zu den Gesamtsummen je Shark und Gast zusammen.
+        """
+        totals = partials.sum()
         shark_totals = {
             shark: {
-                'Total Investment (USD)': self.sharktank[invest_col].sum(skipna=True),
-                'Total Equity (%)': self.sharktank[equity_col].sum(skipna=True)
+                'Total Investment (USD)': totals[f'{shark} Investitionssumme'],
+                'Total Equity (%)': totals[f'{shark} Kapitalbeteiligung']
             }
-            for shark, invest_col, equity_col in zip(sharks, investment_cols, equity_cols)
+            for shark in SHARKS
         }
         # Summen für die Gäste
         shark_totals['Guests'] = {
-            'Total Investment (USD)': self.sharktank['Gast Investitionssumme'].sum(skipna=True),
-            'Total Equity (%)': self.sharktank['Gast Kapitalbeteiligung'].sum(skipna=True)
+            'Total Investment (USD)': totals['Gast Investitionssumme'],
+            'Total Equity (%)': totals['Gast Kapitalbeteiligung']
         }
-
         return shark_totals
 
+    @staticmethod
+    def _pairs_from_partials(partials):
+        """
+        Erstellt aus den Paarspalten der Teilsummen die Zusammenarbeitsmatrix (Shark A, Shark B, Count).
+        """
+        counts = np.zeros((len(SHARKS), len(SHARKS)), dtype=np.int64)
+        idx_a, idx_b = np.triu_indices(len(SHARKS), k=1)
+        pair_cols = [f'{SHARKS[a]} & {SHARKS[b]}' for a, b in zip(idx_a, idx_b)]
+        counts[idx_a, idx_b] = partials[pair_cols].sum().to_numpy(dtype=np.int64)
+        return SharkTankProcessor._square_to_pairs(counts, SHARKS)
+
+    @staticmethod
+    def _coalitions_from_partials(partials):
+        """
+        Erstellt aus den Besetzungs-Histogrammen der Teilsummen die Koalitionsübersicht (siehe `generate_coalitions`).
+        """
+        return coalition_table(partials[HISTOGRAM_COLUMNS])
+
     #Erstellung der Zusammenarbeitsmatrix der Sharks
-    def generate_cooperation_matrix(self):
+    @instrumented
+    def generate_cooperation_matrix(self, method='vectorized', square=False):
         """
         Diese Methode berechnet die Zusammenarbeit zwischen den Sharks basierend auf den getätigten Investitionen.
-        Die Methode iteriert durch jede Zeile des Datenrahmens, ruft eine Hilfsfunktion auf, die die Kombinationen der Sharks in den Investitionen berechnet,
-        und speichert diese in einer Liste. Anschließend wird eine Zusammenarbeitsmatrix erstellt, die die Häufigkeiten der gemeinsamen Investitionen zeigt.
+        Standardmäßig wird aus den Spalten `<Shark> Investitionssumme` eine boolesche Teilnahmematrix P gebildet
+        (Zeile = Pitch, Spalte = Shark). Das Matrixprodukt Pᵀ·P liefert in einem Schritt für jedes Shark-Paar
+        die Anzahl der gemeinsamen Investitionen. Die ursprüngliche zeilenweise Berechnung ist über
+        `method='iterrows'` weiterhin verfügbar.
+        Parameters:
+        - method (str): 'vectorized' (Matrixprodukt) oder 'iterrows' (zeilenweise Kombinationen).
+        - square (bool): Wenn True, wird die vollständige quadratische Shark × Shark-Matrix zurückgegeben.
         Returns:
             pd.DataFrame: Eine DataFrame-Tabelle, die die Kooperationen zwischen den Sharks und die Anzahl der gemeinsamen Investitionen darstellt.
         """
+        sharks = SHARKS
+        if method == 'iterrows':
+            cooperation_matrix = self._cooperation_pairs_iterrows(sharks)
+            if square:
+                return self._pairs_to_square(cooperation_matrix, sharks)
+            return cooperation_matrix
+        if method != 'vectorized':
+            raise ValueError(f"Unbekannte Methode: {method}")
+
+        # Teilnahmematrix P (Pitches × Sharks) und Paarzählung über Pᵀ·P
+        investment_cols = [f'{shark} Investitionssumme' for shark in sharks]
+        participation = self.sharktank[investment_cols].notna().to_numpy(dtype=np.int64)
+        counts = participation.T @ participation
+
+        if square:
+            # Diagonale enthält die Anzahl der Investitionen je Shark, nicht Kooperationen
+            np.fill_diagonal(counts, 0)
+            return pd.DataFrame(counts, index=sharks, columns=sharks)
+
+        return self._square_to_pairs(counts, sharks)
+
+    @staticmethod
+    def _square_to_pairs(counts, sharks):
+        """
+        Wandelt das obere Dreieck einer Shark × Shark-Zählmatrix in die Paarliste (Shark A, Shark B, Count) um.
+        """
+        # Oberes Dreieck in der Reihenfolge von combinations(sharks, 2)
+        idx_a, idx_b = np.triu_indices(len(sharks), k=1)
+        pair_counts = counts[idx_a, idx_b]
+        cooperation_matrix = pd.DataFrame({
+            'Shark A': np.asarray(sharks)[idx_a],
+            'Shark B': np.asarray(sharks)[idx_b],
+            'Count': pair_counts
+        })
+        cooperation_matrix = cooperation_matrix[cooperation_matrix['Count'] > 0]
+        cooperation_matrix = cooperation_matrix.sort_values('Count', ascending=False, kind='stable')
+        return cooperation_matrix.reset_index(drop=True)
+
+    def _cooperation_pairs_iterrows(self, sharks):
+        """
+        Zeilenweise Berechnung der Kooperationen über `itertools.combinations` (ursprüngliche Implementierung).
+        """
         def calculate_cooperations(row):
-            sharks = [
-                'Barbara Corcoran', 'Mark Cuban', 'Lori Greiner', 'Robert Herjavec',
-                'Daymond John', 'Kevin O Leary'
-            ]
             participants = [shark for shark in sharks if pd.notnull(row[f'{shark} Investitionssumme'])]
             return list(combinations(participants, 2))
 
@@ -124,21 +267,413 @@ class SharkTankProcessor:
         cooperation_matrix.columns = ['Shark A', 'Shark B', 'Count']
         return cooperation_matrix
 
+    @staticmethod
+    def _pairs_to_square(cooperation_matrix, sharks):
+        """
+        Wandelt die Paarliste (Shark A, Shark B, Count) in eine symmetrische Shark × Shark-Matrix um.
+        """
+        square = cooperation_matrix.pivot_table(
+            index='Shark A', columns='Shark B', values='Count', aggfunc='sum', fill_value=0
+        ).reindex(index=sharks, columns=sharks, fill_value=0)
+        return square + square.T
+
+    # Kennzahlen je Shark und Staffel
+    @instrumented
+    def analyze_sharks(self, chunks=None):
+        """
+        Berechnet die Kennzahlen je Shark (inkl. Gast) pro Staffel und gesamt: Anzahl der Deals, Summe, Durchschnitt
+        und Median der Investitionen, Kapitalbeteiligungen, implizite Bewertungen und Anteil der Co-Investments
+        (siehe `shark_analytics.shark_analytics`). Anders als `summarize_shark_data` liefert die Methode einen
+        typisierten DataFrame, der gespeichert und vom Dashboard direkt gelesen wird.
+        Parameters:
+        - chunks (iterable): Blöcke des bereinigten Datensatzes (z. B. aus `datastore.iter_chunks`) statt
+          `self.sharktank`. Von jedem Block werden nur die Einzelinvestitionen behalten
+          (siehe `shark_analytics.investment_table`).
+        Returns:
+            pd.DataFrame: Eine Zeile pro Shark und Staffel sowie eine Gesamtzeile pro Shark (Staffelnummer fehlt).
+        """
+        if chunks is not None:
+            self.shark_analytics = analytics_from_investments(*(investment_table(chunk) for chunk in chunks))
+            return self.shark_analytics
+        self._coerce_shark_columns()
+        self.shark_analytics = shark_analytics(self.sharktank)
+        return self.shark_analytics
+
+    # Prüfung der Datenqualität
+    @instrumented
+    def validate_data(self, sample=None, random_state=None):
+        """
+        Prüft die bereinigten Daten auf Konsistenz: Pflichtspalten und -werte, doppelte Pitches, Deal-Kennzeichen und
+        erhaltener Betrag, Summen der Investitionen und Beteiligungen je Shark gegenüber Betrag und Anteilen, Anzahl der
+        Sharks, Wertebereiche sowie die geforderte Bewertung (siehe `validation.RULES`). Alle Regeln laufen als
+        Spaltenoperationen in einem Durchlauf; mit `sample` wird nur eine Stichprobe geprüft.
+        Parameters:
+        - sample (int | float): Optionale Stichprobe: Anzahl der Zeilen oder Anteil zwischen 0 und 1.
+        - random_state (int): Startwert der Stichprobe.
+        Returns:
+            pd.DataFrame: Eine Zeile pro Verletzung (Regel, Zeile, Spalte); die Zeile ist der Index in `self.sharktank`.
+        """
+        self.validation = validate(self.sharktank, sample=sample, random_state=random_state)
+        self._report_validation()
+        return self.validation
+
+    def _report_validation(self):
+        """
+        Gibt die Anzahl der Verletzungen je Regel aus.
+        """
+        counts = self.validation['Regel'].value_counts(sort=False)
+        print(f"Validation: {len(self.validation)} violations.")
+        for rule, count in counts[counts > 0].items():
+            print(f"  {rule}: {count}")
+
+    # Koalitionen aus mehreren Sharks
+    @instrumented
+    def generate_coalitions(self, min_size=2):
+        """
+        Ermittelt, wie oft Koalitionen aus zwei bis sieben Beteiligten (sechs Sharks und Gast) gemeinsam investiert haben,
+        samt durchschnittlichem Betrag und Anteil dieser Deals. Jeder Deal wird als Bitmaske seiner Besetzung kodiert;
+        ein Histogramm über alle 2^7 Masken und eine Zeta-Transformation über die Obermengen liefern die Anzahlen
+        aller Koalitionen, ohne pro Zeile Kombinationen aufzuzählen.
+        Parameters:
+        - min_size (int): Mindestanzahl an Mitgliedern einer Koalition.
+        Returns:
+            pd.DataFrame: Eine Zeile pro Koalition (Koalition, Größe, Gemeinsame Deals, Deals in genau dieser Besetzung,
+            Ø Erhaltener Betrag (USD), Ø Erhaltene Anteile (%)).
+        """
+        self._coerce_shark_columns()
+        self.coalitions = coalition_table(coalition_histogram(self.sharktank), min_size=min_size)
+        return self.coalitions
+
+    # Vorberechneter Aggregat-Würfel für das Dashboard
+    @instrumented
+    def build_aggregate_cube(self):
+        """
+        Erstellt den Aggregat-Würfel über Staffel × Branche × Geschlecht × Deal mit Anzahl der Pitches,
+        geforderten und erhaltenen Beträgen sowie den Investitionssummen je Shark.
+        Das Dashboard beantwortet die Fragen 1–4 direkt aus diesem Würfel.
+        Returns:
+            pd.DataFrame: Der Aggregat-Würfel.
+        """
+        self.aggregate_cube = build_aggregate_cube(self.sharktank)
+        return self.aggregate_cube
+
+    # Zellentabellen zum Würfel für die Fragen 6–8 des Dashboards
+    @instrumented
+    def build_cell_tables(self):
+        """
+        Erstellt pro Zelle des Aggregat-Würfels die additiven Summen je Shark (siehe `shark_analytics.shark_cells`)
+        und das Besetzungs-Histogramm der Deals (siehe `coalitions.coalition_cells`). Das Dashboard beantwortet
+        die Fragen 6–8 für jede Filterauswahl durch Summieren der ausgewählten Zellen.
+        Returns:
+            tuple: (shark_cells, coalition_cells)
+        """
+        self.shark_cells = shark_cells(self.sharktank)
+        self.coalition_cells = coalition_cells(self.sharktank)
+        return self.shark_cells, self.coalition_cells
+
+    # Suchindex über die Startup-Namen für die Detailansicht
+    @instrumented
+    def build_startup_index(self, chunks=None):
+        """
+        Erstellt den Index vom normalisierten Startup-Namen auf die Zeilenpositionen im bereinigten Datensatz
+        (siehe `startup_index.build_startup_index`). Das Dashboard lädt ihn einmalig und findet damit die Zeilen
+        eines Startups, ohne den Datensatz zu durchsuchen.
+        Parameters:
+        - chunks (iterable): Blöcke des bereinigten Datensatzes in Dateireihenfolge (z. B. aus
+          `datastore.iter_chunks`) statt `self.sharktank`.
+        Returns:
+            pd.DataFrame: Die Index-Tabelle (Schlüssel, Name des Startups, Zeile).
+        """
+        if chunks is not None:
+            tables, offset = [], 0
+            for chunk in chunks:
+                tables.append(build_startup_index(chunk, offset=offset))
+                offset += len(chunk)
+            self.startup_index = combine_startup_indexes(*tables)
+            return self.startup_index
+        self.startup_index = build_startup_index(self.sharktank)
+        return self.startup_index
+
+    # Inkrementelle Verarbeitung neuer Staffeln/Pitches
+    @instrumented
+    def run_incremental(self, columns_to_drop, rename_columns, state_dir='pipeline_state'):
+        """
+        Verarbeitet nur neue oder geänderte Zeilen der Eingabedatei und führt sie mit dem gespeicherten Stand zusammen.
+        Jede Rohzeile erhält einen Schlüssel aus Staffelnummer und Name des Startups sowie einen Hash über ihren Inhalt.
+        Nur Zeilen, deren Schlüssel/Hash im gespeicherten Stand fehlt, werden bereinigt. Die Teilsummen pro Staffel
+        (siehe `compute_season_partials`) werden nur für betroffene Staffeln neu berechnet; alle anderen werden
+        aus dem Stand übernommen. Das Ergebnis entspricht damit exakt einem vollständigen Neuaufbau.
+        Ändern sich die Spalten der Eingabe oder die Bereinigungsregeln, wird automatisch vollständig neu aufgebaut.
+        Parameters:
+        - columns_to_drop (list): Liste der Spalten, die entfernt werden sollen.
+        - rename_columns (dict): Wörterbuch, das Spaltennamen umbenennt.
+        - state_dir (str): Verzeichnis, in dem der Verarbeitungsstand gespeichert wird.
+        Returns:
+            tuple: (shark_totals, cooperation_matrix) wie bei `summarize_shark_data` und `generate_cooperation_matrix`.
+        """
+        self.load_data()
+        if self.sharktank is None:
+            return None
+        raw = self.sharktank
+        state_dir = Path(state_dir).resolve()
+
+        original_names = {new: old for old, new in rename_columns.items()}
+        fingerprints = self._fingerprint_rows(
+            raw,
+            original_names.get('Staffelnummer', 'Staffelnummer'),
+            original_names.get('Name des Startups', 'Name des Startups')
+        )
+        config_hash = hashlib.sha256(
+            repr((list(raw.columns), list(columns_to_drop), sorted(rename_columns.items()), HISTOGRAM_COLUMNS)).encode()
+        ).hexdigest()
+
+        state = self._load_state(state_dir, config_hash)
+        if state is None:
+            unchanged = pd.Series(False, index=raw.index)
+            cached = None
+            old_fingerprints = pd.DataFrame(columns=['key', 'row_hash', 'Staffelnummer'])
+            old_partials = None
+        else:
+            old_fingerprints = state['fingerprints']
+            known = pd.MultiIndex.from_frame(old_fingerprints[['key', 'row_hash']])
+            unchanged = pd.Series(
+                pd.MultiIndex.from_frame(fingerprints[['key', 'row_hash']]).isin(known), index=raw.index
+            )
+            cached = state['cleaned']
+            old_partials = state['partials']
+
+        # Nur neue oder geänderte Zeilen bereinigen
+        self.sharktank = raw[~unchanged]
+        self.clean_data(columns_to_drop, rename_columns)
+        self.replace_empty_with_na()
+        self._coerce_shark_columns()
+        fresh = self.sharktank.set_axis(fingerprints.loc[~unchanged, 'key'].to_numpy())
+
+        if cached is not None:
+            kept_keys = fingerprints.loc[unchanged, 'key']
+            merged = pd.concat([cached.loc[kept_keys.to_numpy()], fresh])
+        else:
+            merged = fresh
+        merged = merged.reindex(fingerprints['key'].to_numpy())
+
+        # Betroffene Staffeln: neue/geänderte Zeilen sowie entfernte oder geänderte alte Zeilen
+        gone = ~old_fingerprints['key'].isin(fingerprints.loc[unchanged, 'key'])
+        affected = set(fresh['Staffelnummer']) | set(old_fingerprints.loc[gone, 'Staffelnummer'])
+
+        recomputed = self.compute_season_partials(merged[merged['Staffelnummer'].isin(affected)])
+        if old_partials is not None:
+            old_partials = old_partials[~old_partials.index.isin(affected)]
+            partials = pd.concat([old_partials, recomputed]).sort_index()
+        else:
+            partials = recomputed
+
+        fingerprints['Staffelnummer'] = merged['Staffelnummer'].to_numpy()
+        self._save_state(state_dir, config_hash, fingerprints, merged, partials)
+        self.sharktank = apply_schema(merged.reset_index(drop=True))
+        self.coalitions = self._coalitions_from_partials(partials)
+        print(f"Incremental run: {int((~unchanged).sum())} new or changed rows, {int(gone.sum())} replaced or removed rows.")
+        return self._totals_from_partials(partials), self._pairs_from_partials(partials)
+
+    @staticmethod
+    def _fingerprint_rows(raw, season_col, name_col):
+        """
+        Erstellt pro Rohzeile einen Schlüssel (Staffelnummer|Name des Startups|laufende Nummer) und einen Inhalts-Hash.
+        """
+        key = raw[season_col].astype(str) + '|' + raw[name_col].astype(str)
+        key = key + '|' + key.groupby(key).cumcount().astype(str)
+        return pd.DataFrame({
+            'key': key,
+            'row_hash': pd.util.hash_pandas_object(raw, index=False)
+        }, index=raw.index)
+
+    @staticmethod
+    def _load_state(state_dir, config_hash):
+        """
+        Lädt den gespeicherten Verarbeitungsstand. Gibt None zurück, wenn keiner existiert oder die Konfiguration abweicht.
+        """
+        config_file = state_dir / 'config.txt'
+        if not config_file.exists() or config_file.read_text().strip() != config_hash:
+            return None
+        return {
+            'fingerprints': pd.read_parquet(state_dir / 'fingerprints.parquet'),
+            'cleaned': pd.read_parquet(state_dir / 'cleaned.parquet'),
+            'partials': pd.read_parquet(state_dir / 'season_partials.parquet')
+        }
+
+    @staticmethod
+    def _save_state(state_dir, config_hash, fingerprints, cleaned, partials):
+        """
+        Speichert Fingerprints, bereinigte Zeilen und Teilsummen pro Staffel für den nächsten inkrementellen Lauf.
+        """
+        state_dir.mkdir(parents=True, exist_ok=True)
+        fingerprints.reset_index(drop=True).to_parquet(state_dir / 'fingerprints.parquet')
+        cleaned.to_parquet(state_dir / 'cleaned.parquet')
+        partials.to_parquet(state_dir / 'season_partials.parquet')
+        (state_dir / 'config.txt').write_text(config_hash)
+
+    # Parallele Verarbeitung nach Staffeln
+    @instrumented
+    def run_parallel(self, columns_to_drop, rename_columns, workers=None):
+        """
+        Verarbeitet den Datensatz in mehreren Prozessen. Die Zeilen werden nach Staffelnummer aufgeteilt und
+        zu etwa gleich großen Paketen gebündelt; große Staffeln werden dabei nach Zeilenbereichen geteilt (siehe
+        `_season_partitions`), sodass auch mit mehr Prozessen als Staffeln alle Prozesse ausgelastet sind.
+        Jeder Prozess bereinigt sein Paket, wandelt die Shark-Spalten numerisch um und berechnet die Teilsummen
+        pro Staffel sowie seinen Teil-Würfel. Teilsummen derselben Staffel aus verschiedenen Paketen werden wie bei
+        `process_stream` addiert.
+        Parameters:
+        - columns_to_drop (list): Liste der Spalten, die entfernt werden sollen.
+        - rename_columns (dict): Wörterbuch, das Spaltennamen umbenennt.
+        - workers (int): Anzahl der Prozesse (Standard: Anzahl der CPU-Kerne).
+        Returns:
+            tuple: (shark_totals, cooperation_matrix) wie bei `summarize_shark_data` und `generate_cooperation_matrix`.
+        """
+        self.load_data()
+        if self.sharktank is None:
+            return None
+        raw = self.sharktank
+        workers = workers or os.cpu_count() or 1
+        season_col = {new: old for old, new in rename_columns.items()}.get('Staffelnummer', 'Staffelnummer')
+        partitions = self._season_partitions(raw, season_col, workers * 4)
+        # Fehlende Spalten einmal hier melden statt in jedem Paket
+        not_found = [col for col in columns_to_drop if col not in raw.columns]
+        if not_found:
+            print(f"Columns to drop not found: {', '.join(not_found)}")
+        columns_to_drop = [col for col in columns_to_drop if col in raw.columns]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _process_partition, partitions, repeat(columns_to_drop), repeat(rename_columns)
+            ))
+
+        # Ursprüngliche Zeilenreihenfolge wiederherstellen
+        self.sharktank = apply_schema(pd.concat([cleaned for cleaned, _, _ in results]).sort_index())
+        partials = pd.concat([partials for _, partials, _ in results]).groupby(level=0, dropna=False).sum().sort_index()
+        self.aggregate_cube = combine_cubes(*[cube for _, _, cube in results])
+        self.coalitions = self._coalitions_from_partials(partials)
+        print(f"Processed {len(raw)} rows in {len(partitions)} partitions with {workers} workers.")
+        return self._totals_from_partials(partials), self._pairs_from_partials(partials)
+
+    @staticmethod
+    def _season_partitions(raw, season_col, max_partitions, min_rows=10000):
+        """
+        Teilt die Rohdaten in höchstens `max_partitions` etwa gleich große Pakete auf. Staffeln mit mehr Zeilen als
+        ein Paket (mindestens `min_rows`) fassen soll, werden in zusammenhängende Zeilenbereiche geteilt; kleinere
+        Staffeln bleiben ganz. Die größten Stücke werden zuerst jeweils dem bisher kleinsten Paket zugeordnet.
+        Innerhalb eines Pakets bleibt die ursprüngliche Zeilenreihenfolge erhalten.
+        """
+        codes, _ = pd.factorize(raw[season_col], use_na_sentinel=True)
+        order = np.argsort(codes, kind='stable')
+        _, starts = np.unique(codes[order], return_index=True)
+        piece_size = max(-(-len(raw) // max(max_partitions, 1)), min_rows)
+        pieces = []
+        for season_rows in np.split(order, starts[1:]):
+            pieces.extend(np.array_split(season_rows, -(-len(season_rows) // piece_size)))
+        pieces.sort(key=len, reverse=True)
+        bins = min(max_partitions, len(pieces)) or 1
+        loads = np.zeros(bins, dtype=np.int64)
+        assigned = [[] for _ in range(bins)]
+        for piece in pieces:
+            target = int(loads.argmin())
+            assigned[target].append(piece)
+            loads[target] += len(piece)
+        return [raw.iloc[np.sort(np.concatenate(rows))] for rows in assigned if rows]
+
+    # Blockweise Verarbeitung für Eingaben, die größer als der Arbeitsspeicher sind
+    @instrumented
+    def process_stream(self, columns_to_drop, rename_columns, chunksize=50000, output_file=None, validate_chunks=False):
+        """
+        Verarbeitet die Eingabedatei blockweise statt als einen einzigen DataFrame.
+        Jeder Block wird bereinigt, und seine Leerwerte werden zu NaN (siehe `replace_empty_with_na`). Anschließend werden
+        seine Teilsummen pro Staffel (siehe `compute_season_partials`) in laufende Summen eingerechnet.
+        Der Aggregat-Würfel (siehe `build_aggregate_cube`) und seine Zellentabellen (siehe `build_cell_tables`)
+        werden ebenfalls blockweise fortgeschrieben.
+        Der Speicherbedarf hängt damit nur von `chunksize` ab, nicht von der Größe der Datei.
+        Parameters:
+        - columns_to_drop (list): Liste der Spalten, die entfernt werden sollen.
+        - rename_columns (dict): Wörterbuch, das Spaltennamen umbenennt.
+        - chunksize (int): Anzahl der Zeilen pro Block.
+        - output_file (str): Optionale Parquet-Datei, in die die bereinigten Blöcke geschrieben werden (mit demselben
+          typisierten Schema wie im seriellen Ablauf, siehe `datastore.ChunkWriter`).
+        - validate_chunks (bool): Jeden Block prüfen (siehe `validate_data`); die Zeilennummern beziehen sich auf die
+          gesamte Datei. Doppelte Pitches werden dabei nur innerhalb eines Blocks erkannt.
+        Returns:
+            tuple: (shark_totals, cooperation_matrix) wie bei `summarize_shark_data` und `generate_cooperation_matrix`.
+        """
+        if not self.file_path.exists():
+            print(f"File not found: {self.file_path}")
+            return None
+        writer = ChunkWriter(output_file) if output_file is not None else None
+        self.aggregate_cube = None
+        self.shark_cells = None
+        self.coalition_cells = None
+        running = None
+        violations = []
+        row_count = 0
+        for chunk in iter_chunks(self.file_path, chunksize=chunksize):
+            self.sharktank = chunk
+            self.clean_data(columns_to_drop, rename_columns)
+            self.replace_empty_with_na()
+            self._coerce_shark_columns()
+            partials = self.compute_season_partials()
+            running = partials if running is None else running.add(partials, fill_value=0)
+            self.aggregate_cube = combine_cubes(self.aggregate_cube, build_aggregate_cube(self.sharktank))
+            self.shark_cells = combine_cubes(self.shark_cells, shark_cells(self.sharktank), by=SHARK_CELL_KEYS)
+            self.coalition_cells = combine_cubes(
+                self.coalition_cells, coalition_cells(self.sharktank), by=COALITION_CELL_KEYS
+            )
+            if validate_chunks:
+                violations.append(validate(self.sharktank.set_axis(pd.RangeIndex(row_count, row_count + len(chunk)))))
+            row_count += len(chunk)
+            if writer is not None:
+                writer.write(self.sharktank)
+        self.sharktank = None
+        if writer is not None:
+            print(f"Data saved successfully to {writer.close()}.")
+        print(f"Streamed {row_count} rows.")
+        if violations:
+            self.validation = pd.concat(violations, ignore_index=True)
+            self._report_validation()
+        if running is None:
+            return None
+        running = running.sort_index()
+        self.coalitions = self._coalitions_from_partials(running)
+        return self._totals_from_partials(running), self._pairs_from_partials(running)
+
     # Speichern der verarbeiteten Daten
-    def save_data(self, new_file_name):
+    @instrumented
+    def save_data(self, new_file_name, excel_copy=False):
         """
-        Diese Methode speichert die verarbeiteten Daten in einer Excel-Datei.
-        Die Methode überprüft, ob der Datenrahmen `self.sharktank` nicht None ist, und schreibt die Daten in eine Excel-Datei an dem angegebenen Pfad.
+        Diese Methode speichert die verarbeiteten Daten.
+        Die Methode überprüft, ob der Datenrahmen `self.sharktank` nicht None ist, und schreibt die Daten an den angegebenen Pfad.
+        Die Dateiendung bestimmt das Format: `.arrow`, `.parquet` bzw. `.feather` speichern spaltenorientiert mit typisierten
+        Spalten (Kategorien für Branche/Geschlecht/Bundesstaat), wobei `.arrow` unkomprimiert geschrieben wird, sodass das
+        Dashboard die Datei ohne Kopie einblenden kann (siehe `datastore.map_table`), `.sqlite` schreibt eine eingebettete Datenbank mit Indizes auf
+        Staffelnummer, Branche, Geschlecht und Deal erhalten, die das Dashboard per Abfrage liest (siehe `sqlstore`),
+        `.xlsx` schreibt wie bisher eine Excel-Datei.
         Args:
-            new_file_name (str): Der Name der neuen Excel-Datei, in der die Daten gespeichert werden.
+            new_file_name (str): Der Name der neuen Datei, in der die Daten gespeichert werden.
+            excel_copy (bool): Wenn True, wird bei Arrow/Parquet/Feather/SQLite zusätzlich eine Excel-Datei geschrieben.
         Returns:
             None
         """
         if self.sharktank is not None:
-            save_path = Path(new_file_name).resolve()
-            self.sharktank.to_excel(save_path, index=False)
+            save_path = write_table(self.sharktank, new_file_name, excel_copy=excel_copy)
             print(f"Data saved successfully to {save_path}.")
 
+def _process_partition(raw_part, columns_to_drop, rename_columns):
+    """
+    Verarbeitet ein Paket aus Staffeln bzw. Teilen davon in einem Worker-Prozess (siehe `SharkTankProcessor.run_parallel`).
+    Returns:
+        tuple: (bereinigte Zeilen, Teilsummen pro Staffel, Teil-Würfel)
+    """
+    processor = SharkTankProcessor(None)
+    processor.sharktank = raw_part
+    processor.clean_data(columns_to_drop, rename_columns)
+    processor.replace_empty_with_na()
+    processor._coerce_shark_columns()
+    return processor.sharktank, processor.compute_season_partials(), processor.build_aggregate_cube()
+
 # Spalten zu entfernt und umbenannt
 columns_to_drop = [
     "Season Start", "Season End", "Episode Number", "Pitch Number", "Original Air Date",
@@ -179,26 +714,236 @@ rename_columns = {
     "Guest Name": "Name des Gastes"
 }
 
-file_path = Path('sharktank.xlsx').resolve()
+# Ausgaben der Pipeline: Stufe -> Dateiname (ohne Endung)
+PIPELINE_OUTPUTS = {
+    'cleaned': 'sharktank_cleaned',
+    'summary': 'shark_summary',
+    'cooperation': 'shark_cooperation_matrix',
+    'coalitions': 'shark_coalitions',
+    'cube': 'sharktank_cube',
+    'shark_cells': 'sharktank_shark_cells',
+    'coalition_cells': 'sharktank_coalition_cells',
+    'analytics': 'shark_analytics',
+    'validation': 'sharktank_validation',
+    'startup_index': 'sharktank_startup_index',
+}
+OUTPUT_FORMATS = ['parquet', 'arrow', 'feather', 'sqlite', 'xlsx']
+
+
+def run_pipeline(inputs='sharktank.xlsx', output_dir='.', output_format='parquet', stages=None, workers=None,
+                 chunksize=None, incremental=False, excel_copy=False, columns_to_drop=columns_to_drop,
+                 rename_columns=rename_columns, validation_sample=None, instrumentation=None):
+    """
+    Führt die Pipeline für eine oder mehrere Eingabedateien in einem Prozess aus.
+    Laden, Bereinigen und Umwandeln der Leerwerte laufen immer; `stages` bestimmt, welche Ergebnisse berechnet
+    und gespeichert werden (siehe `PIPELINE_OUTPUTS`). Bei mehreren Eingabedateien werden die Ergebnisse jeder Datei
+    in einem eigenen Unterordner (Dateiname ohne Endung) von `output_dir` gespeichert.
+    Parameters:
+    - inputs (str | list): Eingabedatei(en) oder Glob-Muster wie 'snapshots/*.parquet' (.xlsx, .csv oder .parquet).
+    - output_dir (str): Zielordner der Ergebnisse.
+    - output_format (str): 'parquet', 'arrow', 'feather', 'sqlite' oder 'xlsx'.
+    - stages (list): Zu erstellende Ergebnisse, standardmäßig alle.
+    - workers (int): Anzahl der Prozesse für die parallele Verarbeitung nach Staffeln (None = seriell).
+    - chunksize (int): Blockgröße für die speicherschonende Verarbeitung (None = alles auf einmal laden).
+    - incremental (bool): Nur neue oder geänderte Zeilen verarbeiten (Stand im Ordner 'pipeline_state').
+      `workers`, `chunksize` und `incremental` schließen sich gegenseitig aus.
+    - excel_copy (bool): Zusätzlich Excel-Dateien zu Arrow/Parquet/Feather/SQLite schreiben (für das Dashboard).
+    - columns_to_drop (list): Liste der Spalten, die entfernt werden sollen.
+    - rename_columns (dict): Wörterbuch, das Spaltennamen umbenennt.
+    - validation_sample (int | float): Nur eine Stichprobe prüfen (Anzahl der Zeilen oder Anteil); None = alle Zeilen.
+    - instrumentation (Instrumentation): Optional; misst Laufzeit, Speicher und Zeilen jedes Verarbeitungsschritts.
+    Returns:
+        dict: Pro Eingabedatei ein Wörterbuch Stufe -> Pfad der gespeicherten Datei.
+    """
+    stages = list(PIPELINE_OUTPUTS) if stages is None else list(stages)
+    unknown = set(stages) - set(PIPELINE_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unbekannte Stufen: {sorted(unknown)}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unbekanntes Format: {output_format}")
+    modes = [
+        name for name, active in
+        (('workers', workers is not None), ('chunksize', chunksize is not None), ('incremental', incremental))
+        if active
+    ]
+    if len(modes) > 1:
+        raise ValueError(f"Nicht kombinierbare Verarbeitungsmodi: {', '.join(modes)}")
+
+    patterns = [inputs] if isinstance(inputs, (str, Path)) else list(inputs)
+    input_files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(str(pattern)))
+        # Muster ohne Treffer werden als Dateiname übernommen (load_data meldet dann die fehlende Datei)
+        input_files.extend(Path(match) for match in matches or [pattern])
+
+    results = {}
+    for input_file in input_files:
+        target_dir = Path(output_dir) if len(input_files) == 1 else Path(output_dir) / input_file.stem
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        def output_path(stage, suffix=output_format):
+            return target_dir / f'{PIPELINE_OUTPUTS[stage]}.{suffix}'
+
+        processor = SharkTankProcessor(input_file, instrumentation=instrumentation)
+        if chunksize is not None:
+            # Blockweise Ausgabe ist nur als Parquet möglich
+            processed = processor.process_stream(
+                columns_to_drop, rename_columns, chunksize=chunksize,
+                output_file=output_path('cleaned', 'parquet') if 'cleaned' in stages else None,
+                validate_chunks='validation' in stages
+            )
+        elif workers is not None:
+            processed = processor.run_parallel(columns_to_drop, rename_columns, workers=workers)
+        elif incremental:
+            processed = processor.run_incremental(
+                columns_to_drop, rename_columns, state_dir=target_dir / 'pipeline_state'
+            )
+        else:
+            # Bereinigtes File erstellen und Daten laden
+            processor.load_data()
+            processed = None
+            if processor.sharktank is not None:
+                # Daten bereinigen und Umbenennen
+                processor.clean_data(columns_to_drop, rename_columns)
+
+                # Leerwerte durch NaN ersetzen
+                processor.replace_empty_with_na()
+
+                # Zusammenfassung der Investitionen der Sharks
+                processed = (
+                    processor.summarize_shark_data() if 'summary' in stages else None,
+                    processor.generate_cooperation_matrix() if 'cooperation' in stages else None,
+                )
+
+        # Fehlende oder leere Eingabedatei: in jedem Modus überspringen, die übrigen Dateien weiter verarbeiten
+        if processed is None:
+            print(f"Skipping {input_file}: no data processed.")
+            results[str(input_file)] = {}
+            continue
+        shark_summary, cooperation_matrix = processed
+
+        # Prüfung der Datenqualität (bei blockweiser Verarbeitung bereits pro Block erfolgt)
+        if 'validation' in stages and processor.sharktank is not None:
+            processor.validate_data(sample=validation_sample)
+
+        # Aggregat-Würfel und Koalitionen (bei inkrementeller, paralleler und blockweiser Verarbeitung bereits berechnet)
+        if 'cube' in stages and processor.aggregate_cube is None and processor.sharktank is not None:
+            processor.build_aggregate_cube()
+        if 'coalitions' in stages and processor.coalitions is None and processor.sharktank is not None:
+            processor.generate_coalitions()
+        # Zellentabellen zum Würfel (bei blockweiser Verarbeitung bereits berechnet)
+        cell_stages = {'shark_cells', 'coalition_cells'} & set(stages)
+        if cell_stages and processor.shark_cells is None and processor.sharktank is not None:
+            processor.build_cell_tables()
+        # Suchindex und Kennzahlen; bei blockweiser Verarbeitung blockweise aus den benötigten Spalten der bereits
+        # geschriebenen bereinigten Daten. Der Speicherbedarf sinkt damit, wächst aber weiter mit der Datei:
+        # der Suchindex enthält eine Zeile pro Pitch, und die Medianwerte benötigen alle Einzelinvestitionen
+        if 'startup_index' in stages:
+            if processor.sharktank is not None:
+                processor.build_startup_index()
+            elif chunksize is not None and 'cleaned' in stages:
+                processor.build_startup_index(
+                    iter_chunks(output_path('cleaned', 'parquet'), chunksize=chunksize, columns=STARTUP_COLUMNS)
+                )
+        if 'analytics' in stages:
+            if processor.sharktank is not None:
+                processor.analyze_sharks()
+            elif chunksize is not None and 'cleaned' in stages:
+                processor.analyze_sharks(
+                    iter_chunks(output_path('cleaned', 'parquet'), chunksize=chunksize, columns=ANALYTICS_COLUMNS)
+                )
+
+        # Ergebnisse speichern
+        tables = {
+            'summary': None if shark_summary is None else pd.DataFrame.from_dict(
+                shark_summary, orient='index').rename_axis('Shark').reset_index(),
+            'cooperation': cooperation_matrix,
+            'coalitions': processor.coalitions,
+            'analytics': processor.shark_analytics,
+            'cube': processor.aggregate_cube,
+            'shark_cells': processor.shark_cells,
+            'coalition_cells': processor.coalition_cells,
+            'validation': processor.validation,
+            'startup_index': processor.startup_index,
+        }
+        saved = {}
+        if 'cleaned' in stages and processor.sharktank is not None:
+            processor.save_data(output_path('cleaned'), excel_copy=excel_copy)
+            saved['cleaned'] = output_path('cleaned').resolve()
+        elif 'cleaned' in stages and chunksize is not None:
+            saved['cleaned'] = output_path('cleaned', 'parquet').resolve()
+        for stage, table in tables.items():
+            if stage in stages and table is not None:
+                saved[stage] = write_table(table, output_path(stage), excel_copy=excel_copy)
+                print(f"{stage.capitalize()} saved to {saved[stage]}.")
+
+        # Festhalten, aus welchen bereinigten Daten die übrigen Ergebnisse stammen; das Dashboard verwendet sie nur,
+        # solange die bereinigten Daten unverändert sind (siehe `datastore.derived_hash`). Die dabei berechneten
+        # Inhalts-Hashes übernimmt das Dashboard beim Start (siehe `datastore.content_hash`)
+        # (Excel-Kopien nur, soweit sie geschrieben wurden, siehe `datastore.EXCEL_MAX_ROWS`)
+        cleaned_files = {saved['cleaned']} if 'cleaned' in saved else set()
+        if cleaned_files and excel_copy and chunksize is None:
+            cleaned_files.add(saved['cleaned'].with_suffix('.xlsx'))
+        cleaned_files = {path for path in cleaned_files if path.exists()}
+        derived_files = [
+            path for stage, saved_path in saved.items() if stage != 'cleaned'
+            for path in {saved_path, saved_path.with_suffix('.xlsx') if excel_copy else saved_path}
+            if path.exists()
+        ]
+        cleaned_hashes = record_hashes(sorted(cleaned_files))
+        if derived_files:
+            record_hashes(derived_files)
+            record_sources(derived_files, cleaned_hashes)
+        results[str(input_file)] = saved
+    return results
+
 
-# Bereinigtes File erstellen und Daten laden
-processor = SharkTankProcessor(file_path)
-processor.load_data()
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description='Bereinigt die Shark Tank-Daten und berechnet die Auswertungen für das Dashboard.')
+    parser.add_argument('inputs', nargs='*', default=['sharktank.xlsx'],
+                        help="Eingabedateien oder Glob-Muster (.xlsx, .csv, .parquet), z. B. 'snapshots/*.parquet'.")
+    parser.add_argument('--output-dir', default='.', help='Zielordner der Ergebnisse.')
+    parser.add_argument('--format', default='parquet', choices=OUTPUT_FORMATS, help='Format der Ergebnisdateien.')
+    parser.add_argument('--stages', default=','.join(PIPELINE_OUTPUTS),
+                        help=f"Kommagetrennte Ergebnisse, z. B. 'cleaned,cube' (möglich: {', '.join(PIPELINE_OUTPUTS)}).")
+    # Die Verarbeitungsmodi schließen sich gegenseitig aus
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--workers', type=int, default=None, help='Anzahl der Prozesse für die parallele Verarbeitung nach Staffeln.')
+    mode.add_argument('--chunksize', type=int, default=None, help='Blockgröße für die speicherschonende Verarbeitung großer Dateien.')
+    mode.add_argument('--incremental', action='store_true', help="Nur neue oder geänderte Zeilen verarbeiten (Stand im Ordner 'pipeline_state').")
+    parser.add_argument('--validation-sample', type=float, default=None,
+                        help='Nur eine Stichprobe prüfen: Anteil (z. B. 0.1) oder Anzahl der Zeilen (z. B. 10000).')
+    parser.add_argument('--excel', action='store_true', help='Zusätzlich Excel-Dateien neben den Ergebnisdateien schreiben.')
+    parser.add_argument('--profile-dir', default=None, help='Ordner für cProfile-Auswertungen der einzelnen Schritte.')
+    args = parser.parse_args(argv)
 
-# Daten bereinigen und Umbenennen
-processor.clean_data(columns_to_drop, rename_columns)
+    # Werte ab 1 sind eine Anzahl von Zeilen, kleinere ein Anteil
+    validation_sample = args.validation_sample
+    if validation_sample is not None and validation_sample >= 1:
+        validation_sample = int(validation_sample)
 
-# Leerwerte durch NaN ersetzen
-processor.replace_empty_with_na()
+    # Laufzeit-, Speicher- und Zeilenmessung je Schritt (Logzeilen und JSON-Bericht)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    report_path = Path(args.output_dir) / 'pipeline_report.json'
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    instrumentation = Instrumentation(sinks=[LogSink(), JsonReportSink(report_path)], profile_dir=args.profile_dir)
 
-# Zusammenfassung der Investitionen der Sharks
-shark_summary = processor.summarize_shark_data()
-cooperation_matrix = processor.generate_cooperation_matrix()
+    run_pipeline(
+        args.inputs,
+        output_dir=args.output_dir,
+        output_format=args.format,
+        stages=[stage.strip() for stage in args.stages.split(',') if stage.strip()],
+        workers=args.workers,
+        chunksize=args.chunksize,
+        incremental=args.incremental,
+        excel_copy=args.excel,
+        validation_sample=validation_sample,
+        instrumentation=instrumentation
+    )
+    instrumentation.close()
+    print(f"Pipeline report saved to {report_path.resolve()}.")
 
-# Bereinigte Daten speichern
-processor.save_data('sharktank_cleaned.xlsx')
 
-# Zusammenarbeitsmatrix speichern
-cooperation_matrix_path = Path('shark_cooperation_matrix.xlsx').resolve()
-cooperation_matrix.to_excel(cooperation_matrix_path, index=False)
-print(f"Cooperation matrix saved to {cooperation_matrix_path}.")
+# Die Pipeline läuft nur beim direkten Aufruf; Worker-Prozesse importieren dieses Modul erneut
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+# Textspalten mit wenigen unterschiedlichen Werten werden als Kategorien gespeichert
+CATEGORICAL_COLUMNS = ['Branche', 'Pitcher Geschlecht', 'Pitcher Bundesstaat', 'Name des Gastes']
+
+# Kleine Ganzzahlen (Staffel, Deal-Kennzeichen, Anzahl Sharks) werden auf den kleinsten passenden Typ verkleinert
+SMALL_INTEGER_COLUMNS = ['Staffelnummer', 'Deal erhalten', 'Anzahl der Sharks bei Deal']
+
+# Spalten mit Investitionssummen und Kapitalbeteiligungen; fehlende Werte bleiben NaN und werden
+# erst bei der Anzeige bzw. beim Excel-Export als 'N/A' dargestellt
+NUMERIC_SHARK_COLUMNS = [
+    'Barbara Corcoran Investitionssumme', 'Barbara Corcoran Kapitalbeteiligung',
+    'Mark Cuban Investitionssumme', 'Mark Cuban Kapitalbeteiligung',
+    'Lori Greiner Investitionssumme', 'Lori Greiner Kapitalbeteiligung',
+    'Robert Herjavec Investitionssumme', 'Robert Herjavec Kapitalbeteiligung',
+    'Daymond John Investitionssumme', 'Daymond John Kapitalbeteiligung',
+    'Kevin O Leary Investitionssumme', 'Kevin O Leary Kapitalbeteiligung',
+    'Gast Investitionssumme', 'Gast Kapitalbeteiligung'
+]
+
+# Übrige Zahlenspalten (Forderung und Deal); Beträge ohne Nachkommastellen bleiben ganzzahlig
+NUMERIC_PITCH_COLUMNS = [
+    'Geforderter Betrag (USD)', 'Gebotene Anteile (%)', 'Geforderte Bewertung (USD)',
+    'Erhaltener Betrag (USD)', 'Erhaltene Anteile (%)', 'Bewertung anhand Deal (USD)'
+]
+
+# Textspalten ohne Kategorien
+TEXT_COLUMNS = ['Name des Startups']
+
+NA_LABEL = 'N/A'
+
+
+def _smallest_integer(series):
+    """
+    Verkleinert eine ganzzahlige Spalte. Ohne fehlende Werte wird ein NumPy-Typ (z. B. uint8) verwendet,
+    mit fehlenden Werten der passende nullable Typ (z. B. UInt8).
+    """
+    values = pd.to_numeric(series, errors='coerce')
+    present = values.dropna()
+    if len(present) and not np.array_equal(present, present.round()):
+        return values
+    if not values.isna().any():
+        return pd.to_numeric(values, downcast='integer' if (present < 0).any() else 'unsigned')
+    low, high = (present.min(), present.max()) if len(present) else (0, 0)
+    for dtype in ('UInt8', 'UInt16', 'UInt32') if low >= 0 else ('Int8', 'Int16', 'Int32'):
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype('Int64')
+
+
+def smallest_integer_dtype(low, high, has_na):
+    """
+    Der Typ, den `apply_schema` für eine ganzzahlige Spalte mit diesem Wertebereich wählt. Für Daten, die nur
+    blockweise vorliegen: der Wertebereich wird über alle Blöcke gesammelt und der Typ erst am Ende bestimmt.
+    Parameters:
+    - low, high (float): Kleinster und größter vorhandener Wert (None, wenn kein Wert vorhanden ist).
+    - has_na (bool): Ob fehlende Werte vorkommen.
+    """
+    values = [] if low is None else [low, high]
+    return _smallest_integer(pd.Series(values + ([np.nan] if has_na else []), dtype='float64')).dtype
+
+
+def apply_schema(df):
+    """
+    Wendet das typisierte Schema des bereinigten Datensatzes an:
+    Kategorien für Branche/Geschlecht/Bundesstaat/Name des Gastes, numerische Investitions- und
+    Beteiligungsspalten (fehlend = NaN, kein 'N/A'-Text) und verkleinerte Ganzzahlen für Staffelnummer,
+    Deal erhalten und Anzahl der Sharks bei Deal. Nicht vorhandene Spalten werden übersprungen.
+    Parameters:
+    - df (pd.DataFrame): Der Datenrahmen.
+    Returns:
+        pd.DataFrame: Kopie des Datenrahmens mit kompakten Spaltentypen.
+    """
+    typed = df.copy()
+    for col in NUMERIC_SHARK_COLUMNS:
+        if col in typed.columns and not pd.api.types.is_float_dtype(typed[col]):
+            typed[col] = pd.to_numeric(typed[col].replace(['', NA_LABEL], np.nan), errors='coerce').astype('float64')
+    for col in SMALL_INTEGER_COLUMNS:
+        if col in typed.columns:
+            typed[col] = _smallest_integer(typed[col])
+    for col in CATEGORICAL_COLUMNS:
+        if col in typed.columns and not isinstance(typed[col].dtype, pd.CategoricalDtype):
+            typed[col] = typed[col].astype('category')
+    return typed
+
+
+def with_na_labels(df):
+    """
+    Ersetzt fehlende Werte der Investitions- und Beteiligungsspalten durch 'N/A'.
+    Nur für den Excel-Export gedacht; die Spalten werden dadurch zu Text.
+    """
+    labeled = df.copy()
+    for col in NUMERIC_SHARK_COLUMNS:
+        if col in labeled.columns:
+            labeled[col] = labeled[col].astype(object).where(labeled[col].notna(), NA_LABEL)
+    return labeled
+
+
+def display_with_na(df):
+    """
+    Formatiert den Datenrahmen für die Anzeige: fehlende Investitions- und Beteiligungswerte erscheinen als 'N/A',
+    die Spalten selbst bleiben numerisch (und damit im Dashboard sortierbar).
+    """
+    columns = [col for col in NUMERIC_SHARK_COLUMNS if col in df.columns]
+    return df.style.format('{:.10g}', subset=columns, na_rep=NA_LABEL)
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import CUBE_DIMENSIONS
+from coalitions import PARTICIPANTS
+from schema import apply_schema
+
+INVESTMENT_COLUMNS = [f'{participant} Investitionssumme' for participant in PARTICIPANTS]
+EQUITY_COLUMNS = [f'{participant} Kapitalbeteiligung' for participant in PARTICIPANTS]
+# Spalten, die `shark_analytics` liest
+INPUT_COLUMNS = ['Staffelnummer'] + INVESTMENT_COLUMNS + EQUITY_COLUMNS
+
+# Benannte Aggregationen des gruppierten Durchlaufs
+AGGREGATIONS = {
+    'Anzahl Deals': ('Investition', 'size'),
+    'Investitionssumme (USD)': ('Investition', 'sum'),
+    'Ø Investition (USD)': ('Investition', 'mean'),
+    'Median Investition (USD)': ('Investition', 'median'),
+    'Ø Kapitalbeteiligung (%)': ('Kapitalbeteiligung', 'mean'),
+    'Ø implizite Bewertung (USD)': ('Bewertung', 'mean'),
+    'Median implizite Bewertung (USD)': ('Bewertung', 'median'),
+    '_Investition × Beteiligung': ('Investition × Beteiligung', 'sum'),
+    '_Investition (bewertbar)': ('Investition (bewertbar)', 'sum'),
+    '_Beteiligung (bewertbar)': ('Beteiligung (bewertbar)', 'sum'),
+    '_Co-Investments': ('Co-Investment', 'sum'),
+}
+
+# Additive Summen je Shark und Zelle des Aggregat-Würfels (siehe `shark_cells`); daraus lassen sich alle Kennzahlen
+# außer den Medianwerten für jede Filterauswahl durch Summieren der gewählten Zellen ableiten
+CELL_AGGREGATIONS = {
+    'Anzahl Deals': ('Investition', 'size'),
+    'Investitionssumme (USD)': ('Investition', 'sum'),
+    '_Kapitalbeteiligung': ('Kapitalbeteiligung', 'sum'),
+    '_Kapitalbeteiligung (Anzahl)': ('Kapitalbeteiligung', 'count'),
+    '_Bewertung': ('Bewertung', 'sum'),
+    '_Bewertung (Anzahl)': ('Bewertung', 'count'),
+    '_Investition × Beteiligung': ('Investition × Beteiligung', 'sum'),
+    '_Investition (bewertbar)': ('Investition (bewertbar)', 'sum'),
+    '_Beteiligung (bewertbar)': ('Beteiligung (bewertbar)', 'sum'),
+    '_Co-Investments': ('Co-Investment', 'sum'),
+}
+# Schlüssel der Zellentabelle `shark_cells`: die Dimensionen des Aggregat-Würfels und der Shark
+CELL_KEYS = CUBE_DIMENSIONS + ['Shark']
+
+
+def _investments_long(data, keys=('Staffelnummer',)):
+    """
+    Formt die Investitions- und Beteiligungsspalten in eine lange Tabelle um: eine Zeile pro Investition
+    eines Sharks (bzw. des Gastes) in einen Pitch. `keys` sind die Spalten des Pitches, die übernommen werden.
+    """
+    investments = data[INVESTMENT_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    equity = data[EQUITY_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    invested = ~np.isnan(investments)
+    rows, participants = np.nonzero(invested)
+
+    amount = investments[rows, participants]
+    share = equity[rows, participants]
+    # Deals ohne Beteiligung (z. B. reine Kredite) haben keine Bewertung
+    valid_share = share > 0
+    return pd.DataFrame({
+        'Shark': pd.Categorical.from_codes(participants, categories=PARTICIPANTS),
+        **{key: data[key].array.take(rows) for key in keys},
+        'Investition': amount,
+        'Kapitalbeteiligung': share,
+        'Bewertung': np.where(valid_share, amount / np.where(valid_share, share, 1) * 100, np.nan),
+        'Investition × Beteiligung': np.where(valid_share, amount * share, 0.0),
+        'Investition (bewertbar)': np.where(valid_share, amount, 0.0),
+        'Beteiligung (bewertbar)': np.where(valid_share, share, 0.0),
+        'Co-Investment': invested.sum(axis=1)[rows] > 1,
+    })
+
+
+def _aggregate(long, keys):
+    """Aggregiert die lange Tabelle nach `keys` und leitet die gewichteten Kennzahlen aus den Summen ab."""
+    grouped = long.groupby(keys, observed=True, dropna=False).agg(**AGGREGATIONS)
+    return _weighted(grouped).drop(columns=[col for col in grouped.columns if col.startswith('_')]).reset_index()
+
+
+def _weighted(grouped):
+    """
+    Leitet die gewichteten Kennzahlen und den Anteil der Co-Investments aus den Summen ab.
+    Die implizite Bewertung gewichtet jede Einzelbewertung mit ihrer Beteiligung (Summe Investition / Summe
+    Beteiligung), die Beteiligung wird mit der Investition gewichtet.
+    """
+    valued_amount = grouped['_Investition (bewertbar)']
+    valued_share = grouped['_Beteiligung (bewertbar)']
+    grouped['Implizite Bewertung, beteiligungsgewichtet (USD)'] = valued_amount / valued_share.where(valued_share > 0) * 100
+    grouped['Ø Kapitalbeteiligung, investitionsgewichtet (%)'] = (
+        grouped['_Investition × Beteiligung'] / valued_amount.where(valued_amount > 0)
+    )
+    grouped['Anteil Co-Investments'] = grouped['_Co-Investments'] / grouped['Anzahl Deals']
+    grouped['Anzahl Deals'] = grouped['Anzahl Deals'].astype(np.int32)
+    return grouped
+
+
+def shark_analytics(data):
+    """
+    Berechnet Kennzahlen je Shark (inkl. Gast) pro Staffel und über alle Staffeln: Anzahl der Deals, Summe,
+    Durchschnitt und Median der Investitionen, durchschnittliche und gewichtete Kapitalbeteiligung,
+    implizite Bewertung (Investition / Beteiligung) sowie den Anteil der Deals, an denen weitere Sharks beteiligt waren.
+    Alle Kennzahlen entstehen aus einer langen Tabelle der Einzelinvestitionen in einem gruppierten Durchlauf
+    pro Ebene.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz.
+    Returns:
+        pd.DataFrame: Eine Zeile pro Shark und Staffel sowie eine Gesamtzeile pro Shark (Staffelnummer fehlt).
+    """
+    return analytics_from_investments(investment_table(data))
+
+
+def investment_table(data):
+    """
+    Die Einzelinvestitionen eines Datensatzes oder eines Blocks davon als lange Tabelle (eine Zeile pro Investition
+    eines Sharks bzw. des Gastes). Bei blockweiser Verarbeitung werden die Tabellen der Blöcke mit
+    `analytics_from_investments` zusammengeführt; sie enthalten nur Pitches mit Deal und wenige Spalten.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz oder ein Block davon (`INPUT_COLUMNS`).
+    Returns:
+        pd.DataFrame: Die Einzelinvestitionen mit Staffelnummer.
+    """
+    return _investments_long(data)
+
+
+def analytics_from_investments(*tables):
+    """
+    Berechnet die Kennzahlen aus den Einzelinvestitionen eines oder mehrerer Blöcke (siehe `investment_table`).
+    Die Medianwerte benötigen alle Einzelinvestitionen zugleich; die Blöcke werden daher vor dem Gruppieren
+    zusammengeführt.
+    Returns:
+        pd.DataFrame: Eine Zeile pro Shark und Staffel sowie eine Gesamtzeile pro Shark (Staffelnummer fehlt).
+    """
+    long = pd.concat(tables, ignore_index=True) if len(tables) > 1 else tables[0]
+    # Investitionen ohne Staffelnummer zählen nur in die Gesamtzeilen
+    per_season = _aggregate(long.dropna(subset=['Staffelnummer']), ['Shark', 'Staffelnummer'])
+    overall = _aggregate(long, ['Shark'])
+    analytics = pd.concat([overall, per_season], ignore_index=True)
+    analytics = analytics.sort_values(['Shark', 'Staffelnummer'], na_position='first', ignore_index=True)
+    analytics = analytics[['Shark', 'Staffelnummer'] + [col for col in analytics.columns if col not in ('Shark', 'Staffelnummer')]]
+    analytics['Shark'] = analytics['Shark'].astype(pd.CategoricalDtype(PARTICIPANTS))
+    return apply_schema(analytics)
+
+
+def shark_cells(data):
+    """
+    Die additiven Summen je Shark pro Zelle des Aggregat-Würfels (siehe `aggregates.build_aggregate_cube`).
+    Summiert über die Zellen einer Filterauswahl (siehe `aggregates.select_cells`) ergeben sie mit `cell_totals`
+    dieselben Gesamtkennzahlen wie `shark_totals(shark_analytics(...))` über die gefilterten Zeilen, ohne Medianwerte.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz (Dimensionen des Würfels und `INPUT_COLUMNS`).
+    Returns:
+        pd.DataFrame: Eine Zeile pro Zelle und Shark mit Investitionen, mit den Spalten `CELL_KEYS` und den Summen
+        aus `CELL_AGGREGATIONS`.
+    """
+    long = _investments_long(data, keys=CUBE_DIMENSIONS)
+    cells = long.groupby(CELL_KEYS, observed=True, dropna=False).agg(**CELL_AGGREGATIONS)
+    return apply_schema(cells.reset_index())
+
+
+def cell_totals(cells):
+    """
+    Die Gesamtkennzahlen je Shark aus den (ausgewählten) Zellen von `shark_cells`, wie `shark_totals`.
+    Medianwerte lassen sich nicht aus Summen bilden und fehlen daher.
+    """
+    grouped = cells.groupby(cells['Shark'].astype(pd.CategoricalDtype(PARTICIPANTS)), observed=True)[
+        list(CELL_AGGREGATIONS)
+    ].sum()
+    grouped['Ø Investition (USD)'] = grouped['Investitionssumme (USD)'] / grouped['Anzahl Deals']
+    shares = grouped['_Kapitalbeteiligung (Anzahl)']
+    grouped['Ø Kapitalbeteiligung (%)'] = grouped['_Kapitalbeteiligung'] / shares.where(shares > 0)
+    valuations = grouped['_Bewertung (Anzahl)']
+    grouped['Ø implizite Bewertung (USD)'] = grouped['_Bewertung'] / valuations.where(valuations > 0)
+    totals = _weighted(grouped)
+    return totals.drop(columns=[col for col in totals.columns if col.startswith('_')]).reset_index()
+
+
+def shark_totals(analytics):
+    """Die Gesamtzeilen (über alle Staffeln) der Kennzahlen, eine Zeile pro Shark."""
+    return analytics[analytics['Staffelnummer'].isna()].drop(columns='Staffelnummer').reset_index(drop=True)
@@ -0,0 +1,208 @@
+import math
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from filter_index import FILTER_COLUMNS
+from schema import CATEGORICAL_COLUMNS, apply_schema
+
+# Name der Tabelle in der Datenbankdatei
+SQLITE_TABLE = 'data'
+
+# Spalten mit Index: die Filterspalten des Dashboards und der Name des Startups (Detailansicht)
+INDEXED_COLUMNS = FILTER_COLUMNS + ['Name des Startups']
+
+
+def _quote(name):
+    """Setzt einen Spaltennamen in Anführungszeichen (Spaltennamen enthalten Leerzeichen und Klammern)."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _parameter(value):
+    """Wandelt NumPy-Werte (z. B. np.uint8 aus `unique()`) in Python-Werte um, die sqlite3 binden kann."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_sqlite(df, file_name, table=SQLITE_TABLE):
+    """
+    Schreibt einen Datenrahmen als Tabelle in eine SQLite-Datei und legt Indizes auf den Filterspalten an.
+    Eine bestehende Tabelle wird ersetzt. Fehlende Werte werden zu NULL, Kategorien zu Text; `SqliteStore`
+    stellt das typisierte Schema beim Lesen wieder her.
+    Parameters:
+    - df (pd.DataFrame): Der zu speichernde Datenrahmen.
+    - file_name (str): Pfad der Datenbankdatei.
+    - table (str): Name der Tabelle.
+    Returns:
+        Path: Der Pfad der gespeicherten Datei.
+    """
+    save_path = Path(file_name).resolve()
+    with closing(sqlite3.connect(save_path)) as connection:
+        with connection:
+            df.reset_index(drop=True).to_sql(table, connection, if_exists='replace', index=False)
+            for col in INDEXED_COLUMNS:
+                if col in df.columns:
+                    connection.execute(
+                        f'CREATE INDEX {_quote(f"{table} {col}")} ON {_quote(table)} ({_quote(col)})'
+                    )
+        connection.execute('ANALYZE')
+    return save_path
+
+
+class SqliteStore:
+    """
+    Lesezugriff auf eine mit `write_sqlite` geschriebene Datenbank.
+    Filter werden als WHERE-Bedingungen und Gruppierungen als GROUP BY an SQLite übergeben; geladen werden nur
+    die Zeilen und Spalten des Ergebnisses. Jede Abfrage öffnet eine eigene, schreibgeschützte Verbindung,
+    sodass mehrere Threads und Prozesse dieselbe Datei gleichzeitig lesen können.
+    Die Zeilen werden mit ihrer Position in der gespeicherten Tabelle indiziert (wie beim Filtern mit `FilterIndex`).
+    """
+    def __init__(self, file_name, table=SQLITE_TABLE):
+        """
+        Parameters:
+        - file_name (str): Pfad der Datenbankdatei.
+        - table (str): Name der Tabelle.
+        """
+        self.path = Path(file_name).resolve()
+        self.table = table
+        self._categories = {}
+
+    def _query(self, sql, params=()):
+        with closing(sqlite3.connect(f'{self.path.as_uri()}?mode=ro', uri=True)) as connection:
+            return pd.read_sql_query(sql, connection, params=[_parameter(value) for value in params])
+
+    @staticmethod
+    def _where(selections):
+        """
+        Erstellt die WHERE-Bedingung für eine Auswahl (pro Spalte die gewählten Werte, siehe `FilterIndex.select`).
+        Wie bei `isin` werden fehlende Werte nie ausgewählt; eine leere Auswahl einer Spalte liefert keine Zeilen.
+        """
+        clauses, params = [], []
+        for col, selected in dict(selections or {}).items():
+            selected = list(selected)
+            if not selected:
+                clauses.append('0')
+                continue
+            clauses.append(f'{_quote(col)} IN ({", ".join("?" * len(selected))})')
+            params.extend(selected)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def _typed(self, result):
+        """
+        Wendet das typisierte Schema auf ein Abfrageergebnis an. Kategorien erhalten dabei alle Werte der Tabelle,
+        nicht nur die im Ergebnis vorkommenden, sodass gefilterte Ergebnisse dieselben Kategorien wie der
+        Gesamtdatensatz haben.
+        """
+        typed = apply_schema(result)
+        for col in CATEGORICAL_COLUMNS:
+            if col in typed.columns:
+                if col not in self._categories:
+                    self._categories[col] = sorted(self.distinct(col))
+                typed[col] = typed[col].cat.set_categories(self._categories[col])
+        return typed
+
+    def columns(self):
+        """Die Spalten der Tabelle mit ihrem SQLite-Typ (INTEGER, REAL, TEXT)."""
+        info = self._query(f'PRAGMA table_info({_quote(self.table)})')
+        return dict(zip(info['name'], info['type']))
+
+    def count(self, selections=None):
+        """Anzahl der Zeilen, die der Auswahl entsprechen."""
+        where, params = self._where(selections)
+        return int(self._query(f'SELECT COUNT(*) AS n FROM {_quote(self.table)}{where}', params)['n'].iloc[0])
+
+    def distinct(self, col):
+        """Die vorkommenden Werte einer Spalte ohne fehlende Werte, in der Reihenfolge ihres ersten Auftretens."""
+        result = self._query(
+            f'SELECT {_quote(col)} AS value FROM {_quote(self.table)} WHERE {_quote(col)} IS NOT NULL '
+            f'GROUP BY {_quote(col)} ORDER BY MIN(rowid)'
+        )
+        return result['value'].tolist()
+
+    def select(self, selections=None, columns=None, limit=None, rows=None, offset=0):
+        """
+        Lädt die Zeilen einer Auswahl.
+        Parameters:
+        - selections (dict | tuple): Pro Spalte die gewählten Werte; nicht genannte Spalten werden nicht gefiltert.
+        - columns (list): Zu ladende Spalten (None = alle, leer = nur die Positionen).
+        - limit (int): Höchstens so viele Zeilen laden.
+        - rows (list): Nur die Zeilen an diesen Positionen laden (z. B. für eine Stichprobe).
+        - offset (int): So viele Zeilen des Ergebnisses überspringen (mit `limit` für seitenweises Laden).
+        Returns:
+            pd.DataFrame: Die Zeilen mit typisiertem Schema, indiziert mit ihrer Position in der Tabelle.
+        """
+        where, params = self._where(selections)
+        if rows is not None:
+            positions = ', '.join(str(int(row) + 1) for row in rows)
+            where += (' AND ' if where else ' WHERE ') + f'rowid IN ({positions})'
+        fields = ['rowid - 1 AS _position']
+        fields += ['*'] if columns is None else [_quote(col) for col in columns]
+        sql = f'SELECT {", ".join(fields)} FROM {_quote(self.table)}{where} ORDER BY rowid'
+        if limit is not None or offset:
+            # LIMIT -1 steht in SQLite für 'ohne Begrenzung'
+            sql += f' LIMIT {-1 if limit is None else int(limit)} OFFSET {int(offset)}'
+        return self._typed(self._query(sql, params).set_index('_position').rename_axis(None))
+
+    def group_by(self, by, measures, selections=None):
+        """
+        Gruppiert und summiert in der Datenbank (entspricht `aggregates.build_aggregate_cube` für die Auswahl).
+        Parameters:
+        - by (list): Gruppierungsspalten; fehlende Werte bilden eine eigene Gruppe.
+        - measures (list): Zu summierende Spalten (fehlende Werte zählen als 0).
+        - selections (dict | tuple): Optionale Auswahl.
+        Returns:
+            pd.DataFrame: Eine Zeile pro vorkommender Kombination mit 'Anzahl' und den Summen.
+        """
+        where, params = self._where(selections)
+        keys = ', '.join(_quote(col) for col in by)
+        sums = ', '.join(f'TOTAL({_quote(col)}) AS {_quote(col)}' for col in measures)
+        result = self._query(
+            f'SELECT {keys}, COUNT(*) AS "Anzahl", {sums} FROM {_quote(self.table)}{where} '
+            f'GROUP BY {keys} ORDER BY {keys}',
+            params
+        )
+        return self._typed(result)
+
+    def describe(self):
+        """
+        Deskriptive Statistik wie `DataFrame.describe()` (count, mean, std, min, 25%, 50%, 75%, max), in der Datenbank
+        berechnet. Textspalten erhalten nur 'count'. Quartile werden wie bei pandas linear interpoliert.
+        Returns:
+            pd.DataFrame: Eine Zeile pro Spalte.
+        """
+        table = _quote(self.table)
+        stats = {}
+        for col, sql_type in self.columns().items():
+            quoted = _quote(col)
+            if sql_type not in ('INTEGER', 'REAL'):
+                count = self._query(f'SELECT COUNT({quoted}) AS n FROM {table}')['n'].iloc[0]
+                stats[col] = {'count': float(count)}
+                continue
+            row = self._query(
+                f'SELECT COUNT({quoted}) AS n, AVG({quoted}) AS mean, MIN({quoted}) AS min, MAX({quoted}) AS max '
+                f'FROM {table}'
+            ).iloc[0]
+            n = int(row['n'])
+            values = {'count': float(n), 'mean': row['mean'], 'min': row['min'], 'max': row['max']}
+            # Zweiter Durchlauf mit dem Mittelwert statt Summe der Quadrate (numerisch stabil bei großen Beträgen)
+            squares = self._query(
+                f'SELECT TOTAL(({quoted} - ?) * ({quoted} - ?)) AS ss FROM {table}', [row['mean'], row['mean']]
+            )['ss'].iloc[0] if n > 1 else np.nan
+            values['std'] = math.sqrt(squares / (n - 1)) if n > 1 else np.nan
+            for label, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75)):
+                if n == 0:
+                    values[label] = np.nan
+                    continue
+                position = q * (n - 1)
+                lower = math.floor(position)
+                pair = self._query(
+                    f'SELECT {quoted} AS value FROM {table} WHERE {quoted} IS NOT NULL '
+                    f'ORDER BY {quoted} LIMIT 2 OFFSET {lower}'
+                )['value'].to_numpy(dtype=np.float64)
+                upper = pair[1] if len(pair) > 1 else pair[0]
+                values[label] = pair[0] + (upper - pair[0]) * (position - lower)
+            stats[col] = values
+        columns = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        return pd.DataFrame.from_dict(stats, orient='index').reindex(columns=columns)
@@ -0,0 +1,178 @@
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+NAME_COLUMN = 'Name des Startups'
+
+# Spalten, die der Index aus dem bereinigten Datensatz benötigt
+INPUT_COLUMNS = [NAME_COLUMN]
+
+# Spalten der gespeicherten Index-Tabelle: normalisierter Name, Originalname und Zeilenposition im Datensatz
+INDEX_COLUMNS = ['Schlüssel', NAME_COLUMN, 'Zeile']
+
+# Mindestähnlichkeit (0–1) für die unscharfe Suche
+SIMILARITY_CUTOFF = 0.6
+
+
+def normalize_name(name):
+    """
+    Normalisiert einen Startup-Namen für die Suche: Akzente, Leer- und Satzzeichen werden entfernt,
+    Groß- und Kleinschreibung wird ignoriert ('Scrub Daddy' und 'ScrubDaddy' ergeben denselben Schlüssel).
+    """
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    return ''.join(char for char in decomposed if char.isalnum()).casefold()
+
+
+def _trigrams(key):
+    """Die Trigramme eines Schlüssels; Anfang und Ende werden markiert, damit auch kurze Namen Trigramme haben."""
+    padded = f'^{key}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def rows_match(data, name):
+    """
+    Prüft, ob alle Zeilen, die ein Index für `name` liefert, zu diesem Startup gehören. Schlägt die Prüfung fehl,
+    gehören die gespeicherten Zeilenpositionen zu einem anderen Stand des Datensatzes.
+    Parameters:
+    - data (pd.DataFrame): Die Zeilen an den Positionen aus `StartupIndex.lookup(name)`.
+    - name (str): Der gesuchte Name.
+    Returns:
+        bool: True, wenn jeder Name in `data` denselben Schlüssel wie `name` hat.
+    """
+    key = normalize_name(name)
+    return all(not pd.isna(found) and normalize_name(found) == key for found in data[NAME_COLUMN])
+
+
+def build_startup_index(data, offset=0):
+    """
+    Erstellt die Index-Tabelle vom normalisierten Startup-Namen auf die Zeilenpositionen im Datensatz.
+    Jeder Name wird nur einmal normalisiert, auch wenn er in vielen Zeilen vorkommt.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz (oder ein Block davon).
+    - offset (int): Position der ersten Zeile von `data` im gesamten Datensatz (für die blockweise Verarbeitung).
+    Returns:
+        pd.DataFrame: Eine Zeile pro Pitch mit Schlüssel, Name des Startups und Zeile, sortiert nach Schlüssel.
+        Zeilen ohne Namen werden ausgelassen.
+    """
+    codes, names = pd.factorize(data[NAME_COLUMN], use_na_sentinel=True)
+    keys = np.array([normalize_name(name) for name in names], dtype=object)
+    rows = np.flatnonzero(codes >= 0)
+    codes = codes[rows]
+    table = pd.DataFrame({
+        'Schlüssel': keys[codes],
+        NAME_COLUMN: names.to_numpy(dtype=object)[codes],
+        'Zeile': rows.astype(np.int64) + offset,
+    })
+    return combine_startup_indexes(table[table['Schlüssel'] != ''])
+
+
+def combine_startup_indexes(*tables):
+    """
+    Führt Index-Tabellen mehrerer Blöcke zusammen (siehe `build_startup_index` mit `offset`).
+    Returns:
+        pd.DataFrame: Die Index-Tabelle, sortiert nach Schlüssel und Zeile.
+    """
+    tables = [table for table in tables if table is not None]
+    if not tables:
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    combined = pd.concat(tables, ignore_index=True) if len(tables) > 1 else tables[0]
+    return combined.sort_values(['Schlüssel', 'Zeile'], kind='stable').reset_index(drop=True)
+
+
+class StartupIndex:
+    """
+    Suchindex über die Startup-Namen für die Detailansicht des Dashboards.
+    Die exakte Suche ist ein Nachschlagen im Wörterbuch der normalisierten Namen, die Präfixsuche eine binäre
+    Suche in den sortierten Schlüsseln; beide liefern die Zeilenpositionen, ohne den Datensatz zu durchsuchen.
+    Die unscharfe Suche bewertet nur Namen, die Trigramme mit der Anfrage teilen.
+    """
+    def __init__(self, table):
+        """
+        Parameters:
+        - table (pd.DataFrame): Die Index-Tabelle aus `build_startup_index`.
+        """
+        keys = table['Schlüssel']
+        if not pd.api.types.is_string_dtype(keys):
+            # Aus Excel gelesene Schlüssel, die nur aus Ziffern bestehen, sind Zahlen; neu aus dem Namen bilden
+            keys = table[NAME_COLUMN].map(normalize_name)
+        keys = keys.to_numpy(dtype=object)
+        order = np.argsort(keys, kind='stable')
+        self.rows = table['Zeile'].to_numpy(dtype=np.int64)[order]
+        self.keys, starts = np.unique(keys[order], return_index=True)
+        self.names = table[NAME_COLUMN].to_numpy(dtype=object)[order][starts]
+        self._bounds = np.append(starts, len(self.rows))
+        self._ids = {key: position for position, key in enumerate(self.keys.tolist())}
+        postings = {}
+        for position, key in enumerate(self.keys.tolist()):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _rows(self, position):
+        return self.rows[self._bounds[position]:self._bounds[position + 1]]
+
+    def lookup(self, name):
+        """
+        Exakte Suche (nach Normalisierung, siehe `normalize_name`).
+        Returns:
+            np.ndarray: Die Zeilenpositionen des Startups im Datensatz (für `DataFrame.iloc`), leer ohne Treffer.
+        """
+        position = self._ids.get(normalize_name(name))
+        return self.rows[:0] if position is None else self._rows(position)
+
+    def _prefix(self, key):
+        """Positionen aller Schlüssel, die mit `key` beginnen."""
+        start = np.searchsorted(self.keys, key, side='left')
+        stop = np.searchsorted(self.keys, key + '\U0010ffff', side='left')
+        return np.arange(start, stop)
+
+    def _similar(self, key, candidates=50):
+        """Positionen der Schlüssel mit den meisten gemeinsamen Trigrammen, nach Ähnlichkeit absteigend."""
+        grams = [self._postings[gram] for gram in _trigrams(key) if gram in self._postings]
+        if not grams:
+            return [], []
+        ids, shared = np.unique(np.concatenate(grams), return_counts=True)
+        best = ids[np.argsort(-shared, kind='stable')[:candidates]]
+        scored = [(SequenceMatcher(None, key, self.keys[position]).ratio(), position) for position in best]
+        scored = sorted((item for item in scored if item[0] >= SIMILARITY_CUTOFF), key=lambda item: -item[0])
+        return [position for _, position in scored], [score for score, _ in scored]
+
+    def search(self, query, limit=10):
+        """
+        Sucht Startups zu einer Eingabe: zuerst der exakte Treffer, dann Namen mit diesem Anfang,
+        dann ähnliche Namen (z. B. bei Tippfehlern).
+        Parameters:
+        - query (str): Der gesuchte Name oder Namensanfang.
+        - limit (int): Höchstanzahl der Treffer.
+        Returns:
+            pd.DataFrame: Eine Zeile pro Startup mit 'Name des Startups', 'Treffer' ('exakt', 'Präfix', 'ähnlich'),
+            'Ähnlichkeit' und 'Pitches' (Anzahl der Zeilen im Datensatz).
+        """
+        key = normalize_name(query)
+        found, kinds, scores = [], [], []
+        if key:
+            # Der exakte Treffer ist der kleinste Schlüssel mit diesem Anfang und steht daher an erster Stelle
+            for position in self._prefix(key)[:limit].tolist():
+                exact = self.keys[position] == key
+                found.append(position)
+                kinds.append('exakt' if exact else 'Präfix')
+                scores.append(1.0 if exact else SequenceMatcher(None, key, self.keys[position]).ratio())
+            if len(found) < limit:
+                for position, score in zip(*self._similar(key)):
+                    if position not in found:
+                        found.append(position)
+                        kinds.append('ähnlich')
+                        scores.append(score)
+        found, kinds, scores = found[:limit], kinds[:limit], scores[:limit]
+        positions = np.array(found, dtype=np.int64)
+        return pd.DataFrame({
+            NAME_COLUMN: self.names[positions],
+            'Treffer': kinds,
+            'Ähnlichkeit': np.round(scores, 2),
+            'Pitches': (self._bounds[positions + 1] - self._bounds[positions]).astype(np.int64),
+        })
@@ -0,0 +1,171 @@
+"""
+Prüft, dass alle Verarbeitungsmodi (seriell, blockweise, parallel, inkrementell) dieselben Ergebnisse liefern.
+
+Aufruf aus dem Projektordner:
+    python -m pytest
+"""
+from functools import partial
+
+import pandas as pd
+import pytest
+
+import main
+from benchmarks.synthetic import generate_sharktank
+from coalitions import cell_histogram, coalition_histogram, coalition_table, cooperation_counts
+from shark_analytics import cell_totals, shark_analytics, shark_totals
+
+ROWS = 3000
+
+# Summen über viele Zeilen hängen von der Reihenfolge der Additionen ab und weichen nur im Rundungsbereich ab
+RTOL = 1e-9
+
+
+@pytest.fixture
+def raw():
+    data = generate_sharktank(ROWS)
+    # Wenige große Staffeln, damit run_parallel Staffeln auf mehrere Teile aufteilt
+    data['Season Number'] = data['Season Number'] % 3 + 1
+    return data
+
+
+@pytest.fixture(autouse=True)
+def small_partitions(monkeypatch):
+    """Teilt Staffeln schon ab 100 Zeilen, damit auch kleine Testdaten geteilte Staffeln enthalten."""
+    partitions = partial(main.SharkTankProcessor._season_partitions, min_rows=100)
+    monkeypatch.setattr(main.SharkTankProcessor, '_season_partitions', staticmethod(partitions))
+
+
+def write_input(data, path):
+    data.to_parquet(path, index=False)
+    return path
+
+
+def run_serial(input_file):
+    processor = main.SharkTankProcessor(input_file)
+    processor.load_data()
+    processor.clean_data(main.columns_to_drop, main.rename_columns)
+    processor.replace_empty_with_na()
+    totals = processor.summarize_shark_data()
+    pairs = processor.generate_cooperation_matrix()
+    processor.generate_coalitions()
+    return processor.sharktank, totals, pairs, processor.coalitions
+
+
+def run_streaming(input_file, output_file):
+    processor = main.SharkTankProcessor(input_file)
+    totals, pairs = processor.process_stream(main.columns_to_drop, main.rename_columns, chunksize=700,
+                                             output_file=output_file)
+    return pd.read_parquet(output_file), totals, pairs, processor.coalitions
+
+
+def run_parallel(input_file):
+    processor = main.SharkTankProcessor(input_file)
+    totals, pairs = processor.run_parallel(main.columns_to_drop, main.rename_columns, workers=2)
+    return processor.sharktank, totals, pairs, processor.coalitions
+
+
+def run_incremental(input_file, state_dir):
+    processor = main.SharkTankProcessor(input_file)
+    totals, pairs = processor.run_incremental(main.columns_to_drop, main.rename_columns, state_dir=state_dir)
+    return processor.sharktank, totals, pairs, processor.coalitions
+
+
+def assert_same_results(result, expected):
+    """Vergleicht bereinigten Datensatz, Summen, Kooperationspaare und Koalitionen zweier Läufe."""
+    frame, totals, pairs, coalitions = result
+    expected_frame, expected_totals, expected_pairs, expected_coalitions = expected
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected_frame.reset_index(drop=True))
+    assert totals.keys() == expected_totals.keys()
+    for shark, metrics in expected_totals.items():
+        assert totals[shark].keys() == metrics.keys()
+        for metric, value in metrics.items():
+            assert totals[shark][metric] == pytest.approx(value, rel=RTOL), (shark, metric)
+    pd.testing.assert_frame_equal(pairs.reset_index(drop=True), expected_pairs.reset_index(drop=True))
+    pd.testing.assert_frame_equal(coalitions.reset_index(drop=True), expected_coalitions.reset_index(drop=True),
+                                  check_exact=False, rtol=RTOL)
+
+
+def test_streaming_matches_serial(raw, tmp_path):
+    input_file = write_input(raw, tmp_path / 'input.parquet')
+    expected = run_serial(input_file)
+    assert_same_results(run_streaming(input_file, tmp_path / 'cleaned.parquet'), expected)
+
+
+def test_parallel_matches_serial(raw, tmp_path):
+    input_file = write_input(raw, tmp_path / 'input.parquet')
+    expected = run_serial(input_file)
+    assert_same_results(run_parallel(input_file), expected)
+
+
+def test_incremental_matches_serial_rebuild(raw, tmp_path):
+    state_dir = tmp_path / 'state'
+    input_file = write_input(raw, tmp_path / 'input.parquet')
+    expected = run_serial(input_file)
+    # Erster Lauf ohne Zustand, zweiter Lauf vollständig aus dem Zustand
+    assert_same_results(run_incremental(input_file, state_dir), expected)
+    assert_same_results(run_incremental(input_file, state_dir), expected)
+
+    # Geänderte, umbenannte, entfernte und neue Zeilen
+    changed = raw.copy()
+    changed.loc[5, 'Original Ask Amount'] = changed.loc[5, 'Original Ask Amount'] + 1000
+    changed.loc[10, 'Startup Name'] = 'Renamed Startup'
+    changed = changed.drop(index=[20, 21, 22])
+    added = generate_sharktank(50, seed=7).assign(**{'Season Number': 4})
+    changed = pd.concat([changed, added], ignore_index=True)
+    changed_file = write_input(changed, tmp_path / 'input.parquet')
+    assert_same_results(run_incremental(changed_file, state_dir), run_serial(changed_file))
+
+
+def test_streamed_startup_index_and_analytics_match_serial(raw, tmp_path):
+    input_file = write_input(raw, tmp_path / 'input.parquet')
+    stages = ['cleaned', 'startup_index', 'analytics']
+    main.run_pipeline(input_file, tmp_path / 'serial', stages=stages)
+    main.run_pipeline(input_file, tmp_path / 'streamed', stages=stages, chunksize=700)
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'streamed' / 'sharktank_startup_index.parquet'),
+                                  pd.read_parquet(tmp_path / 'serial' / 'sharktank_startup_index.parquet'))
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'streamed' / 'shark_analytics.parquet'),
+                                  pd.read_parquet(tmp_path / 'serial' / 'shark_analytics.parquet'),
+                                  check_exact=False, rtol=RTOL)
+
+
+def test_streaming_with_columns_empty_in_first_chunk(raw, tmp_path):
+    # Spalten, die im ersten Block nur fehlende Werte enthalten, dürfen das Schema der Ausgabe nicht festlegen
+    data = raw.copy()
+    for col in ['Guest Name', 'Pitchers State', 'Total Deal Amount', 'Barbara Corcoran Investment Amount']:
+        data[col] = data[col].astype(object)
+        data.loc[:49, col] = None
+    input_file = write_input(data, tmp_path / 'input.parquet')
+    expected = run_serial(input_file)
+    processor = main.SharkTankProcessor(input_file)
+    totals, pairs = processor.process_stream(main.columns_to_drop, main.rename_columns, chunksize=50,
+                                             output_file=tmp_path / 'cleaned.parquet')
+    assert_same_results((pd.read_parquet(tmp_path / 'cleaned.parquet'), totals, pairs, processor.coalitions), expected)
+
+
+def test_cell_tables_match_filtered_rows(raw, tmp_path):
+    input_file = write_input(raw, tmp_path / 'input.parquet')
+    processor = main.SharkTankProcessor(input_file)
+    processor.process_stream(main.columns_to_drop, main.rename_columns, chunksize=700)
+    streamed_sharks, streamed_coalitions = processor.shark_cells, processor.coalition_cells
+    processor = main.SharkTankProcessor(input_file)
+    processor.load_data()
+    processor.clean_data(main.columns_to_drop, main.rename_columns)
+    processor.replace_empty_with_na()
+    serial_sharks, serial_coalitions = processor.build_cell_tables()
+    pd.testing.assert_frame_equal(streamed_sharks, serial_sharks, check_exact=False, rtol=RTOL)
+    pd.testing.assert_frame_equal(streamed_coalitions, serial_coalitions, check_exact=False, rtol=RTOL)
+
+    # Eine Filterauswahl aus den Zellen muss dieselben Antworten liefern wie die gefilterten Zeilen
+    rows = processor.sharktank[processor.sharktank['Staffelnummer'] == 2].reset_index(drop=True)
+    sharks = serial_sharks[serial_sharks['Staffelnummer'] == 2]
+    coalitions = serial_coalitions[serial_coalitions['Staffelnummer'] == 2]
+    expected_totals = shark_totals(shark_analytics(rows))
+    expected_totals = expected_totals.drop(columns=[c for c in expected_totals if c.startswith('Median')])
+    pd.testing.assert_frame_equal(cell_totals(sharks), expected_totals, check_exact=False, rtol=RTOL)
+
+    filtered = main.SharkTankProcessor(input_file)
+    filtered.sharktank = rows
+    expected_counts = filtered.generate_cooperation_matrix(square=True)
+    pd.testing.assert_frame_equal(cooperation_counts(cell_histogram(coalitions)), expected_counts, check_dtype=False)
+    pd.testing.assert_frame_equal(coalition_table(cell_histogram(coalitions)),
+                                  coalition_table(coalition_histogram(rows)), check_exact=False, rtol=RTOL)
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from shark_analytics import EQUITY_COLUMNS, INVESTMENT_COLUMNS
+
+# Spalten, die die Regeln im bereinigten Datensatz voraussetzen
+REQUIRED_COLUMNS = [
+    'Staffelnummer', 'Name des Startups', 'Branche', 'Pitcher Geschlecht', 'Pitcher Bundesstaat',
+    'Geforderter Betrag (USD)', 'Gebotene Anteile (%)', 'Geforderte Bewertung (USD)', 'Deal erhalten',
+    'Erhaltener Betrag (USD)', 'Erhaltene Anteile (%)', 'Anzahl der Sharks bei Deal'
+] + INVESTMENT_COLUMNS + EQUITY_COLUMNS
+
+# Toleranzen für Rundungen in den Quelldaten
+AMOUNT_TOLERANCE = 1.0       # USD
+SHARE_TOLERANCE = 0.1        # Prozentpunkte
+VALUATION_TOLERANCE = 0.01   # relativ
+
+# Regel -> Beschreibung
+RULES = {
+    'Pflichtspalte fehlt': 'Eine von den Regeln vorausgesetzte Spalte fehlt im Datensatz.',
+    'Pflichtwert fehlt': 'Staffelnummer oder Name des Startups fehlt.',
+    'Doppelter Pitch': 'Staffelnummer und Name des Startups kommen mehrfach vor.',
+    'Deal ohne Betrag': "'Deal erhalten' passt nicht dazu, ob ein erhaltener Betrag vorliegt.",
+    'Summe der Investitionen': 'Die Investitionssummen der Sharks ergeben nicht den erhaltenen Betrag.',
+    'Summe der Beteiligungen': 'Die Kapitalbeteiligungen der Sharks ergeben nicht die erhaltenen Anteile.',
+    'Anzahl der Sharks': "'Anzahl der Sharks bei Deal' entspricht nicht der Anzahl der Investitionen.",
+    'Investition ohne Beteiligung': 'Bei einem Shark liegt nur Investitionssumme oder nur Kapitalbeteiligung vor.',
+    'Negativer Betrag': 'Ein Betrag oder eine Investitionssumme ist negativ.',
+    'Anteil außerhalb 0–100 %': 'Ein Anteil oder eine Kapitalbeteiligung liegt nicht zwischen 0 und 100 %.',
+    'Geforderte Bewertung': 'Die geforderte Bewertung entspricht nicht Betrag / Anteile × 100.',
+}
+
+
+def _numeric(data, columns):
+    """Die Spalten als float-Matrix (eine Spalte pro Eingabespalte, Text und 'N/A' werden zu NaN)."""
+    return data[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _row_rules(data):
+    """
+    Wertet alle zeilenbezogenen Regeln als Spaltenoperationen aus. Jede Spalte wird dabei genau einmal umgewandelt.
+    Returns:
+        dict: Regel -> boolesches Array (True = Verletzung) über alle Zeilen von `data`.
+    """
+    investments = _numeric(data, INVESTMENT_COLUMNS)
+    equity = _numeric(data, EQUITY_COLUMNS)
+    amounts = _numeric(data, ['Geforderter Betrag (USD)', 'Erhaltener Betrag (USD)'])
+    shares = _numeric(data, ['Gebotene Anteile (%)', 'Erhaltene Anteile (%)'])
+    deal = pd.to_numeric(data['Deal erhalten'], errors='coerce').to_numpy(dtype=np.float64)
+    shark_count = pd.to_numeric(data['Anzahl der Sharks bei Deal'], errors='coerce').to_numpy(dtype=np.float64)
+    valuation = pd.to_numeric(data['Geforderte Bewertung (USD)'], errors='coerce').to_numpy(dtype=np.float64)
+    asked, received = amounts[:, 0], amounts[:, 1]
+    offered, received_share = shares[:, 0], shares[:, 1]
+    invested = ~np.isnan(investments)
+
+    # Vergleiche mit NaN sind False; fehlende Werte verletzen daher nur die Regeln, die sie ausdrücklich prüfen
+    with np.errstate(invalid='ignore', divide='ignore'):
+        asked_valuation = asked / offered * 100
+        return {
+            'Pflichtwert fehlt': (
+                data['Staffelnummer'].isna().to_numpy() | data['Name des Startups'].isna().to_numpy()
+            ),
+            'Doppelter Pitch': (
+                data.duplicated(['Staffelnummer', 'Name des Startups'], keep='first').to_numpy()
+            ),
+            'Deal ohne Betrag': (deal == 1) == np.isnan(received),
+            'Summe der Investitionen': (
+                ~np.isnan(received) & invested.any(axis=1)
+                & (np.abs(np.nansum(investments, axis=1) - received) > AMOUNT_TOLERANCE)
+            ),
+            'Summe der Beteiligungen': (
+                ~np.isnan(received_share) & ~np.isnan(equity).all(axis=1)
+                & (np.abs(np.nansum(equity, axis=1) - received_share) > SHARE_TOLERANCE)
+            ),
+            'Anzahl der Sharks': invested.sum(axis=1) != np.nan_to_num(shark_count),
+            'Investition ohne Beteiligung': (invested != ~np.isnan(equity)).any(axis=1),
+            'Negativer Betrag': (amounts < 0).any(axis=1) | (investments < 0).any(axis=1),
+            'Anteil außerhalb 0–100 %': (
+                ((shares < 0) | (shares > 100)).any(axis=1) | ((equity < 0) | (equity > 100)).any(axis=1)
+            ),
+            'Geforderte Bewertung': (
+                (offered > 0) & (np.abs(asked_valuation - valuation) > VALUATION_TOLERANCE * np.abs(valuation))
+            ),
+        }
+
+
+def validate(data, sample=None, random_state=None):
+    """
+    Prüft den bereinigten Datensatz auf Konsistenz (siehe `RULES`). Alle Regeln werden als Spaltenoperationen
+    über den gesamten Datenrahmen in einem Durchlauf ausgewertet; der Aufwand wächst linear mit der Zeilenanzahl.
+    Fehlt eine vorausgesetzte Spalte, wird nur 'Pflichtspalte fehlt' gemeldet.
+    Parameters:
+    - data (pd.DataFrame): Der bereinigte Datensatz.
+    - sample (int | float): Optionale Stichprobe für die interaktive Nutzung: Anzahl der Zeilen (int) oder Anteil
+      zwischen 0 und 1 (float). 'Doppelter Pitch' erkennt dann nur Doppelungen innerhalb der Stichprobe.
+    - random_state (int): Startwert der Stichprobe.
+    Returns:
+        pd.DataFrame: Eine Zeile pro Verletzung mit den Spalten 'Regel', 'Zeile' (Index in `data`) und 'Spalte'
+        (nur bei 'Pflichtspalte fehlt' gefüllt).
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in data.columns]
+    if missing:
+        return pd.DataFrame({
+            'Regel': pd.Categorical(['Pflichtspalte fehlt'] * len(missing), categories=list(RULES)),
+            'Zeile': [None] * len(missing),
+            'Spalte': missing,
+        })
+
+    if sample is not None:
+        size = int(round(sample * len(data))) if isinstance(sample, float) else int(sample)
+        rng = np.random.default_rng(random_state)
+        positions = np.sort(rng.choice(len(data), size=min(max(size, 0), len(data)), replace=False))
+        data = data.iloc[positions]
+
+    rows = {rule: np.flatnonzero(mask) for rule, mask in _row_rules(data).items()}
+    codes = np.repeat([list(RULES).index(rule) for rule in rows], [len(found) for found in rows.values()])
+    return pd.DataFrame({
+        'Regel': pd.Categorical.from_codes(codes, categories=list(RULES)),
+        'Zeile': data.index.to_numpy()[np.concatenate(list(rows.values()))],
+        'Spalte': None,
+    })
+
+
+def violation_summary(report, rows_checked):
+    """
+    Verdichtet den Bericht von `validate` zu einer Zeile pro Regel.
+    Parameters:
+    - report (pd.DataFrame): Die Verletzungen.
+    - rows_checked (int): Anzahl der geprüften Zeilen (bei einer Stichprobe deren Größe).
+    Returns:
+        pd.DataFrame: Regel, Beschreibung, Anzahl Verletzungen und Anteil an den geprüften Zeilen.
+    """
+    counts = report['Regel'].value_counts(sort=False).reindex(list(RULES), fill_value=0)
+    return pd.DataFrame({
+        'Regel': list(RULES),
+        'Beschreibung': list(RULES.values()),
+        'Anzahl Verletzungen': counts.to_numpy(dtype=np.int64),
+        'Anteil': counts.to_numpy(dtype=np.float64) / rows_checked if rows_checked else np.nan,
+    })